@@ -0,0 +1,10 @@
+import pytest
+
+pytest_plugins = ["core.benchmark"]
+
+
+@pytest.fixture(autouse=True)
+def no_overload_protection(settings):
+    # Throttle buckets and the query latency average outlive a single test; tests of those features turn them on.
+    settings.THROTTLE_ENABLED = False
+    settings.LOAD_SHED_DB_LATENCY = 0
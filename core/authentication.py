@@ -0,0 +1,167 @@
+import hashlib
+import hmac
+import time
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authentication import BasicAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from core import metrics
+
+lookups_total = metrics.registry.counter(
+    "auth_cache_lookups_total", "Authentication cache lookups by scheme and result.", ["scheme", "result"]
+)
+
+
+def get_cache():
+    return caches[settings.AUTH_CACHE_ALIAS]
+
+
+def credential_key(scheme, credential):
+    # Only a keyed hash of the credential reaches the cache, so its contents are useless without SECRET_KEY.
+    digest = hmac.new(settings.SECRET_KEY.encode(), credential.encode(), hashlib.sha256).hexdigest()
+    return f"auth:{scheme}:{digest}"
+
+
+# Moved by every invalidation. Read before a credential is checked against the
+# database, it tells whether a user changed while the check ran.
+EPOCH_KEY = "auth:epoch"
+
+
+def generation_key(user_id):
+    return f"auth:generation:{user_id}"
+
+
+def get_counter(key):
+    cache = get_cache()
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        value = cache.get(key)
+    return value
+
+
+def bump_counter(key):
+    get_counter(key)
+    try:
+        get_cache().incr(key)
+    except ValueError:
+        get_cache().add(key, time.time_ns(), timeout=None)
+
+
+def get_generation(user_id):
+    return get_counter(generation_key(user_id))
+
+
+def get_epoch():
+    return get_counter(EPOCH_KEY) if settings.AUTH_CACHE_TIMEOUT else None
+
+
+def bump_generation(user_id):
+    bump_counter(EPOCH_KEY)
+    bump_counter(generation_key(user_id))
+
+
+def invalidate_user(user_id):
+    """Drops every cached credential of the user by moving them to a new generation."""
+    bump_generation(user_id)
+    # Bump again once the transaction commits: a credential checked against the
+    # rows from before the commit is then either not cached or cached under a
+    # generation that is already gone.
+    transaction.on_commit(partial(bump_generation, user_id))
+
+
+def get_cached(scheme, credential):
+    if not settings.AUTH_CACHE_TIMEOUT:
+        return None
+
+    cache = get_cache()
+    entry = cache.get(credential_key(scheme, credential))
+    if entry is not None and entry["generation"] == cache.get(generation_key(entry.get("user_id"))):
+        lookups_total.inc(scheme, "hit")
+        return {**entry, "user": build_user(entry)}
+    lookups_total.inc(scheme, "miss")
+    return None
+
+
+def set_cached(scheme, credential, user, epoch, **extra):
+    """Caches a credential checked against the database after `get_epoch()` returned `epoch`."""
+    if settings.AUTH_CACHE_TIMEOUT:
+        generation = get_generation(user.pk)
+        if get_epoch() != epoch:
+            # A user was invalidated during the check, which may have read the rows from before.
+            return
+        # Only the plain field values are cached: no password hash and none of the related objects the user loaded.
+        fields = {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+            if field.attname != "password"
+        }
+        entry = {
+            "user_id": user.pk,
+            "fields": fields,
+            "db": user._state.db,
+            "generation": generation,
+            **extra,
+        }
+        get_cache().set(credential_key(scheme, credential), entry, timeout=settings.AUTH_CACHE_TIMEOUT)
+
+
+def build_user(entry):
+    # The password comes back as a deferred field, loaded from the database only if something reads it.
+    fields = entry["fields"]
+    return get_user_model().from_db(entry["db"], list(fields), list(fields.values()))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that skips the Token and User join for tokens seen in the last `AUTH_CACHE_TIMEOUT`."""
+
+    def authenticate_credentials(self, key):
+        entry = get_cached("token", key)
+        if entry is not None:
+            user = entry["user"]
+            return user, Token(key=key, user=user, created=entry["created"])
+
+        epoch = get_epoch()
+        user, token = super().authenticate_credentials(key)
+        set_cached("token", key, user, epoch, created=token.created)
+        return user, token
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """BasicAuthentication that runs the password hasher once per credential and `AUTH_CACHE_TIMEOUT`."""
+
+    def authenticate_credentials(self, userid, password, request=None):
+        # The NUL separator keeps ("ab", "c") and ("a", "bc") apart.
+        credential = f"{userid}\0{password}"
+        entry = get_cached("basic", credential)
+        if entry is not None:
+            return entry["user"], None
+
+        epoch = get_epoch()
+        user, auth = super().authenticate_credentials(userid, password, request)
+        set_cached("basic", credential, user, epoch)
+        return user, auth
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_on_user_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Password changes and deactivation go through save(); logins only touch last_login.
+    if not created and update_fields != frozenset(["last_login"]):
+        invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_on_user_deleted(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_on_token_deleted(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
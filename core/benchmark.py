@@ -0,0 +1,197 @@
+"""
+Helpers for the `bench_*.py` modules in each app's `benchmarks` package, and
+a pytest plugin (enabled from the root conftest.py) that collects endpoint
+results into a JSON file and compares them with a stored baseline:
+
+    pytest product/benchmarks/bench_endpoints.py order/benchmarks/bench_endpoints.py \\
+        --bench-json=build/bench.json --bench-baseline=build/baseline.json --bench-threshold=0.2
+
+Dataset sizes come from --bench-products (default 1000) and --bench-basket
+(default 1,10,100 items per order).
+"""
+
+import json
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import django
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Latency and memory may grow by --bench-threshold before they count as regressions;
+# query counts are deterministic and may not grow at all.
+RELATIVE_METRICS = ["p50_ms", "p95_ms", "p99_ms", "peak_memory_kb"]
+EXACT_METRICS = ["queries"]
+
+
+def measure(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {"min": min(timings), "median": statistics.median(timings)}
+
+
+def report(name, slow, fast):
+    speedup = slow["median"] / fast["median"]
+    print(f"{name}: {slow['median'] * 1000:.1f} ms -> {fast['median'] * 1000:.1f} ms ({speedup:.1f}x)")
+    return speedup
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(math.ceil(len(ordered) * pct / 100) - 1, 0)]
+
+
+def benchmark_requests(send, repeat=30, warmup=3):
+    """
+    Calls `send(index)` `warmup + repeat + 1` times with increasing indexes and
+    returns latency percentiles and throughput from the timed calls, plus the
+    query count and peak traced memory of one extra instrumented call.
+    """
+    for index in range(warmup):
+        check_response(consume(send(index)))
+
+    timings = []
+    for index in range(warmup, warmup + repeat):
+        start = time.perf_counter()
+        response = consume(send(index))
+        timings.append(time.perf_counter() - start)
+        check_response(response)
+
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            check_response(consume(send(warmup + repeat)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "requests": repeat,
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "p99_ms": round(percentile(timings, 99) * 1000, 3),
+        "requests_per_second": round(repeat / sum(timings), 1),
+        "queries": len(queries),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def consume(response):
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def check_response(response):
+    content = b"" if response.streaming else response.content
+    assert response.status_code < 400, f"{response.status_code}: {content[:200]!r}"
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, stats in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in RELATIVE_METRICS:
+            if metric in base and stats[metric] > base[metric] * (1 + threshold):
+                regressions.append(f"{name} {metric}: {base[metric]} -> {stats[metric]}")
+        for metric in EXACT_METRICS:
+            if metric in base and stats[metric] > base[metric]:
+                regressions.append(f"{name} {metric}: {base[metric]} -> {stats[metric]}")
+    return regressions
+
+
+def parse_sizes(value):
+    return [int(size) for size in value.split(",") if size]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-json", help="Write endpoint benchmark results to this JSON file.")
+    group.addoption("--bench-baseline", help="Compare endpoint benchmark results with this JSON file.")
+    group.addoption("--bench-threshold", type=float, default=0.2, help="Allowed relative slowdown (default 0.2).")
+    group.addoption("--bench-repeat", type=int, default=30, help="Timed requests per endpoint (default 30).")
+    group.addoption("--bench-products", type=parse_sizes, default=[1_000], help="Catalog sizes, e.g. 1000,100000.")
+    group.addoption("--bench-basket", type=parse_sizes, default=[1, 10, 100], help="Products per order.")
+    group.addoption("--bench-workers", type=int, default=2, help="Server worker processes for bench_servers.py.")
+    group.addoption("--bench-concurrency", type=int, default=64, help="Concurrent clients for bench_servers.py.")
+    group.addoption("--bench-duration", type=float, default=10, help="Seconds of load per server for bench_servers.py.")
+
+
+def pytest_configure(config):
+    config.bench_results = {}
+    config.bench_regressions = []
+
+
+def pytest_generate_tests(metafunc):
+    if "catalog" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("bench_products")
+        metafunc.parametrize("catalog", sizes, indirect=True, scope="module", ids=[f"{size}" for size in sizes])
+    if "basket_size" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("bench_basket")
+        metafunc.parametrize("basket_size", sizes, scope="module", ids=[f"basket{size}" for size in sizes])
+
+
+@pytest.fixture
+def bench(request):
+    """Runs `benchmark_requests` and stores the result under `name`."""
+
+    def run(name, send, repeat=None):
+        stats = benchmark_requests(send, repeat=repeat or request.config.getoption("bench_repeat"))
+        request.config.bench_results[name] = stats
+        print(f"\n{name}: p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms, {stats['queries']} queries")
+        return stats
+
+    return run
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = getattr(config, "bench_results", {})
+    if not results:
+        return
+
+    path = config.getoption("bench_json")
+    if path:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(
+                {
+                    "meta": {
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                        "python": platform.python_version(),
+                        "django": django.get_version(),
+                        "database": connection.vendor,
+                    },
+                    "results": results,
+                },
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+
+    baseline_path = config.getoption("bench_baseline")
+    if baseline_path:
+        with open(baseline_path) as file:
+            baseline = json.load(file)["results"]
+        config.bench_regressions = compare(results, baseline, config.getoption("bench_threshold"))
+        if config.bench_regressions:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if config.bench_regressions:
+        terminalreporter.write_sep("=", "benchmark regressions", red=True)
+        for regression in config.bench_regressions:
+            terminalreporter.write_line(regression)
@@ -0,0 +1,72 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    Answers `If-None-Match` / `If-Modified-Since` on `list` and `retrieve` with a
+    304 before the body is serialized. The validators come from one aggregate
+    query over `conditional_fields`, the `updated_at`-like columns the payload
+    depends on, plus the row count so deletions change the ETag too.
+    """
+
+    conditional_fields = ["updated_at"]
+
+    def get_conditional_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_conditional_fields(self):
+        return self.conditional_fields
+
+    def get_conditional_markers(self, queryset):
+        aggregates = {f"marker_{index}": Max(field) for index, field in enumerate(self.get_conditional_fields())}
+        markers = queryset.order_by().aggregate(rows=Count("pk", distinct=True), **aggregates)
+
+        rows = markers.pop("rows")
+        timestamps = [value for value in markers.values() if value is not None]
+        last_modified = max(timestamps) if timestamps else None
+
+        raw = "|".join(
+            [
+                self.request.get_full_path(),
+                self.request.accepted_media_type or "",
+                str(self.request.user.pk),
+                str(rows),
+                *[value.isoformat() if value else "" for value in markers.values()],
+            ]
+        )
+        return rows, f'"{hashlib.sha256(raw.encode()).hexdigest()}"', last_modified
+
+    def conditional_response(self, handler, queryset, request, *args, **kwargs):
+        rows, etag, last_modified = self.get_conditional_markers(queryset)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        # A missing object must still 404 instead of matching the ETag of an empty result.
+        response = None
+        if rows or not self.detail:
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_conditional_queryset()
+        return self.conditional_response(super().list, queryset, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.get_conditional_queryset().filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(super().retrieve, queryset, request, *args, **kwargs)
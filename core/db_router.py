@@ -0,0 +1,136 @@
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_COOKIE = "db_primary"
+LAG_SQL = {
+    # Zero when everything received has been replayed, so an idle primary doesn't look like lag.
+    "postgresql": (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    ),
+}
+
+current_replica = ContextVar("current_replica", default=None)
+health_checks = {}
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads to the replica picked for the current request, if any, and
+    everything else to the primary. Requests pick a replica through
+    `ReplicaReadMixin`; outside of them all queries stay on `default`.
+    """
+
+    def db_for_read(self, model, **hints):
+        return current_replica.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+
+def replica_lag(alias):
+    """Seconds the replica is behind its primary, or 0 when the backend can't tell."""
+    connection = connections[alias]
+    sql = LAG_SQL.get(connection.vendor)
+    if sql is None:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        lag = cursor.fetchone()[0]
+    return float(lag or 0)
+
+
+def is_healthy(alias):
+    # Checked at most every DATABASE_REPLICA_CHECK_INTERVAL seconds per process.
+    now = time.monotonic()
+    checked = health_checks.get(alias)
+    if checked is not None and now - checked[0] < settings.DATABASE_REPLICA_CHECK_INTERVAL:
+        return checked[1]
+
+    try:
+        healthy = replica_lag(alias) <= settings.DATABASE_REPLICA_MAX_LAG
+    except DatabaseError:
+        healthy = False
+    health_checks[alias] = (now, healthy)
+    return healthy
+
+
+def choose_replica():
+    replicas = [alias for alias in settings.DATABASE_REPLICAS if is_healthy(alias)]
+    return random.choice(replicas) if replicas else None
+
+
+def iter_on_replica(content, alias):
+    """Streams `content` with its queries still routed to `alias`, after the view has returned."""
+    content = iter(content)
+    while True:
+        token = current_replica.set(alias)
+        try:
+            chunk = next(content)
+        except StopIteration:
+            return
+        finally:
+            current_replica.reset(token)
+        yield chunk
+
+
+class ReplicaReadMixin:
+    """
+    Runs safe requests on one of `DATABASE_REPLICAS`, picked once per request
+    among those lagging less than `DATABASE_REPLICA_MAX_LAG`, and falls back to
+    the primary when none is. After a write, reads stay on the primary for
+    `DATABASE_REPLICA_PIN_SECONDS`: for the client through a cookie, and for
+    the user, or for everybody when `replica_pin_scope` names data shared by
+    all users, such as the catalog.
+    """
+
+    replica_pin_scope = None
+
+    def get_replica_pin_key(self, request):
+        if self.replica_pin_scope:
+            return f"db:pin:{self.replica_pin_scope}"
+        if request.user.is_authenticated:
+            return f"db:pin:user:{request.user.pk}"
+        return None
+
+    def is_pinned_to_primary(self, request):
+        if PIN_COOKIE in request.COOKIES:
+            return True
+        key = self.get_replica_pin_key(request)
+        return key is not None and cache.get(key) is not None
+
+    def dispatch(self, request, *args, **kwargs):
+        token = current_replica.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            current_replica.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication and throttling run on the primary; the replica is picked afterwards.
+        super().initial(request, *args, **kwargs)
+        if settings.DATABASE_REPLICAS and request.method in SAFE_METHODS and not self.is_pinned_to_primary(request):
+            current_replica.set(choose_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method not in SAFE_METHODS and settings.DATABASE_REPLICAS:
+            seconds = settings.DATABASE_REPLICA_PIN_SECONDS
+            response.set_cookie(PIN_COOKIE, "1", max_age=seconds, httponly=True, samesite="Lax")
+            if key := self.get_replica_pin_key(request):
+                cache.set(key, 1, timeout=seconds)
+
+        alias = current_replica.get()
+        if alias is not None and response.streaming:
+            response.streaming_content = iter_on_replica(response.streaming_content, alias)
+        return response
@@ -0,0 +1,71 @@
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework.permissions import BasePermission
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from core.renderers import FastJSONRenderer
+from core.timing import serialization_timer
+
+
+class FastReadMixin:
+    """
+    Serves `list` and `retrieve` from `values(*fast_fields)` rows that the
+    `fast_serializer` function turns into the serializer's representation,
+    skipping serializer and model instantiation. Enable it per viewset with
+    `fast_read = True`; the fast serializer must produce exactly what
+    `serializer_class` would.
+
+    The rows are not model instances, so a viewset whose permissions check
+    objects (`has_object_permission`) is served by the regular `retrieve`.
+    """
+
+    fast_read = False
+    fast_fields = []
+    fast_serializer = None
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if not self.fast_read:
+            return renderers
+        return [FastJSONRenderer() if type(renderer) is JSONRenderer else renderer for renderer in renderers]
+
+    def get_fast_fields(self):
+        return self.fast_fields
+
+    def get_fast_queryset(self):
+        return self.filter_queryset(self.get_queryset()).prefetch_related(None).values(*self.get_fast_fields())
+
+    def serialize_fast(self, rows):
+        with serialization_timer():
+            return self.fast_serializer(rows)
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_read:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.get_fast_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serialize_fast(page))
+        return Response(self.serialize_fast(queryset))
+
+    def checks_object_permissions(self):
+        return any(
+            type(permission).has_object_permission is not BasePermission.has_object_permission
+            for permission in self.get_permissions()
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.fast_read or self.checks_object_permissions():
+            return super().retrieve(request, *args, **kwargs)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_fast_queryset()
+        try:
+            rows = list(queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})[:1])
+        except (TypeError, ValueError, ValidationError):
+            rows = []
+        if not rows:
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        return Response(self.serialize_fast(rows)[0])
@@ -0,0 +1,96 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class BatchedManyRelatedField(serializers.ManyRelatedField):
+    """
+    Resolves every submitted primary key with a single `pk__in` query instead
+    of one `get()` per item, and reports all the missing ones in one error.
+    Returns the objects in the order they were given.
+
+    Under a `many=True` root serializer the keys of every item are resolved
+    together the first time the field is validated, so a batch of items costs
+    one query too. Keys outside the range of the primary key column are
+    reported as missing without being queried.
+    """
+
+    default_error_messages = {
+        "does_not_exist": "Invalid pks {pk_values} - objects do not exist.",
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        pks = [self.to_pk(item) for item in data]
+        objects = self.resolve(pks)
+        missing = [pk for pk in dict.fromkeys(pks) if pk not in objects]
+        if missing:
+            self.fail("does_not_exist", pk_values=", ".join(f'"{pk}"' for pk in missing))
+        return [objects[pk] for pk in pks]
+
+    def to_pk(self, item):
+        child = self.child_relation
+        if child.pk_field is not None:
+            item = child.pk_field.to_internal_value(item)
+        if isinstance(item, bool):
+            child.fail("incorrect_type", data_type=type(item).__name__)
+        try:
+            return child.get_queryset().model._meta.pk.to_python(item)
+        except (DjangoValidationError, TypeError, ValueError):
+            child.fail("incorrect_type", data_type=type(item).__name__)
+
+    def resolve(self, pks):
+        pks = set(pks)
+        if not pks:
+            return {}
+        batch = self.get_batch()
+        if batch is None or not pks <= batch["pks"]:
+            return self.in_bulk(pks)
+        return batch["objects"]
+
+    def in_bulk(self, pks):
+        # An out of range key can't match a row, and the database driver would overflow on it.
+        pk_field = self.child_relation.get_queryset().model._meta.pk
+        in_range = set()
+        for pk in pks:
+            try:
+                pk_field.run_validators(pk)
+            except DjangoValidationError:
+                continue
+            in_range.add(pk)
+        return self.child_relation.get_queryset().in_bulk(in_range) if in_range else {}
+
+    def get_batch(self):
+        # Objects for the keys submitted to this field across all the items of a `many=True` root.
+        root = self.root
+        if not isinstance(root, serializers.ListSerializer) or not isinstance(root.initial_data, list):
+            return None
+        batches = root.__dict__.setdefault("_related_batches", {})
+        if self.field_name not in batches:
+            pks = set()
+            for item in root.initial_data:
+                values = item.get(self.field_name) if isinstance(item, dict) else None
+                if isinstance(values, list):
+                    for value in values:
+                        try:
+                            pks.add(self.to_pk(value))
+                        except serializers.ValidationError:
+                            pass
+            batches[self.field_name] = {"pks": pks, "objects": self.in_bulk(pks)}
+        return batches[self.field_name]
+
+
+class BatchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """A `PrimaryKeyRelatedField` that validates `many=True` input in one query."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
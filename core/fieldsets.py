@@ -0,0 +1,183 @@
+from collections import defaultdict
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import ListSerializer, PrimaryKeyRelatedField
+
+from core.timing import serialization_timer
+
+
+class Fieldset:
+    """
+    The parts of a representation a request asks for. `fields` is the set of
+    keys to render (None for all of them) and `expand` the relations rendered
+    as nested objects instead of primary keys, each with its own Fieldset.
+    """
+
+    def __init__(self, fields=None, expand=None):
+        self.fields = fields
+        self.expand = expand or {}
+
+    def includes(self, name):
+        return self.fields is None or name in self.fields
+
+    def expands(self, name):
+        return self.includes(name) and name in self.expand
+
+    def nested(self, name):
+        return self.expand.get(name) or Fieldset()
+
+    def select(self, names):
+        return [name for name in names if self.includes(name)]
+
+    def trim(self, items):
+        if self.fields is None:
+            return items
+        return [{key: value for key, value in item.items() if key in self.fields} for item in items]
+
+
+def split_paths(value):
+    return [path.strip().split(".") for path in value.split(",") if path.strip()]
+
+
+def build_fieldset(schema, fields, expand, errors, prefix=""):
+    """
+    `schema` maps each field of the representation to the schema of the
+    representation it expands to, or None when it can't be expanded. `fields`
+    (None for all) and `expand` are lists of dotted paths split on the dots.
+    """
+    own_fields = None if fields is None else set()
+    nested_fields = defaultdict(list)
+    nested_expand = defaultdict(list)
+
+    for path in fields or []:
+        name = path[0]
+        if name not in schema:
+            errors["fields"].append(f"Unknown field: {prefix}{name}.")
+        elif len(path) > 1 and schema[name] is None:
+            errors["fields"].append(f"{prefix}{name} has no nested fields.")
+        else:
+            own_fields.add(name)
+            if len(path) > 1:
+                nested_fields[name].append(path[1:])
+
+    for path in expand:
+        name = path[0]
+        if schema.get(name) is None:
+            errors["expand"].append(f"Cannot expand {prefix}{name}.")
+        else:
+            nested_expand[name].extend([path[1:]] if len(path) > 1 else [])
+
+    # Asking for fields of a relation expands it.
+    expanded = {*nested_expand, *nested_fields}
+    return Fieldset(
+        own_fields,
+        {
+            name: build_fieldset(
+                schema[name], nested_fields.get(name), nested_expand[name], errors, prefix=f"{prefix}{name}."
+            )
+            for name in expanded
+        },
+    )
+
+
+def parse_fieldset(query_params, schema, default_expand=()):
+    """
+    Reads `?fields=` and `?expand=`, both comma separated lists of dotted paths
+    such as `?fields=id,products.title&expand=products.category`. Without
+    `?expand=`, the relations in `default_expand` are expanded.
+    """
+    fields = query_params.get("fields")
+    expand = query_params.get("expand")
+    errors = defaultdict(list)
+    fieldset = build_fieldset(
+        schema,
+        None if fields is None else split_paths(fields),
+        split_paths(",".join(default_expand) if expand is None else expand),
+        errors,
+    )
+    if errors:
+        raise ValidationError(dict(errors))
+    return fieldset
+
+
+class FieldsetMixin:
+    """
+    Lets clients pick the fields of the representation with `?fields=` and the
+    relations embedded as objects with `?expand=`, validated against
+    `fieldset_schema`. The fast read path selects only the columns behind the
+    requested fields (`fieldset_sources` maps columns to the field they render
+    as, when the names differ) and `fast_serializer` receives the fieldset to
+    skip the relations nobody asked for; `get_queryset` should prefetch
+    according to `get_fieldset()` too.
+    """
+
+    fieldset_schema = {}
+    fieldset_sources = {}
+    default_expand = ()
+
+    def get_fieldset(self):
+        if not hasattr(self, "_fieldset"):
+            params = self.request.query_params
+            # CSV exports have fixed columns.
+            if getattr(self, "action", None) == "export" and params.get("output") == "csv":
+                params = {}
+            self._fieldset = parse_fieldset(params, self.fieldset_schema, self.default_expand)
+        return self._fieldset
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "fieldset": self.get_fieldset()}
+
+    def get_fast_fields(self):
+        fieldset = self.get_fieldset()
+        # The id is kept to attach relations to the rows; the fast serializer trims it.
+        return [
+            field
+            for field in super().get_fast_fields()
+            if field == "id" or fieldset.includes(self.fieldset_sources.get(field, field))
+        ]
+
+    def serialize_fast(self, rows):
+        with serialization_timer():
+            return self.fast_serializer(rows, self.get_fieldset())
+
+
+class FieldsetSerializerMixin:
+    """
+    Renders the fieldset in the "fieldset" context of the root serializer, or
+    the one its parent passed down: fields outside of it are left out, and the
+    relations in `compact_fields` that it doesn't expand are rendered with the
+    field that factory returns, primary keys by default. Without a fieldset,
+    everything is rendered as declared.
+    """
+
+    compact_fields = {}
+
+    @property
+    def fieldset(self):
+        if hasattr(self, "_fieldset"):
+            return self._fieldset
+        parent = self.parent
+        if parent is None or (isinstance(parent, ListSerializer) and parent.parent is None):
+            return self.context.get("fieldset")
+        return None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.fieldset
+        if fieldset is None:
+            return fields
+
+        for name, field in list(fields.items()):
+            if field.write_only:
+                continue
+            if not fieldset.includes(name):
+                del fields[name]
+            elif name in self.compact_fields and not fieldset.expands(name):
+                fields[name] = self.compact_fields[name]()
+            elif name in self.compact_fields:
+                getattr(field, "child", field)._fieldset = fieldset.nested(name)
+        return fields
+
+
+def primary_keys():
+    return PrimaryKeyRelatedField(many=True, read_only=True)
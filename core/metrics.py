@@ -0,0 +1,161 @@
+import hmac
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+QUERY_BUCKETS = [0, 1, 2, 3, 5, 10, 20, 50, 100, 200]
+SIZE_BUCKETS = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304]
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, lock, name, documentation, labelnames):
+        self.lock = lock
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self.values.items()):
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, lock, name, documentation, labelnames, buckets):
+        self.lock = lock
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self.values = {}
+
+    def observe(self, *labels, value):
+        # Per label set: one counter per bucket, then the sum and the count.
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            counts = self.values.get(labels)
+            if counts is None:
+                counts = self.values[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                counts[index] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def samples(self):
+        for labels, counts in sorted(self.values.items()):
+            labels = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": format_value(bound)}, cumulative
+            yield f"{self.name}_bucket", {**labels, "le": "+Inf"}, counts[-1]
+            yield f"{self.name}_sum", labels, counts[-2]
+            yield f"{self.name}_count", labels, counts[-1]
+
+
+class Registry:
+    """
+    In-process metrics. Values live in the worker process that recorded them,
+    so with several gunicorn workers a scrape reports only the worker that
+    served it; scrape each worker, or run one worker per container, for totals.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.metrics = {}
+        self.collectors = []
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.metrics.setdefault(name, Counter(self.lock, name, documentation, tuple(labelnames)))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        return self.metrics.setdefault(name, Histogram(self.lock, name, documentation, tuple(labelnames), buckets))
+
+    def register_collector(self, collector):
+        """`collector()` returns `(name, type, documentation, value)` tuples computed at scrape time."""
+        self.collectors.append(collector)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for metric in self.metrics.values():
+                lines.append(f"# HELP {metric.name} {metric.documentation}")
+                lines.append(f"# TYPE {metric.name} {metric.type}")
+                lines.extend(
+                    f"{name}{format_labels(labels)} {format_value(value)}" for name, labels, value in metric.samples()
+                )
+        for collector in self.collectors:
+            for name, metric_type, documentation, value in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.append(f"{name} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+requests_total = registry.counter(
+    "http_requests_total", "Requests by route, method and status.", ["route", "method", "status"]
+)
+request_duration = registry.histogram(
+    "http_request_duration_seconds", "Total time spent in Django per request.", ["route", "method"]
+)
+request_db_duration = registry.histogram(
+    "http_request_db_duration_seconds", "Time spent running database queries per request.", ["route", "method"]
+)
+request_db_queries = registry.histogram(
+    "http_request_db_queries", "Database queries per request.", ["route", "method"], QUERY_BUCKETS
+)
+request_serialize_duration = registry.histogram(
+    "http_request_serialize_duration_seconds",
+    "Time spent serializing objects per request, excluding the queries it runs.",
+    ["route", "method"],
+)
+request_render_duration = registry.histogram(
+    "http_request_render_duration_seconds", "Time spent rendering the response body.", ["route", "method"]
+)
+response_size = registry.histogram(
+    "http_response_size_bytes", "Size of non-streaming response bodies.", ["route", "method"], SIZE_BUCKETS
+)
+
+load_shed_total = registry.counter("load_shed_requests_total", "Requests answered 503 by the load shedder.", ["reason"])
+
+
+# A reverse proxy on the same host connects from loopback too; these mark its requests.
+FORWARDING_HEADERS = ["X-Forwarded-For", "Forwarded", "X-Real-IP"]
+
+
+def metrics_view(request):
+    # Without a token, only scrapers on the same host get the metrics, and not through a proxy.
+    token = settings.METRICS_TOKEN
+    if token:
+        allowed = hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}")
+    else:
+        allowed = request.META.get("REMOTE_ADDR") in ("127.0.0.1", "::1") and not any(
+            header in request.headers for header in FORWARDING_HEADERS
+        )
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
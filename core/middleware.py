@@ -0,0 +1,300 @@
+import math
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import FileResponse, JsonResponse
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from core import metrics
+
+current_timer = ContextVar("current_timer", default=None)
+
+
+class LatencyAverage:
+    """
+    Exponentially weighted average of query durations in this process. It
+    decays towards zero while no queries run, so a process that sheds every
+    request because of a slow database lets requests through again and
+    measures anew.
+    """
+
+    def __init__(self, weight=0.1, half_life=5.0):
+        self.lock = threading.Lock()
+        self.weight = weight
+        self.half_life = half_life
+        self.average = 0.0
+        self.updated = time.monotonic()
+
+    def observe(self, duration):
+        with self.lock:
+            self.average = self.value() * (1 - self.weight) + duration * self.weight
+            self.updated = time.monotonic()
+
+    def value(self):
+        return self.average * 0.5 ** ((time.monotonic() - self.updated) / self.half_life)
+
+
+query_latency = LatencyAverage()
+in_flight_lock = threading.Lock()
+in_flight = 0
+
+
+def collect_metrics():
+    return [
+        ("http_requests_in_flight", "gauge", "Requests in progress in this process.", in_flight),
+        ("db_query_latency_average_seconds", "gauge", "Decaying average query duration.", query_latency.value()),
+    ]
+
+
+metrics.registry.register_collector(collect_metrics)
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.serialize_duration = 0.0
+
+
+def time_query(execute, sql, params, many, context):
+    # Installed once per connection. The timer comes from the request's context, which
+    # async ORM calls carry over to the thread that runs the query.
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        timer.duration += duration
+        timer.count += 1
+        query_latency.observe(duration)
+
+
+def install_query_timer(connection, **kwargs):
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_query)
+
+
+connection_created.connect(install_query_timer)
+
+
+class ServerTimingMiddleware:
+    """
+    Measures each request's total time, database time and query count (through
+    an execute wrapper on every connection), serialization time (reported by
+    `core.timing`), render time and response size. The values go to the
+    per-route histograms in `core.metrics` and, when `SERVER_TIMING` is on, to
+    a `Server-Timing` header. Routes are labelled by URL name so the label set
+    stays small.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        start = time.perf_counter()
+        timer, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        return self.finish(request, response, start, timer)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        timer, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        return self.finish(request, response, start, timer)
+
+    def start(self, request):
+        timer = QueryTimer()
+        request.render_duration = 0.0
+        return timer, current_timer.set(timer)
+
+    def finish(self, request, response, start, timer):
+        duration = time.perf_counter() - start
+        self.record(request, response, duration, timer)
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = ", ".join(
+                [
+                    f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries"',
+                    f"serialize;dur={timer.serialize_duration * 1000:.1f}",
+                    f"render;dur={request.render_duration * 1000:.1f}",
+                    f"total;dur={duration * 1000:.1f}",
+                ]
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time the renderer through the render callbacks.
+        started = time.perf_counter()
+
+        def rendered(response):
+            request.render_duration += time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def record(self, request, response, duration, timer):
+        match = request.resolver_match
+        route = (match.view_name or match.route) if match else "unmatched"
+        method = request.method
+
+        metrics.requests_total.inc(route, method, str(response.status_code))
+        metrics.request_duration.observe(route, method, value=duration)
+        metrics.request_db_duration.observe(route, method, value=timer.duration)
+        metrics.request_db_queries.observe(route, method, value=timer.count)
+        metrics.request_serialize_duration.observe(route, method, value=timer.serialize_duration)
+        metrics.request_render_duration.observe(route, method, value=request.render_duration)
+        if not response.streaming:
+            metrics.response_size.observe(route, method, value=len(response.content))
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware is sync only, which would make Django run every async
+    view through a thread under ASGI. This serves the same files and passes
+    other requests on without leaving the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class ClosingContent:
+    """
+    Streaming content that calls `on_close` once when the response closes it,
+    which Django does after the body is sent or the client went away, even if
+    iteration never started.
+    """
+
+    def __init__(self, content, on_close):
+        self.content = content
+        self.on_close = on_close
+
+    def __iter__(self):
+        return iter(self.content)
+
+    def __aiter__(self):
+        return aiter(self.content)
+
+    def close(self):
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close()
+
+
+class LoadSheddingMiddleware:
+    """
+    Answers 503 with `Retry-After` instead of queueing more work once this
+    process has `LOAD_SHED_MAX_IN_FLIGHT` requests in progress, or once the
+    average query takes longer than `LOAD_SHED_DB_LATENCY` seconds. Either
+    limit is off when set to 0. Paths in `LOAD_SHED_EXEMPT_PATHS` are never
+    shed. A streaming response holds its slot until the server closes it, since
+    its body is produced after the view returns.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if response := self.enter(request):
+            return response
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            self.leave()
+            raise
+        return self.release(response)
+
+    async def __acall__(self, request):
+        if response := self.enter(request):
+            return response
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            self.leave()
+            raise
+        return self.release(response)
+
+    def enter(self, request):
+        global in_flight
+
+        exempt = request.path_info.startswith(tuple(settings.LOAD_SHED_EXEMPT_PATHS))
+        max_in_flight = settings.LOAD_SHED_MAX_IN_FLIGHT
+        max_latency = settings.LOAD_SHED_DB_LATENCY
+        with in_flight_lock:
+            if not exempt and max_in_flight and in_flight >= max_in_flight:
+                reason = "in_flight"
+            elif not exempt and max_latency and query_latency.value() > max_latency:
+                reason = "db_latency"
+            else:
+                in_flight += 1
+                return None
+
+        metrics.load_shed_total.inc(reason)
+        response = JsonResponse({"detail": "The server is overloaded, try again later."}, status=503)
+        response["Retry-After"] = str(math.ceil(settings.LOAD_SHED_RETRY_AFTER))
+        return response
+
+    def release(self, response):
+        # File bodies go to the server's file wrapper, which rewrapping the content would disable.
+        if response.streaming and not isinstance(response, FileResponse):
+            response.streaming_content = ClosingContent(response.streaming_content, self.leave)
+        else:
+            self.leave()
+        return response
+
+    def leave(self):
+        global in_flight
+
+        with in_flight_lock:
+            in_flight -= 1
@@ -0,0 +1,56 @@
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+
+
+class KeysetPagination(CursorPagination):
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class SwitchablePagination(BasePagination):
+    """
+    Page number pagination by default, keyset pagination on opaque `id` cursors
+    when the client asks for it with `?pagination=cursor`, sends a `cursor` or
+    uses one of the `cursor_versions` of the API.
+    """
+
+    query_param = "pagination"
+    cursor_versions = ("v2",)
+
+    def __init__(self):
+        self.page_number = PageNumberPagination()
+        self.keyset = KeysetPagination()
+        self.delegate = self.page_number
+
+    def use_keyset(self, request):
+        mode = request.query_params.get(self.query_param)
+        if mode:
+            return mode == "cursor"
+        return self.keyset.cursor_query_param in request.query_params or request.version in self.cursor_versions
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.delegate = self.keyset if self.use_keyset(request) else self.page_number
+        return self.delegate.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.delegate.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.delegate.get_paginated_response_schema(schema)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.delegate, "display_page_controls", False)
+
+    def to_html(self):
+        return self.delegate.to_html()
+
+    def get_results(self, data):
+        return self.delegate.get_results(data)
+
+    def get_schema_fields(self, view):
+        return self.page_number.get_schema_fields(view) + self.keyset.get_schema_fields(view)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = self.page_number.get_schema_operation_parameters(view)
+        return parameters + self.keyset.get_schema_operation_parameters(view)
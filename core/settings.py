@@ -29,6 +29,7 @@ INSTALLED_APPS = [
     "rest_framework.authtoken",
     "order",
     "product",
+    "jobs",
 ]
 
 if DEBUG:
@@ -38,6 +39,8 @@ if DEBUG:
 
 # Middleware
 MIDDLEWARE = [
+    "core.middleware.ServerTimingMiddleware",
+    "core.middleware.LoadSheddingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -45,7 +48,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.AsyncWhiteNoiseMiddleware",
 ]
 
 # Arquivos estáticos
@@ -79,9 +82,88 @@ DATABASES = {
     "default": dj_database_url.config(
         default=os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
         conn_max_age=600,
+        conn_health_checks=True,
     )
 }
 
+# Réplicas de leitura (URLs separadas por espaço). GETs de produtos, categorias e pedidos vão para elas.
+DATABASE_REPLICAS = []
+for index, url in enumerate(os.getenv("DATABASE_REPLICA_URLS", "").split()):
+    DATABASES[f"replica_{index}"] = {
+        **dj_database_url.parse(url, conn_max_age=600, conn_health_checks=True),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{index}")
+DATABASE_ROUTERS = ["core.db_router.PrimaryReplicaRouter"]
+DATABASE_REPLICA_MAX_LAG = float(os.getenv("DATABASE_REPLICA_MAX_LAG", "5"))  # segundos; acima disso lê do primário
+DATABASE_REPLICA_CHECK_INTERVAL = float(os.getenv("DATABASE_REPLICA_CHECK_INTERVAL", "1"))
+# depois de uma escrita, as leituras ficam no primário por este tempo (deve passar do atraso máximo)
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", "10"))
+
+# Pool de conexões nativo do Django (psycopg 3), um por processo e banco. Substitui as conexões persistentes.
+DATABASE_POOL = os.getenv("DATABASE_POOL", "1") == "1"
+for database in DATABASES.values():
+    if DATABASE_POOL and database["ENGINE"] == "django.db.backends.postgresql":
+        from psycopg_pool import ConnectionPool
+
+        database["CONN_MAX_AGE"] = 0
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", "2")),
+            # uma conexão por thread do worker do gunicorn
+            "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", os.getenv("GUNICORN_THREADS", "4"))),
+            "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "10")),  # espera máxima por uma conexão livre
+            "max_idle": float(os.getenv("DATABASE_POOL_MAX_IDLE", "300")),
+            "max_lifetime": float(os.getenv("DATABASE_POOL_MAX_LIFETIME", "1800")),
+            "check": ConnectionPool.check_connection,  # testa a conexão antes de entregá-la
+        }
+
+
+# Cache
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "bookstore"),
+    }
+}
+CATALOG_CACHE_ALIAS = os.getenv("CATALOG_CACHE_ALIAS", "default")
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", "300"))
+
+# Cache de autenticação (tokens e credenciais Basic já validados)
+AUTH_CACHE_ALIAS = os.getenv("AUTH_CACHE_ALIAS", "default")
+AUTH_CACHE_TIMEOUT = int(os.getenv("AUTH_CACHE_TIMEOUT", "300"))  # 0 desativa o cache
+
+# Proteção contra sobrecarga
+THROTTLE_ENABLED = os.getenv("THROTTLE_ENABLED", "1") == "1"
+THROTTLE_CACHE_ALIAS = os.getenv("THROTTLE_CACHE_ALIAS", "default")  # use um cache compartilhado (Redis) em produção
+# requisições simultâneas por processo; 0 desativa
+LOAD_SHED_MAX_IN_FLIGHT = int(os.getenv("LOAD_SHED_MAX_IN_FLIGHT", "64"))
+LOAD_SHED_DB_LATENCY = float(os.getenv("LOAD_SHED_DB_LATENCY", "0.5"))  # média por query, em segundos; 0 desativa
+LOAD_SHED_RETRY_AFTER = int(os.getenv("LOAD_SHED_RETRY_AFTER", "2"))
+LOAD_SHED_EXEMPT_PATHS = ["/metrics", "/static/"]
+
+# Pedidos com o cabeçalho Idempotency-Key: a resposta é guardada e repetida nas novas tentativas
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", "86400"))  # segundos; limpe com purge_idempotency_keys
+
+# Fila de tarefas em segundo plano (python manage.py runworker)
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "2"))  # threads por worker
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1"))  # segundos entre consultas com a fila vazia
+JOBS_RETRY_BACKOFF = float(
+    os.getenv("JOBS_RETRY_BACKOFF", "10")
+)  # segundos antes da 2ª tentativa, dobrando a cada falha
+JOBS_RETRY_BACKOFF_MAX = float(os.getenv("JOBS_RETRY_BACKOFF_MAX", "3600"))
+# o worker marca as tarefas em execução (updated_at) a cada JOBS_HEARTBEAT_INTERVAL segundos
+JOBS_HEARTBEAT_INTERVAL = float(os.getenv("JOBS_HEARTBEAT_INTERVAL", "30"))
+# tarefas "running" sem sinal há mais tempo que isso são consideradas órfãs (worker morto) e voltam para a fila
+JOBS_STALE_AFTER = int(os.getenv("JOBS_STALE_AFTER", "300"))
+JOBS_REQUEUE_INTERVAL = float(os.getenv("JOBS_REQUEUE_INTERVAL", "60"))  # segundos entre buscas por tarefas órfãs
+JOBS_METRICS_CACHE_TIMEOUT = int(os.getenv("JOBS_METRICS_CACHE_TIMEOUT", "15"))  # segundos entre contagens da fila
+
+# Métricas
+SERVER_TIMING = os.getenv("SERVER_TIMING", "1") == "1"  # cabeçalho Server-Timing nas respostas
+# /metrics exige "Authorization: Bearer <token>"; sem token, só responde a conexões locais (127.0.0.1 / ::1)
+# que não passaram por um proxy (sem X-Forwarded-For, Forwarded ou X-Real-IP). Defina o token em produção.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 
 # Senhas
 AUTH_PASSWORD_VALIDATORS = [
@@ -104,13 +186,29 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 # Django REST Framework
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.SwitchablePagination",
     "PAGE_SIZE": 5,
+    "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.URLPathVersioning",
+    "ALLOWED_VERSIONS": ["v1", "v2"],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.BasicAuthentication",
+        "core.authentication.CachedBasicAuthentication",
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "core.authentication.CachedTokenAuthentication",
     ],
+    "DEFAULT_THROTTLE_CLASSES": ["core.throttling.TokenBucketThrottle"],
+    # "<throttle_scope>.read" / "<throttle_scope>.write", por usuário autenticado ou por IP
+    "DEFAULT_THROTTLE_RATES": {
+        "products.read": os.getenv("THROTTLE_PRODUCTS_READ", "600/min"),
+        "products.write": os.getenv("THROTTLE_PRODUCTS_WRITE", "120/min"),
+        "categories.read": os.getenv("THROTTLE_CATEGORIES_READ", "600/min"),
+        "categories.write": os.getenv("THROTTLE_CATEGORIES_WRITE", "60/min"),
+        "orders.read": os.getenv("THROTTLE_ORDERS_READ", "300/min"),
+        "orders.write": os.getenv("THROTTLE_ORDERS_WRITE", "60/min"),
+        "jobs.read": os.getenv("THROTTLE_JOBS_READ", "300/min"),
+        "jobs.write": os.getenv("THROTTLE_JOBS_WRITE", "30/min"),
+    },
+    # proxies na frente da app (1 no Render); o IP do cliente sai do X-Forwarded-For
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
 }
 
 # Debug Toolbar
@@ -0,0 +1,78 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from core import metrics
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+throttle_total = metrics.registry.counter(
+    "throttle_requests_total", "Requests checked by the token bucket throttle, by rate and result.", ["rate", "result"]
+)
+
+
+def parse_rate(rate):
+    """`"600/min"` -> `(600, 10.0)`: bucket capacity and tokens refilled per second."""
+    count, period = rate.split("/")
+    capacity = int(count)
+    return capacity, capacity / DURATIONS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    One token bucket per client (the user when authenticated, the IP
+    otherwise) and per `throttle_scope` of the view, with separate budgets for
+    reads and writes: `<scope>.read` and `<scope>.write` in
+    `DEFAULT_THROTTLE_RATES`. A rate of "600/min" allows bursts of 600 requests
+    and refills 10 per second. Scopes without a rate are not throttled.
+
+    Buckets live in the `THROTTLE_CACHE_ALIAS` cache so that all workers share
+    them. The update is a read followed by a write, so concurrent requests of
+    one client can overshoot the budget by a few requests.
+    """
+
+    def get_rate_name(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if scope is None:
+            return None
+        return f"{scope}.{'read' if request.method in SAFE_METHODS else 'write'}"
+
+    def get_client_ident(self, request):
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view):
+        if not settings.THROTTLE_ENABLED:
+            return True
+        name = self.get_rate_name(request, view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(name)
+        if rate is None:
+            return True
+
+        capacity, refill = parse_rate(rate)
+        cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        key = f"throttle:{name}:{self.get_client_ident(request)}"
+        now = time.time()
+
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+            self.retry_after = None
+        else:
+            self.retry_after = (1 - tokens) / refill
+        # A bucket left alone for this long is full again, which is what a missing key means.
+        cache.set(key, (tokens, now), timeout=math.ceil((capacity - tokens) / refill) + 1)
+
+        throttle_total.inc(name, "allowed" if allowed else "throttled")
+        return allowed
+
+    def wait(self):
+        return self.retry_after
@@ -0,0 +1,36 @@
+import time
+from contextlib import contextmanager
+
+from rest_framework.serializers import ListSerializer
+
+from core.middleware import current_timer
+
+
+@contextmanager
+def serialization_timer():
+    """Adds the time spent in the block, minus its queries, to the request's serialize timing."""
+    timer = current_timer.get()
+    if timer is None:
+        yield
+        return
+
+    start, db_start = time.perf_counter(), timer.duration
+    try:
+        yield
+    finally:
+        timer.serialize_duration += time.perf_counter() - start - (timer.duration - db_start)
+
+
+class TimedSerializerMixin:
+    """
+    Reports the time spent turning objects into their representation to
+    `ServerTimingMiddleware`. Only the root serializer, or each item of a root
+    `many=True` list, is timed, so nested serializers aren't counted twice.
+    """
+
+    def to_representation(self, instance):
+        parent = self.parent
+        if parent is None or (isinstance(parent, ListSerializer) and parent.parent is None):
+            with serialization_timer():
+                return super().to_representation(instance)
+        return super().to_representation(instance)
@@ -11,6 +11,8 @@ from django.http import JsonResponse
 from django.urls import include, path
 from rest_framework.authtoken.views import obtain_auth_token
 
+from core.metrics import metrics_view
+
 
 def home(request):
     return JsonResponse(
@@ -18,10 +20,13 @@ def home(request):
             "message": "API Bookstore funcionando",
             "endpoints": {
                 "admin": "/admin/",
+                "metrics": "/metrics",
                 "__debug__": "/__debug__/",
                 "orders": "/bookstore/v1/order/",
                 "products": "/bookstore/v1/product/",
                 "categories": "/bookstore/v1/product/categories/",
+                "async": "/bookstore/v1/async/",
+                "jobs": "/bookstore/v1/jobs/",
             },
         }
     )
@@ -31,6 +36,7 @@ urlpatterns = [
     path("", home),
     path("admin/", admin.site.urls),
     path("api-token-auth/", obtain_auth_token, name="api_token_auth"),
+    path("metrics", metrics_view, name="metrics"),
     path(
         "bookstore/<str:version>/",
         include(
@@ -38,6 +44,8 @@ urlpatterns = [
                 path("order/", include("order.urls")),
                 path("category/", include("product.urls")),
                 path("product/", include("product.urls")),
+                path("async/", include("product.async_urls")),
+                path("jobs/", include("jobs.urls")),
             ]
         ),
     ),
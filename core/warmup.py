@@ -0,0 +1,37 @@
+import logging
+
+from django.apps import apps
+from django.db import DatabaseError, connections
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up():
+    """
+    Does the lazy work that the first requests of every worker would otherwise
+    pay for: imports each view through the URLconf, builds the reverse lookup
+    tables and fills the model metadata caches. With `preload_app` gunicorn
+    runs it once in the master and the forked workers inherit the result.
+    """
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for model in apps.get_models():
+        model._meta.get_fields()
+        model._meta.concrete_fields
+        model._meta.related_objects
+
+    # Connections must not be shared with the forked workers.
+    connections.close_all()
+
+
+def connect():
+    """Opens each database connection, and with it the pool, before the worker accepts requests."""
+    for connection in connections.all():
+        try:
+            connection.ensure_connection()
+        except DatabaseError:
+            # An unreachable database must not stop the worker from booting; requests will retry.
+            logger.warning("Could not connect to database %r on worker start", connection.alias, exc_info=True)
+        finally:
+            connection.close()
@@ -0,0 +1,40 @@
+"""
+Production gunicorn settings, read from the working directory on start. Any
+value can be overridden on the command line or through GUNICORN_CMD_ARGS.
+"""
+
+import os
+
+cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+wsgi_app = "core.asgi:application" if "Uvicorn" in worker_class else "core.wsgi:application"
+
+# Processes for the CPU, threads to overlap database and network waits. Each
+# worker has its own connection pool, sized by GUNICORN_THREADS in settings.
+workers = int(os.getenv("WEB_CONCURRENCY", cpus * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# Import and warm the app once in the master, before the port is bound; workers fork from the warm copy.
+preload_app = True
+# Recycle workers now and then so slow leaks stay bounded; the jitter keeps them from restarting together.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = max_requests // 10
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+# The worker heartbeat files go to memory instead of the container's overlay filesystem.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def on_starting(server):
+    from core.warmup import warm_up
+
+    warm_up()
+
+
+def post_fork(server, worker):
+    from core.warmup import connect
+
+    connect()
@@ -0,0 +1,91 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connection
+
+from jobs.models import Job
+from jobs.worker import Worker
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the background jobs stored in the database, highest priority first, with --concurrency threads. "
+        "Requeues the jobs of dead workers every JOBS_REQUEUE_INTERVAL seconds. "
+        "Stops after the running jobs finish on SIGINT or SIGTERM."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=settings.JOBS_CONCURRENCY)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Seconds a thread waits before looking for jobs again when the queue is empty.",
+        )
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is due instead of waiting.")
+
+    def handle(self, *args, concurrency, poll_interval, burst, **options):
+        self.stopping = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *args: self.stopping.set())
+
+        self.requeue_lock = threading.Lock()
+        self.next_requeue = 0.0
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Worker {prefix} running {concurrency} threads.")
+        if concurrency == 1:
+            self.loop(Worker(f"{prefix}:0"), poll_interval, burst)
+        else:
+            threads = [
+                threading.Thread(target=self.thread, args=(Worker(f"{prefix}:{index}"), poll_interval, burst))
+                for index in range(concurrency)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.stdout.write(self.style.SUCCESS("Worker stopped."))
+
+    def loop(self, worker, poll_interval, burst):
+        while not self.stopping.is_set():
+            # Like a request: drop connections that broke or outlived CONN_MAX_AGE.
+            close_old_connections()
+            try:
+                self.requeue_stale()
+                ran = worker.run_one()
+            except DatabaseError:
+                # The database went away or is busy; the job, if claimed, is requeued once it goes stale.
+                logger.exception("Worker %s could not reach the database", worker.name)
+                self.stopping.wait(poll_interval)
+                continue
+            if not ran:
+                if burst:
+                    return
+                self.stopping.wait(poll_interval)
+
+    def requeue_stale(self):
+        """Gives back the jobs of dead workers, at most once per JOBS_REQUEUE_INTERVAL across the threads."""
+        with self.requeue_lock:
+            if time.monotonic() < self.next_requeue:
+                return
+            self.next_requeue = time.monotonic() + settings.JOBS_REQUEUE_INTERVAL
+        requeued = Job.objects.requeue_stale()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale jobs.")
+
+    def thread(self, worker, poll_interval, burst):
+        try:
+            self.loop(worker, poll_interval, burst)
+        finally:
+            # Each thread has its own connection.
+            connection.close()
@@ -0,0 +1,129 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import DatabaseError, connections, models, router, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+
+class JobQuerySet(models.QuerySet):
+    def due(self, now=None):
+        return self.filter(status=Job.QUEUED, run_at__lte=now or timezone.now()).order_by("-priority", "run_at", "id")
+
+    def claim(self, worker):
+        """
+        Marks the next due job as running for `worker` and returns it, or None
+        when nothing is due. On databases with `SKIP LOCKED` (PostgreSQL)
+        concurrent workers skip the rows another one is claiming. Elsewhere
+        each candidate is claimed with a standalone conditional UPDATE, which
+        SQLite serializes (waiting on its busy timeout, unlike a transaction
+        that read first), so a job is still only claimed once.
+        """
+        alias = router.db_for_write(self.model)
+        queryset = self.using(alias)
+        if not connections[alias].features.has_select_for_update_skip_locked:
+            for pk in queryset.due().values_list("pk", flat=True)[:10]:
+                if queryset.filter(pk=pk, status=Job.QUEUED).update(**self.claimed_values(worker)):
+                    return queryset.get(pk=pk)
+            return None
+
+        with transaction.atomic(using=alias):
+            pk = queryset.due().select_for_update(skip_locked=True).values_list("pk", flat=True).first()
+            if pk is None:
+                return None
+            queryset.filter(pk=pk).update(**self.claimed_values(worker))
+            return queryset.get(pk=pk)
+
+    def claimed_values(self, worker):
+        now = timezone.now()
+        return {
+            "status": Job.RUNNING,
+            "attempts": F("attempts") + 1,
+            "locked_by": worker,
+            "started_at": now,
+            "updated_at": now,
+        }
+
+    def stale(self, now=None):
+        """Running jobs whose worker stopped sending heartbeats, e.g. because it was killed."""
+        timeout = timedelta(seconds=settings.JOBS_STALE_AFTER)
+        return self.filter(status=Job.RUNNING, updated_at__lt=(now or timezone.now()) - timeout)
+
+    def heartbeat(self, pk, worker):
+        """Marks the job as still running, as long as `worker` holds it."""
+        return self.filter(pk=pk, status=Job.RUNNING, locked_by=worker).update(updated_at=timezone.now())
+
+    def requeue_stale(self):
+        """Gives stale jobs back to the queue, or fails them when they have no attempts left."""
+        now = timezone.now()
+        stale = self.stale(now)
+        stale.filter(attempts__gte=F("max_attempts")).update(
+            status=Job.FAILED, last_error="The worker stopped while running the job.", finished_at=now, updated_at=now
+        )
+        return stale.update(status=Job.QUEUED, locked_by="", run_at=now, updated_at=now)
+
+    def finished_before(self, when):
+        return self.filter(status__in=[Job.SUCCEEDED, Job.FAILED], finished_at__lt=when)
+
+
+class Job(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [(QUEUED, "Queued"), (RUNNING, "Running"), (SUCCEEDED, "Succeeded"), (FAILED, "Failed")]
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    priority = models.SmallIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    locked_by = models.CharField(max_length=100, blank=True)
+    result = models.JSONField(null=True)
+    last_error = models.TextField(blank=True)
+    user = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # What `due()` scans: only the queued rows, in the order they are claimed.
+            models.Index(
+                fields=["-priority", "run_at", "id"], condition=Q(status="queued"), name="jobs_job_queued_idx"
+            ),
+            models.Index(fields=["status", "finished_at"], name="jobs_job_status_finished_idx"),
+            models.Index(fields=["user", "id"], name="jobs_job_user_idx"),
+        ]
+
+
+METRICS_KEY = "jobs:metrics"
+
+
+def collect_metrics():
+    # Counted at most once per JOBS_METRICS_CACHE_TIMEOUT, however often /metrics is scraped.
+    cache = caches["default"]
+    counts = cache.get(METRICS_KEY)
+    if counts is None:
+        try:
+            counts = dict(
+                Job.objects.filter(status__in=[Job.QUEUED, Job.RUNNING])
+                .values_list("status")
+                .annotate(count=Count("pk"))
+                .order_by()
+            )
+        except DatabaseError:
+            # /metrics keeps answering while the database is down, without the job gauges.
+            return []
+        cache.set(METRICS_KEY, counts, timeout=settings.JOBS_METRICS_CACHE_TIMEOUT)
+    return [
+        ("jobs_queued", "gauge", "Background jobs waiting for a worker.", counts.get(Job.QUEUED, 0)),
+        ("jobs_running", "gauge", "Background jobs being run by a worker.", counts.get(Job.RUNNING, 0)),
+    ]
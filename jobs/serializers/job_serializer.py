@@ -0,0 +1,56 @@
+from rest_framework import serializers
+
+from core.timing import TimedSerializerMixin
+from jobs.models import Job
+from jobs.tasks import TASKS, enqueue
+
+
+class JobSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    priority = serializers.IntegerField(required=False, min_value=-100, max_value=100)
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "task",
+            "payload",
+            "status",
+            "priority",
+            "run_at",
+            "attempts",
+            "max_attempts",
+            "result",
+            "last_error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = [
+            "status",
+            "attempts",
+            "max_attempts",
+            "result",
+            "last_error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+    def validate_task(self, value):
+        if value not in TASKS:
+            raise serializers.ValidationError(f"Must be one of: {', '.join(sorted(TASKS))}.")
+        return value
+
+    def validate_payload(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Must be an object with the task's arguments.")
+        return value
+
+    def create(self, validated_data):
+        return enqueue(
+            validated_data["task"],
+            validated_data.get("payload"),
+            priority=validated_data.get("priority"),
+            run_at=validated_data.get("run_at"),
+            user=validated_data.get("user"),
+        )
@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from jobs.models import Job
+
+TASKS = {}
+
+
+class Task:
+    def __init__(self, name, func, priority=0, max_attempts=3):
+        self.name = name
+        self.func = func
+        self.priority = priority
+        self.max_attempts = max_attempts
+
+    def __call__(self, payload):
+        return self.func(**payload)
+
+
+def task(name, priority=0, max_attempts=3):
+    """
+    Registers the decorated function as the job `name`. It is called with the
+    job payload as keyword arguments, must be safe to run again (a job is
+    retried when it raises or its worker dies) and returns the JSON result.
+    """
+
+    def register(func):
+        TASKS[name] = Task(name, func, priority=priority, max_attempts=max_attempts)
+        return func
+
+    return register
+
+
+def command_task(name, command, priority=0, max_attempts=3):
+    """Registers the management command `command` as the job `name`; the payload holds its options."""
+
+    @task(name, priority=priority, max_attempts=max_attempts)
+    def run_command(**options):
+        output = StringIO()
+        call_command(command, stdout=output, **options)
+        return {"output": output.getvalue()}
+
+    return run_command
+
+
+def enqueue(name, payload=None, priority=None, run_at=None, user=None):
+    if name not in TASKS:
+        raise KeyError(f"Unknown task: {name}.")
+    registered = TASKS[name]
+    job = Job(
+        task=name,
+        payload=payload or {},
+        priority=registered.priority if priority is None else priority,
+        max_attempts=registered.max_attempts,
+        user=user,
+    )
+    if run_at is not None:
+        job.run_at = run_at
+    job.save()
+    return job
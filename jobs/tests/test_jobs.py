@@ -0,0 +1,238 @@
+import time
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jobs.models import Job
+from jobs.models.job import collect_metrics
+from jobs.tasks import TASKS, enqueue, task
+from jobs.worker import Worker
+from order.factories import OrderFactory, UserFactory
+from order.models import Order
+from product.factories import ProductFactory
+from product.models import Product
+
+
+@pytest.fixture
+def flaky():
+    calls = []
+
+    @task("tests.flaky", max_attempts=2)
+    def flaky(fail=True):
+        calls.append(fail)
+        if fail:
+            raise RuntimeError("boom")
+        return {"ok": True}
+
+    yield calls
+    del TASKS["tests.flaky"]
+
+
+@pytest.mark.django_db
+def test_jobs_are_claimed_by_priority_then_age(flaky):
+    low = enqueue("tests.flaky", {"fail": False})
+    high = enqueue("tests.flaky", {"fail": False}, priority=5)
+    enqueue("tests.flaky", {"fail": False}, priority=9, run_at=timezone.now() + timedelta(hours=1))
+    later = enqueue("tests.flaky", {"fail": False})
+
+    claimed = [Job.objects.claim("test") for _ in range(4)]
+
+    assert [job.pk if job else None for job in claimed] == [high.pk, low.pk, later.pk, None]
+    assert (claimed[0].status, claimed[0].attempts, claimed[0].locked_by) == (Job.RUNNING, 1, "test")
+
+
+@pytest.mark.django_db
+def test_failed_jobs_are_retried_with_backoff_then_fail(flaky, settings):
+    settings.JOBS_RETRY_BACKOFF = 60
+    job = enqueue("tests.flaky")
+    worker = Worker("test")
+
+    assert worker.run_one()
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (Job.QUEUED, 1)
+    assert timezone.now() + timedelta(seconds=29) < job.run_at < timezone.now() + timedelta(seconds=61)
+    assert "RuntimeError: boom" in job.last_error
+    assert not worker.run_one()
+
+    Job.objects.update(run_at=timezone.now())
+    assert worker.run_one()
+    job.refresh_from_db()
+    assert (job.status, job.attempts, len(flaky)) == (Job.FAILED, 2, 2)
+    assert job.finished_at is not None
+
+
+@pytest.mark.django_db
+def test_unknown_tasks_fail_without_retries():
+    job = Job.objects.create(task="gone")
+
+    Worker("test").run_one()
+
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (Job.FAILED, 1)
+    assert "Unknown task: gone." in job.last_error
+
+
+@pytest.mark.django_db
+def test_stale_jobs_are_requeued_or_failed(flaky, settings):
+    settings.JOBS_STALE_AFTER = 60
+    retried, exhausted = enqueue("tests.flaky"), enqueue("tests.flaky")
+    Job.objects.claim("dead"), Job.objects.claim("dead")
+    Job.objects.filter(pk=exhausted.pk).update(attempts=2)
+    Job.objects.update(updated_at=timezone.now() - timedelta(seconds=61))
+
+    assert Job.objects.requeue_stale() == 1
+
+    assert Job.objects.get(pk=retried.pk).status == Job.QUEUED
+    assert Job.objects.get(pk=exhausted.pk).status == Job.FAILED
+
+
+@pytest.mark.django_db
+def test_heartbeats_keep_long_jobs_from_going_stale(settings):
+    settings.JOBS_STALE_AFTER = 60
+    job = enqueue("order.recompute_totals")
+    Job.objects.claim("alive")
+    Job.objects.update(started_at=timezone.now() - timedelta(hours=1), updated_at=timezone.now() - timedelta(hours=1))
+
+    assert Job.objects.heartbeat(job.pk, "other") == 0
+    assert Job.objects.stale().exists()
+    assert Job.objects.heartbeat(job.pk, "alive") == 1
+    assert not Job.objects.stale().exists()
+    assert Job.objects.requeue_stale() == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_sends_heartbeats_while_a_job_runs(settings):
+    settings.JOBS_HEARTBEAT_INTERVAL = 0.01
+
+    @task("tests.slow")
+    def slow():
+        # Wait until the heartbeat thread has moved updated_at past the claim.
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            job = Job.objects.get(task="tests.slow")
+            if job.updated_at > job.started_at:
+                return {"heartbeat": True}
+            time.sleep(0.01)
+        return {"heartbeat": False}
+
+    try:
+        job = enqueue("tests.slow")
+        assert Worker("w1").run_one()
+    finally:
+        del TASKS["tests.slow"]
+
+    job.refresh_from_db()
+    assert (job.status, job.result) == (Job.SUCCEEDED, {"heartbeat": True})
+
+
+@pytest.mark.django_db
+def test_a_worker_does_not_overwrite_a_job_taken_from_it():
+    @task("tests.requeued")
+    def requeued():
+        # Meanwhile the job went stale and another worker claimed it.
+        Job.objects.filter(task="tests.requeued").update(locked_by="w2")
+        return {}
+
+    try:
+        job = enqueue("tests.requeued")
+        assert Worker("w1").run_one()
+    finally:
+        del TASKS["tests.requeued"]
+
+    job.refresh_from_db()
+    assert (job.status, job.locked_by, job.result) == (Job.RUNNING, "w2", None)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_runworker_requeues_jobs_that_go_stale_while_it_runs(settings):
+    settings.JOBS_STALE_AFTER = 60
+    settings.JOBS_REQUEUE_INTERVAL = 0
+    orphan = enqueue("order.recompute_totals")
+    Job.objects.claim("dead")
+
+    @task("tests.kill_other_worker")
+    def kill_other_worker():
+        Job.objects.filter(pk=orphan.pk).update(updated_at=timezone.now() - timedelta(seconds=61))
+        return {}
+
+    try:
+        enqueue("tests.kill_other_worker")
+        call_command("runworker", "--burst", "--concurrency", "1", stdout=StringIO())
+    finally:
+        del TASKS["tests.kill_other_worker"]
+
+    orphan.refresh_from_db()
+    assert (orphan.status, orphan.attempts) == (Job.SUCCEEDED, 2)
+
+
+@pytest.mark.django_db
+def test_job_gauges_are_cached(django_assert_num_queries):
+    caches["default"].clear()
+    enqueue("order.recompute_totals")
+
+    with django_assert_num_queries(1):
+        assert collect_metrics()[0][-1] == 1
+    enqueue("order.recompute_totals")
+    with django_assert_num_queries(0):
+        assert collect_metrics()[0][-1] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_runworker_runs_due_jobs_and_exits_in_burst_mode():
+    order = OrderFactory(products=[ProductFactory(price=30)])
+    Order.objects.update(total=0)
+    job = enqueue("order.recompute_totals", {"batch_size": 10})
+    out = StringIO()
+
+    call_command("runworker", "--burst", "--concurrency", "1", stdout=out)
+
+    job.refresh_from_db()
+    assert job.status == Job.SUCCEEDED
+    assert "fixed 1 out-of-sync totals" in job.result["output"]
+    assert Order.objects.get(pk=order.pk).total == 30
+    assert "Worker stopped." in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_jobs_endpoint():
+    client = APIClient()
+    user, admin = UserFactory(), UserFactory(is_staff=True)
+    url = reverse("job-list", kwargs={"version": "v1"})
+
+    client.force_authenticate(user=user)
+    assert client.post(url, {"task": "order.recompute_totals"}, format="json").status_code == 403
+
+    client.force_authenticate(user=admin)
+    assert client.post(url, {"task": "nope"}, format="json").status_code == 400
+    response = client.post(url, {"task": "product.clear_catalog_cache", "priority": 50}, format="json")
+    assert response.status_code == 201
+    assert (response.json()["status"], response.json()["priority"]) == ("queued", 50)
+    assert client.get(url).json()["count"] == 1
+
+    client.force_authenticate(user=user)
+    assert client.get(url).json()["count"] == 0
+    assert client.get(reverse("job-detail", kwargs={"version": "v1", "pk": response.json()["id"]})).status_code == 404
+
+
+@pytest.mark.django_db
+def test_bulk_import_can_be_handed_off():
+    client = APIClient()
+    user = UserFactory()
+    client.force_authenticate(user=user)
+    items = [{"title": f"Livro {index}", "price": index, "sku": f"L{index}", "categories_id": []} for index in range(3)]
+
+    response = client.post(reverse("product-bulk", kwargs={"version": "v1"}) + "?background=1", items, format="json")
+
+    assert response.status_code == 202
+    assert not Product.objects.exists()
+    Worker("test").run_one()
+    status = client.get(response["Location"]).json()
+    assert status["status"] == "succeeded"
+    assert sorted(status["result"]["created"]) == sorted(Product.objects.values_list("pk", flat=True))
+    assert Job.objects.get().user == user
@@ -0,0 +1,11 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from .viewsets import JobViewSet
+
+router = DefaultRouter()
+router.register(r"jobs", JobViewSet, basename="job")
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
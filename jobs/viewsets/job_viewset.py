@@ -0,0 +1,31 @@
+from rest_framework import mixins
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser, IsAuthenticated
+from rest_framework.viewsets import GenericViewSet
+
+from jobs.models import Job
+from jobs.serializers import JobSerializer
+
+
+class JobViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, GenericViewSet):
+    """
+    Status of the background jobs. Users see the jobs they started, e.g. a
+    bulk import handed off with `?background=1`; admins see every job and may
+    enqueue any registered task directly.
+    """
+
+    serializer_class = JobSerializer
+    throttle_scope = "jobs"
+
+    def get_permissions(self):
+        if self.request.method in SAFE_METHODS:
+            return [IsAuthenticated()]
+        return [IsAdminUser()]
+
+    def get_queryset(self):
+        queryset = Job.objects.order_by("-id")
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
@@ -0,0 +1,89 @@
+import logging
+import random
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.tasks import TASKS
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter: about JOBS_RETRY_BACKOFF x 2^(attempts - 1) seconds, capped."""
+    delay = min(settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1), settings.JOBS_RETRY_BACKOFF_MAX)
+    return delay * random.uniform(0.5, 1)
+
+
+class Worker:
+    def __init__(self, name):
+        self.name = name
+
+    def run_one(self):
+        """Runs the next due job, if any, and tells whether there was one."""
+        job = Job.objects.claim(self.name)
+        if job is None:
+            return False
+        self.run(job)
+        return True
+
+    def run(self, job):
+        fields = ["status", "result", "last_error", "run_at", "finished_at", "locked_by", "updated_at"]
+        registered = TASKS.get(job.task)
+        try:
+            if registered is None:
+                raise LookupError(f"Unknown task: {job.task}.")
+            with self.heartbeat(job):
+                job.result = registered(job.payload)
+        except Exception:
+            logger.exception("Job %s (%s) failed on attempt %s", job.pk, job.task, job.attempts)
+            job.last_error = traceback.format_exc()[-10000:]
+            if registered is not None and job.attempts < job.max_attempts:
+                job.status = Job.QUEUED
+                job.run_at = timezone.now() + timedelta(seconds=retry_delay(job.attempts))
+            else:
+                job.status = Job.FAILED
+                job.finished_at = timezone.now()
+        else:
+            job.status = Job.SUCCEEDED
+            job.finished_at = timezone.now()
+        job.locked_by = ""
+        job.updated_at = timezone.now()
+        # Only while the job is still ours: once requeued as stale it may belong to another worker.
+        owned = Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=self.name)
+        if not owned.update(**{field: getattr(job, field) for field in fields}):
+            logger.warning("Job %s (%s) was taken from worker %s, its outcome is dropped", job.pk, job.task, self.name)
+        return job
+
+    @contextmanager
+    def heartbeat(self, job):
+        """
+        Bumps the job's `updated_at` every `JOBS_HEARTBEAT_INTERVAL` seconds
+        while the block runs, from a thread of its own, so a long job is not
+        taken for one whose worker died.
+        """
+        stop = threading.Event()
+        thread = threading.Thread(target=self.beat, args=(job.pk, stop), daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def beat(self, pk, stop):
+        try:
+            while not stop.wait(settings.JOBS_HEARTBEAT_INTERVAL):
+                try:
+                    Job.objects.heartbeat(pk, self.name)
+                except DatabaseError:
+                    logger.exception("Worker %s could not send the heartbeat of job %s", self.name, pk)
+        finally:
+            # The thread has its own connection.
+            connection.close()
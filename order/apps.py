@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class OrderConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "order"
+
+    def ready(self):
+        from core import authentication  # noqa: F401
+        from order import signals, tasks  # noqa: F401
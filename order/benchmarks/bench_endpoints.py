@@ -0,0 +1,51 @@
+"""
+Latency, throughput, queries and memory of every order action, for baskets of
+--bench-basket products.
+
+    pytest order/benchmarks/bench_endpoints.py -s --bench-basket=1,10,100 --bench-json=build/bench.json
+
+See core/benchmark.py for the options and the baseline comparison.
+"""
+
+import pytest
+from django.contrib.auth.models import User
+
+from order.benchmarks.datasets import create_orders
+from order.models import Order
+from product.benchmarks.bench_endpoints import api_client, catalog, url  # noqa: F401
+
+
+@pytest.fixture(scope="module")
+def orders(catalog, basket_size, django_db_blocker):  # noqa: F811
+    with django_db_blocker.unblock():
+        user, _ = User.objects.get_or_create(username="benchmark")
+        yield create_orders(user, 100, basket_size, catalog.product_ids)
+        Order.objects.filter(user=user).delete()
+
+
+@pytest.mark.django_db
+def test_order_actions(catalog, orders, basket_size, api_client, bench):  # noqa: F811
+    name = f"[{catalog.size}-basket{basket_size}]"
+    products_id = catalog.product_ids[:basket_size]
+
+    bench(f"orders.list{name}", lambda index: api_client.get(url("order-list")))
+    bench(f"orders.list_cursor{name}", lambda index: api_client.get(url("order-list"), {"pagination": "cursor"}))
+    bench(f"orders.retrieve{name}", lambda index: api_client.get(url("order-detail", pk=orders[50])))
+    bench(f"orders.export{name}", lambda index: api_client.get(url("order-export")), repeat=5)
+    bench(
+        f"orders.create{name}",
+        lambda index: api_client.post(url("order-list"), {"products_id": products_id}, format="json"),
+    )
+    bench(
+        f"orders.update{name}",
+        lambda index: api_client.put(
+            url("order-detail", pk=orders[index]), {"products_id": products_id[index % 2 :]}, format="json"
+        ),
+    )
+    bench(
+        f"orders.partial_update{name}",
+        lambda index: api_client.patch(
+            url("order-detail", pk=orders[index]), {"products_id": products_id[: index % 2 + 1]}, format="json"
+        ),
+    )
+    bench(f"orders.destroy{name}", lambda index: api_client.delete(url("order-detail", pk=orders[-index - 1])))
@@ -0,0 +1,52 @@
+"""
+Serializer vs fast read path for order listings.
+
+    pytest order/benchmarks/bench_serialization.py -s
+"""
+
+import pytest
+from django.contrib.auth.models import User
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from core.benchmark import measure, report
+from core.renderers import FastJSONRenderer
+from order.models import Order
+from order.serializers import OrderSerializer
+from order.serializers.fast_serializers import ORDER_FIELDS, serialize_orders
+from product.benchmarks.datasets import create_catalog
+from product.models import Category, Product
+
+
+def create_orders(size, basket_size=3):
+    create_catalog(200)
+    product_ids = list(Product.objects.values_list("id", flat=True))
+    user = User.objects.create(username="benchmark")
+    orders = Order.objects.bulk_create(Order(user=user) for _ in range(size))
+    through = Order.products.through
+    through.objects.bulk_create(
+        through(order_id=order.pk, product_id=product_ids[(order.pk * 7 + offset) % len(product_ids)])
+        for order in orders
+        for offset in range(basket_size)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", [1_000, 10_000])
+def test_order_list_serialization(size):
+    create_orders(size)
+    orders = Order.objects.with_total().order_by("id")
+
+    def serializer_path():
+        queryset = orders.prefetch_related(
+            Prefetch("products", queryset=Product.objects.order_by("id")),
+            Prefetch("products__category", queryset=Category.objects.order_by("id")),
+        )
+        return JSONRenderer().render(OrderSerializer(queryset, many=True).data)
+
+    def fast_path():
+        return FastJSONRenderer().render(serialize_orders(orders.values(*ORDER_FIELDS)))
+
+    assert serializer_path() == fast_path()
+    speedup = report(f"{size} orders", measure(serializer_path), measure(fast_path))
+    assert speedup > 1
@@ -0,0 +1,14 @@
+from order.models import Order
+
+
+def create_orders(user, count, basket_size, product_ids):
+    """Creates `count` orders for `user` with `basket_size` distinct products each and their stored totals."""
+    orders = Order.objects.bulk_create(Order(user=user) for _ in range(count))
+    through = Order.products.through
+    through.objects.bulk_create(
+        through(order_id=order.pk, product_id=product_ids[(index * 7 + offset) % len(product_ids)])
+        for index, order in enumerate(orders)
+        for offset in range(min(basket_size, len(product_ids)))
+    )
+    Order.objects.filter(pk__in=[order.pk for order in orders]).refresh_totals()
+    return [order.pk for order in orders]
@@ -0,0 +1,58 @@
+import hashlib
+import json
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from order.models import IdempotencyKey
+
+
+def request_fingerprint(request):
+    raw = json.dumps([request.method, request.get_full_path(), request.data], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class IdempotentCreateMixin:
+    """
+    Makes `create` safe to retry when the client sends an `Idempotency-Key`
+    header. The first request runs in a transaction that also stores its
+    response under (user, key); duplicates wait on that row's lock and then
+    replay the stored response without touching the view's tables. Requests
+    that fail are rolled back with their key, so they can be retried.
+    Reusing a key for a different payload answers 422.
+    """
+
+    idempotency_header = "Idempotency-Key"
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(self.idempotency_header)
+        if key is None:
+            return super().create(request, *args, **kwargs)
+        if not key or len(key) > 255:
+            raise ValidationError({self.idempotency_header: ["Must have between 1 and 255 characters."]})
+
+        fingerprint = request_fingerprint(request)
+        with transaction.atomic():
+            record, created = IdempotencyKey.objects.select_for_update().get_or_create(
+                user=request.user, key=key, defaults={"fingerprint": fingerprint}
+            )
+            if not created and record.is_expired():
+                record.fingerprint, record.created_at, created = fingerprint, timezone.now(), True
+
+            if not created:
+                if record.fingerprint != fingerprint:
+                    return Response(
+                        {"detail": f"This {self.idempotency_header} was used with a different request."},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                return Response(
+                    record.response_body, status=record.status_code, headers={"Idempotent-Replayed": "true"}
+                )
+
+            response = super().create(request, *args, **kwargs)
+            record.status_code, record.response_body = response.status_code, response.data
+            record.save()
+        return response
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+
+class RollupCommand(BaseCommand):
+    """Recomputes the rows of a rollup model from the orders, `batch_size` rows at a time."""
+
+    model = None
+    rows_name = "rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report missing and out-of-sync rows, without fixing them.",
+        )
+
+    def handle(self, *args, batch_size, check, **options):
+        rollups = self.model.objects
+        missing = list(rollups.missing())
+        checked = drifted = 0
+        last_pk = 0
+
+        while True:
+            pks = list(rollups.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            checked += len(pks)
+
+            stale = list(rollups.filter(pk__in=pks).drifted().values_list("pk", flat=True))
+            drifted += len(stale)
+            if stale and not check:
+                rollups.filter(pk__in=stale).refresh()
+
+        if check and (drifted or missing):
+            raise CommandError(
+                f"{drifted} of {checked} {self.rows_name} are out of sync and {len(missing)} are missing."
+            )
+
+        if not check:
+            for start in range(0, len(missing), batch_size):
+                batch = missing[start : start + batch_size]
+                rollups.ensure(batch)
+                rollups.filter(pk__in=batch).refresh()
+
+        action = "found" if check else "fixed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} {self.rows_name}, {action} {drifted} out-of-sync and {len(missing)} missing."
+            )
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from order.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Deletes the stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, batch_size, **options):
+        deleted = 0
+        while True:
+            ids = list(IdempotencyKey.objects.expired().values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            deleted += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired idempotency keys."))
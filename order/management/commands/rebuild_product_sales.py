@@ -0,0 +1,8 @@
+from order.management.commands._rollup import RollupCommand
+from order.models import ProductSales
+
+
+class Command(RollupCommand):
+    help = "Recomputes the units sold of every product from the orders."
+    model = ProductSales
+    rows_name = "products"
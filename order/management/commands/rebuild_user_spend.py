@@ -0,0 +1,8 @@
+from order.management.commands._rollup import RollupCommand
+from order.models import UserSpend
+
+
+class Command(RollupCommand):
+    help = "Recomputes the order count and spend of every customer from their orders."
+    model = UserSpend
+    rows_name = "customers"
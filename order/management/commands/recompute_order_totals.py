@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from order.models import Order
+
+
+class Command(BaseCommand):
+    help = "Recomputes the stored order totals from the products of each order."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report orders whose stored total is out of sync, without fixing them.",
+        )
+
+    def handle(self, *args, batch_size, check, **options):
+        checked = drifted = 0
+        last_id = 0
+
+        while True:
+            ids = list(Order.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            last_id = ids[-1]
+            checked += len(ids)
+
+            stale = list(
+                Order.objects.filter(pk__in=ids)
+                .with_total()
+                .exclude(total=F("products_total"))
+                .values_list("pk", flat=True)
+            )
+            drifted += len(stale)
+            if stale and not check:
+                Order.objects.filter(pk__in=stale).refresh_totals()
+
+        if check and drifted:
+            raise CommandError(f"{drifted} of {checked} orders have an out-of-sync total.")
+
+        action = "found" if check else "fixed"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} orders, {action} {drifted} out-of-sync totals."))
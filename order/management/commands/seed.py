@@ -0,0 +1,166 @@
+import random
+from bisect import bisect
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from order.models import Order, ProductSales, UserSpend
+from product.cache import bump_catalog_version
+from product.models import Category, CategoryStats, Product
+
+ADJECTIVES = (
+    "Antigo Azul Breve Claro Doce Escuro Eterno Grande Leve Longo Novo Perdido Quieto Secreto Velho Vivo".split()
+)
+NOUNS = (
+    "Abismo Caminho Castelo Céu Destino Espelho Horizonte Jardim Mar Mundo Navio Rio Segredo Sol Tempo Vento".split()
+)
+GENRES = "Aventura Biografia Culinária Fantasia Ficção História Infantil Poesia Romance Suspense Terror Viagem".split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a deterministic load-test dataset of categories, products, users and orders with bulk inserts. "
+        "The same --seed always produces the same rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--products", type=int, default=10000)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--orders", type=int, default=20000)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, seed, categories, products, users, orders, batch_size, **options):
+        if min(categories, products, users) < 1 or orders < 0:
+            raise CommandError("--categories, --products and --users must be positive.")
+        if Category.objects.filter(slug=self.category_slug(seed, 0)).exists():
+            raise CommandError(f"The dataset for --seed {seed} already exists; pick another seed.")
+
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+
+        with transaction.atomic():
+            category_ids = self.create_categories(seed, categories)
+            prices = self.create_products(seed, products, category_ids)
+            CategoryStats.objects.rebuild()
+            user_ids = self.create_users(seed, users)
+            self.create_orders(orders, user_ids, prices)
+            UserSpend.objects.rebuild()
+            ProductSales.objects.rebuild()
+
+        bump_catalog_version()
+
+    def category_slug(self, seed, index):
+        return f"seed-{seed}-{index}"
+
+    def log(self, message):
+        self.stdout.write(message)
+
+    def create_categories(self, seed, count):
+        categories = [
+            Category(
+                title=f"{self.rng.choice(GENRES)} {index}",
+                slug=self.category_slug(seed, index),
+                active=self.rng.random() > 0.05,
+            )
+            for index in range(count)
+        ]
+        Category.objects.bulk_create(categories, batch_size=self.batch_size)
+        Category.objects.rebuild_paths()
+        self.log(f"Created {count} categories.")
+        return [category.pk for category in categories]
+
+    def create_products(self, seed, count, category_ids):
+        # A few genres hold most of the catalog.
+        category_weights = list(accumulate(1 / (rank + 1) for rank in range(len(category_ids))))
+        through = Product.category.through
+        prices = {}
+
+        for start in range(0, count, self.batch_size):
+            batch, categories = [], []
+            for index in range(start, min(start + self.batch_size, count)):
+                batch.append(
+                    Product(
+                        title=f"{self.rng.choice(ADJECTIVES)} {self.rng.choice(NOUNS)} {index}",
+                        description=self.rng.choice(
+                            [None, "", "Edição revisada.", "Capa dura, edição de colecionador."]
+                        ),
+                        price=int(self.rng.lognormvariate(3.5, 0.7)) + 1,
+                        active=self.rng.random() > 0.1,
+                        sku=f"SEED{seed}-{index:09d}",
+                    )
+                )
+                size = self.rng.choice([1, 1, 1, 2, 3])
+                categories.append(set(self.rng.choices(category_ids, cum_weights=category_weights, k=size)))
+            Product.objects.bulk_create(batch, batch_size=self.batch_size)
+
+            through.objects.bulk_create(
+                [
+                    through(product_id=product.pk, category_id=category_id)
+                    for product, product_categories in zip(batch, categories)
+                    for category_id in product_categories
+                ],
+                batch_size=self.batch_size,
+            )
+            prices.update((product.pk, product.price) for product in batch)
+            self.log(f"Created {start + len(batch)} of {count} products.")
+
+        return prices
+
+    def create_users(self, seed, count):
+        # Hashing a password per user would dominate the run, so every user shares one unusable password.
+        password = make_password(None)
+        user_ids = []
+
+        for start in range(0, count, self.batch_size):
+            batch = [
+                User(username=f"seed{seed}_{index}", email=f"seed{seed}_{index}@example.com", password=password)
+                for index in range(start, min(start + self.batch_size, count))
+            ]
+            User.objects.bulk_create(batch, batch_size=self.batch_size)
+            Token.objects.bulk_create([Token(key=Token.generate_key(), user=user) for user in batch])
+            user_ids.extend(user.pk for user in batch)
+            self.log(f"Created {start + len(batch)} of {count} users.")
+
+        return user_ids
+
+    def create_orders(self, count, user_ids, prices):
+        # Popularity follows a long tail: a few users place most orders and a few products sell the most.
+        # Ranks are shuffled so the popular rows are spread across the id range.
+        user_ids, product_ids = list(user_ids), list(prices)
+        self.rng.shuffle(user_ids)
+        self.rng.shuffle(product_ids)
+        user_weights = list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(user_ids))))
+        product_weights = list(accumulate(1 / (rank + 1) ** 1.1 for rank in range(len(product_ids))))
+        through = Order.products.through
+
+        for start in range(0, count, self.batch_size):
+            batch, products = [], []
+            for _ in range(start, min(start + self.batch_size, count)):
+                size = self.rng.choices([1, 2, 3, 4, 6, 10], weights=[40, 25, 15, 10, 7, 3])[0]
+                chosen = {product_ids[self.pick(product_weights)] for _ in range(size)}
+                batch.append(
+                    Order(
+                        user_id=user_ids[self.pick(user_weights)],
+                        total=sum(prices[product_id] or 0 for product_id in chosen),
+                    )
+                )
+                products.append(sorted(chosen))
+            Order.objects.bulk_create(batch, batch_size=self.batch_size)
+            through.objects.bulk_create(
+                [
+                    through(order_id=order.pk, product_id=product_id)
+                    for order, order_products in zip(batch, products)
+                    for product_id in order_products
+                ],
+                batch_size=self.batch_size,
+            )
+            self.log(f"Created {start + len(batch)} of {count} orders.")
+
+    def pick(self, cum_weights):
+        return bisect(cum_weights, self.rng.random() * cum_weights[-1])
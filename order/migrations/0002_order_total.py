@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:34
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_totals(apps, schema_editor):
+    Order = apps.get_model("order", "Order")
+    products_total = (
+        Order.products.through.objects.filter(order=OuterRef("pk"))
+        .values("order")
+        .annotate(total=Sum("product__price"))
+        .values("total")
+    )
+    Order.objects.update(total=Coalesce(Subquery(products_total), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0001_initial"),
+        ("product", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="total",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["user", "total"], name="order_order_user_id_80a7d2_idx"),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_rollups(apps, schema_editor):
+    Order = apps.get_model("order", "Order")
+    UserSpend = apps.get_model("order", "UserSpend")
+    ProductSales = apps.get_model("order", "ProductSales")
+
+    UserSpend.objects.bulk_create(
+        (
+            UserSpend(user_id=row["user"], order_count=row["order_count"], spend=row["spend"] or 0)
+            for row in Order.objects.values("user").annotate(order_count=Count("pk"), spend=Sum("total")).order_by()
+        ),
+        batch_size=1000,
+    )
+    ProductSales.objects.bulk_create(
+        (
+            ProductSales(product_id=row["product"], units_sold=row["units_sold"])
+            for row in Order.products.through.objects.values("product").annotate(units_sold=Count("pk")).order_by()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("order", "0003_order_updated_at"),
+        ("product", "0007_category_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductSales",
+            fields=[
+                (
+                    "product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="sales_rollup",
+                        serialize=False,
+                        to="product.product",
+                    ),
+                ),
+                ("units_sold", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["units_sold", "product"], name="order_produ_units_s_e3df0c_idx")],
+            },
+        ),
+        migrations.CreateModel(
+            name="UserSpend",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="spend_rollup",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("order_count", models.PositiveIntegerField(default=0)),
+                ("spend", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["spend", "user"], name="order_users_spend_9f69fc_idx")],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
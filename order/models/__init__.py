@@ -1 +1,3 @@
+from .idempotency import IdempotencyKey
 from .order import Order
+from .rollups import ProductSales, UserSpend
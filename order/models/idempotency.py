@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class IdempotencyKeyQuerySet(models.QuerySet):
+    def expired(self, now=None):
+        return self.filter(created_at__lt=(now or timezone.now()) - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL))
+
+
+class IdempotencyKey(models.Model):
+    """The response to the first request a user sent with an `Idempotency-Key`, replayed to the retries."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = IdempotencyKeyQuerySet.as_manager()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "key"], name="order_idempotency_key_unique")]
+
+    def is_expired(self):
+        return self.created_at < timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
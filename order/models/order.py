@@ -1,13 +1,34 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from product.models import Product
 
 
+class OrderQuerySet(models.QuerySet):
+    def with_total(self):
+        return self.annotate(products_total=Coalesce(Sum("products__price"), Value(0)))
+
+    def refresh_totals(self):
+        through = Order.products.through
+        products_total = (
+            through.objects.filter(order=OuterRef("pk"))
+            .values("order")
+            .annotate(total=Sum("product__price"))
+            .values("total")
+        )
+        return self.update(total=Coalesce(Subquery(products_total), Value(0)), updated_at=timezone.now())
+
+
 class Order(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     products = models.ManyToManyField(Product)
+    total = models.PositiveBigIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = OrderQuerySet.as_manager()
 
-    @property
-    def total(self):
-        return sum(p.price for p in self.products.all())
+    class Meta:
+        indexes = [models.Index(fields=["user", "total"])]
@@ -0,0 +1,94 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from product.models import Product
+
+from .order import Order
+
+
+class RollupQuerySet(models.QuerySet):
+    """
+    Rows summing up the orders of one key each, maintained incrementally by the
+    order signals. Subclasses define `key`, the model the rows belong to, and
+    `actual_values()`, the aggregates recomputed from the orders.
+    """
+
+    key = None
+
+    def with_actual(self):
+        return self.annotate(**{f"actual_{field}": value for field, value in self.actual_values().items()})
+
+    def drifted(self):
+        """The rows whose stored values differ from the orders."""
+        return self.with_actual().exclude(**{field: F(f"actual_{field}") for field in self.actual_values()})
+
+    def ensure(self, pks):
+        self.bulk_create([self.model(**{f"{self.key}_id": pk}) for pk in pks], ignore_conflicts=True)
+
+    def refresh(self):
+        return self.update(**self.actual_values(), updated_at=timezone.now())
+
+    def rebuild(self):
+        """Creates the missing rows and recomputes every one of them."""
+        self.ensure(self.missing())
+        return self.all().refresh()
+
+
+class UserSpendQuerySet(RollupQuerySet):
+    key = "user"
+
+    def actual_values(self):
+        orders = Order.objects.filter(user=OuterRef("pk")).values("user")
+        return {
+            "order_count": Coalesce(Subquery(orders.annotate(count=Count("pk")).values("count")), Value(0)),
+            "spend": Coalesce(Subquery(orders.annotate(spend=Sum("total")).values("spend")), Value(0)),
+        }
+
+    def missing(self):
+        return (
+            User.objects.filter(order__isnull=False, spend_rollup__isnull=True).values_list("pk", flat=True).distinct()
+        )
+
+
+class ProductSalesQuerySet(RollupQuerySet):
+    key = "product"
+
+    def actual_values(self):
+        sold = Order.products.through.objects.filter(product=OuterRef("pk")).values("product")
+        return {"units_sold": Coalesce(Subquery(sold.annotate(units=Count("pk")).values("units")), Value(0))}
+
+    def missing(self):
+        return (
+            Product.objects.filter(order__isnull=False, sales_rollup__isnull=True)
+            .values_list("pk", flat=True)
+            .distinct()
+        )
+
+    def add_units(self, units):
+        return self.update(units_sold=Greatest(F("units_sold") + units, 0), updated_at=timezone.now())
+
+
+class UserSpend(models.Model):
+    user = models.OneToOneField(User, primary_key=True, on_delete=models.CASCADE, related_name="spend_rollup")
+    order_count = models.PositiveIntegerField(default=0)
+    spend = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserSpendQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["spend", "user"])]
+
+
+class ProductSales(models.Model):
+    product = models.OneToOneField(Product, primary_key=True, on_delete=models.CASCADE, related_name="sales_rollup")
+    units_sold = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ProductSalesQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["units_sold", "product"])]
@@ -1 +1,2 @@
 from .order_serializer import OrderSerializer
+from .rollup_serializers import ProductSalesSerializer, UserSpendSerializer
@@ -0,0 +1,48 @@
+from collections import defaultdict
+
+from core.fieldsets import parse_fieldset
+from order.models import Order
+from product.serializers.fast_serializers import PRODUCT_FIELDS, PRODUCT_SCHEMA, serialize_products
+
+# Read-only counterpart of OrderSerializer for rows of `Order.objects.with_total().values(*ORDER_FIELDS)`.
+ORDER_FIELDS = ["id", "user", "products_total"]
+ORDER_SCHEMA = {"id": None, "user": None, "products": PRODUCT_SCHEMA, "total": None}
+ORDER_FIELDSET = parse_fieldset({}, ORDER_SCHEMA, default_expand=["products", "products.category"])
+
+
+def get_products_by_order(order_ids, fieldset):
+    links = Order.products.through.objects.filter(order_id__in=order_ids).order_by("order_id", "product_id")
+    products = defaultdict(list)
+    if not fieldset.expands("products"):
+        for order_id, product_id in links.values_list("order_id", "product_id"):
+            products[order_id].append(product_id)
+        return products
+
+    product_fieldset = fieldset.nested("products")
+    fields = ["id", *(field for field in product_fieldset.select(PRODUCT_FIELDS) if field != "id")]
+    order_ids, rows = [], []
+    for order_id, *values in links.values_list("order_id", *[f"product__{field}" for field in fields]):
+        order_ids.append(order_id)
+        rows.append(dict(zip(fields, values)))
+    for order_id, product in zip(order_ids, serialize_products(rows, product_fieldset)):
+        products[order_id].append(product)
+    return products
+
+
+def serialize_orders(rows, fieldset=ORDER_FIELDSET):
+    rows = list(rows)
+    products = {}
+    if fieldset.includes("products"):
+        products = get_products_by_order([row["id"] for row in rows], fieldset)
+
+    return fieldset.trim(
+        [
+            {
+                "id": row["id"],
+                "user": row.get("user"),
+                "products": products.get(row["id"], []),
+                "total": row.get("products_total"),
+            }
+            for row in rows
+        ]
+    )
@@ -1,15 +1,19 @@
 from rest_framework import serializers
 
+from core.fields import BatchedPrimaryKeyRelatedField
+from core.fieldsets import FieldsetSerializerMixin, primary_keys
+from core.timing import TimedSerializerMixin
 from order.models import Order
 from product.models import Product
 from product.serializers import ProductSerializer
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(TimedSerializerMixin, FieldsetSerializerMixin, serializers.ModelSerializer):
     products = ProductSerializer(many=True, read_only=True)
-    products_id = serializers.PrimaryKeyRelatedField(
+    products_id = BatchedPrimaryKeyRelatedField(
         queryset=Product.objects.all(), many=True, write_only=True, source="products"
     )
+    compact_fields = {"products": primary_keys}
 
     total = serializers.SerializerMethodField()
 
@@ -19,4 +23,5 @@ class OrderSerializer(serializers.ModelSerializer):
         read_only_fields = ["user", "total"]
 
     def get_total(self, instance):
-        return sum([product.price for product in instance.products.all()])
+        total = getattr(instance, "products_total", None)
+        return instance.total if total is None else total
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+
+from core.timing import TimedSerializerMixin
+from order.models import ProductSales, UserSpend
+
+
+class UserSpendSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    username = serializers.CharField(source="user.username", read_only=True)
+
+    class Meta:
+        model = UserSpend
+        fields = ["user", "username", "order_count", "spend"]
+
+
+class ProductSalesSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    title = serializers.CharField(source="product.title", read_only=True)
+
+    class Meta:
+        model = ProductSales
+        fields = ["product", "title", "units_sold"]
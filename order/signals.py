@@ -0,0 +1,148 @@
+from django.db import transaction
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from order.models import Order, ProductSales, UserSpend
+from product.models import Product
+from product.signals import products_bulk_saved
+
+
+def refresh_spend_on_commit(orders):
+    # Recomputing mid-transaction would let the deltas still to come (the rest of a
+    # bulk or cascade delete) apply twice, so the refresh waits for the commit.
+    user_ids = set(orders.values_list("user", flat=True))
+    if user_ids:
+        transaction.on_commit(lambda: UserSpend.objects.filter(pk__in=user_ids).refresh())
+
+
+@receiver(m2m_changed, sender=Order.products.through)
+def sync_total_on_products_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action == "pre_clear":
+            instance._cleared_order_ids = list(instance.order_set.values_list("pk", flat=True))
+            return
+        if action == "post_add":
+            orders = Order.objects.filter(pk__in=pk_set)
+            orders.update(total=F("total") + (instance.price or 0), updated_at=timezone.now())
+        elif action == "post_remove":
+            orders = Order.objects.filter(pk__in=pk_set)
+            orders.refresh_totals()
+        elif action == "post_clear":
+            orders = Order.objects.filter(pk__in=instance.__dict__.pop("_cleared_order_ids", []))
+            orders.refresh_totals()
+        else:
+            return
+        refresh_spend_on_commit(orders)
+        return
+
+    if action == "post_add":
+        added = Product.objects.filter(pk__in=pk_set).aggregate(total=Coalesce(Sum("price"), Value(0)))["total"]
+        Order.objects.filter(pk=instance.pk).update(total=F("total") + added, updated_at=timezone.now())
+        UserSpend.objects.filter(pk=instance.user_id).update(spend=F("spend") + added, updated_at=timezone.now())
+    elif action in ("post_remove", "post_clear"):
+        orders = Order.objects.filter(pk=instance.pk)
+        orders.refresh_totals()
+        refresh_spend_on_commit(orders)
+    else:
+        return
+    instance.refresh_from_db(fields=["total", "updated_at"])
+
+
+@receiver(post_save, sender=Product)
+def sync_totals_on_price_changed(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    loaded_values = getattr(instance, "_loaded_values", {})
+    orders = Order.objects.filter(products=instance)
+    if "price" not in loaded_values:
+        orders.refresh_totals()
+        refresh_spend_on_commit(orders)
+    elif loaded_values["price"] != instance.price:
+        orders.update(
+            total=F("total") + (instance.price or 0) - (loaded_values["price"] or 0), updated_at=timezone.now()
+        )
+        refresh_spend_on_commit(orders)
+    loaded_values["price"] = instance.price
+
+
+@receiver(pre_delete, sender=Product)
+def remember_orders_before_product_deleted(sender, instance, **kwargs):
+    instance._order_ids = list(instance.order_set.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Product)
+def sync_totals_on_product_deleted(sender, instance, **kwargs):
+    orders = Order.objects.filter(pk__in=instance.__dict__.pop("_order_ids", []))
+    orders.refresh_totals()
+    refresh_spend_on_commit(orders)
+
+
+@receiver(products_bulk_saved, sender=Product)
+def sync_totals_on_products_bulk_saved(sender, updated, **kwargs):
+    if updated:
+        orders = Order.objects.filter(products__in=updated)
+        orders.refresh_totals()
+        refresh_spend_on_commit(orders)
+
+
+# Creating and deleting orders, and adding or removing their products, change the
+# rollups by deltas only: a bulk delete removes every row before the first
+# post_delete, so recomputing from the orders halfway through would have the
+# remaining deltas applied twice. The recomputes above run on commit for the
+# same reason.
+
+
+@receiver(post_save, sender=Order)
+def count_order_on_created(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    UserSpend.objects.ensure([instance.user_id])
+    UserSpend.objects.filter(pk=instance.user_id).update(
+        order_count=F("order_count") + 1, spend=F("spend") + instance.total, updated_at=timezone.now()
+    )
+
+
+@receiver(pre_delete, sender=Order)
+def remember_products_before_order_deleted(sender, instance, **kwargs):
+    instance._sold_product_ids = list(instance.products.values_list("pk", flat=True))
+    instance._saved_total = Order.objects.values_list("total", flat=True).get(pk=instance.pk)
+
+
+@receiver(post_delete, sender=Order)
+def uncount_order_on_deleted(sender, instance, **kwargs):
+    UserSpend.objects.filter(pk=instance.user_id).update(
+        order_count=Greatest(F("order_count") - 1, 0),
+        spend=Greatest(F("spend") - instance._saved_total, 0),
+        updated_at=timezone.now(),
+    )
+    ProductSales.objects.filter(pk__in=instance.__dict__.pop("_sold_product_ids")).add_units(-1)
+
+
+@receiver(m2m_changed, sender=Order.products.through)
+def sync_sales_on_products_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        sales = ProductSales.objects.filter(pk=instance.pk)
+        if action == "pre_clear":
+            instance._cleared_units = instance.order_set.count()
+        elif action == "post_add":
+            ProductSales.objects.ensure([instance.pk])
+            sales.add_units(len(pk_set))
+        elif action == "post_remove":
+            sales.add_units(-len(pk_set))
+        elif action == "post_clear":
+            sales.add_units(-instance.__dict__.pop("_cleared_units", 0))
+        return
+
+    if action == "pre_clear":
+        instance._cleared_product_ids = list(instance.products.values_list("pk", flat=True))
+    elif action == "post_add":
+        ProductSales.objects.ensure(pk_set)
+        ProductSales.objects.filter(pk__in=pk_set).add_units(1)
+    elif action == "post_remove":
+        ProductSales.objects.filter(pk__in=pk_set).add_units(-1)
+    elif action == "post_clear":
+        ProductSales.objects.filter(pk__in=instance.__dict__.pop("_cleared_product_ids", [])).add_units(-1)
@@ -0,0 +1,5 @@
+from jobs.tasks import command_task
+
+command_task("order.recompute_totals", "recompute_order_totals")
+command_task("order.rebuild_user_spend", "rebuild_user_spend")
+command_task("order.rebuild_product_sales", "rebuild_product_sales")
@@ -0,0 +1,129 @@
+import base64
+from unittest import mock
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from core.authentication import invalidate_user, lookups_total
+from order.factories import UserFactory
+
+
+class TestCachedAuthentication(APITestCase):
+
+    def setUp(self):
+        caches["default"].clear()
+        self.user = UserFactory()
+        self.user.set_password("segredo-123")
+        self.user.save()
+        self.token = Token.objects.create(user=self.user)
+        self.url = reverse("order-list", kwargs={"version": "v1"})
+        self.products_url = reverse("product-list", kwargs={"version": "v1"})
+
+    def get_with_token(self, key=None):
+        return self.client.get(self.url, HTTP_AUTHORIZATION=f"Token {key or self.token.key}")
+
+    def get_with_basic(self, password="segredo-123"):
+        credentials = base64.b64encode(f"{self.user.username}:{password}".encode()).decode()
+        return self.client.get(self.products_url, HTTP_AUTHORIZATION=f"Basic {credentials}")
+
+    def auth_queries(self, response_callable):
+        with CaptureQueriesContext(connection) as queries:
+            response = response_callable()
+        return response, [query["sql"] for query in queries if "auth" in query["sql"]]
+
+    def test_token_lookup_is_cached(self):
+        response, queries = self.auth_queries(self.get_with_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+
+        response, queries = self.auth_queries(self.get_with_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+
+    def test_basic_credentials_are_cached(self):
+        self.assertEqual(self.get_with_basic().status_code, status.HTTP_200_OK)
+
+        response, queries = self.auth_queries(self.get_with_basic)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+        self.assertEqual(self.get_with_basic("errada").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cache_holds_no_raw_credentials(self):
+        self.get_with_token()
+        self.get_with_basic()
+
+        stored = repr(dict(caches["default"]._cache))
+        self.assertNotIn(self.token.key, stored)
+        self.assertNotIn("segredo-123", stored)
+
+    def test_cache_holds_no_password_hash(self):
+        self.get_with_basic()
+
+        self.assertNotIn(self.user.password, repr(dict(caches["default"]._cache)))
+        response = self.get_with_basic()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.wsgi_request.user.get_deferred_fields(), {"password"})
+        self.assertEqual(response.wsgi_request.user.username, self.user.username)
+
+    def test_deleted_token_is_rejected(self):
+        key = self.token.key
+        self.get_with_token()
+        self.token.delete()
+
+        self.assertEqual(self.get_with_token(key).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_invalidates_basic_credentials(self):
+        self.get_with_basic()
+        self.user.set_password("nova-senha-456")
+        self.user.save()
+
+        self.assertEqual(self.get_with_basic().status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.get_with_basic("nova-senha-456").status_code, status.HTTP_200_OK)
+
+    def test_credentials_checked_during_an_invalidation_are_not_cached(self):
+        check = TokenAuthentication.authenticate_credentials
+
+        def check_then_invalidate(authentication, key):
+            # The user changes after the token was read from the database.
+            result = check(authentication, key)
+            invalidate_user(self.user.pk)
+            return result
+
+        with mock.patch.object(TokenAuthentication, "authenticate_credentials", check_then_invalidate):
+            self.assertEqual(self.get_with_token().status_code, status.HTTP_200_OK)
+
+        response, queries = self.auth_queries(self.get_with_token)
+        self.assertEqual(len(queries), 1)
+
+    def test_deactivated_user_is_rejected(self):
+        self.get_with_token()
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.get_with_token().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_hit_and_miss_metrics(self):
+        before = dict(lookups_total.values)
+        self.get_with_token()
+        self.get_with_token()
+        self.get_with_token()
+
+        def delta(result):
+            return lookups_total.values.get(("token", result), 0) - before.get(("token", result), 0)
+
+        self.assertEqual((delta("hit"), delta("miss")), (2, 1))
+        self.assertIn('auth_cache_lookups_total{scheme="token",result="hit"}', self.client.get(reverse("metrics")).text)
+
+    @override_settings(AUTH_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        self.get_with_token()
+
+        response, queries = self.auth_queries(self.get_with_token)
+        self.assertEqual(len(queries), 1)
@@ -0,0 +1,88 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from order.factories import UserFactory
+from order.models import IdempotencyKey, Order
+from product.factories import ProductFactory
+
+
+class TestIdempotentOrderCreation(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.product = ProductFactory(price=30)
+        self.url = reverse("order-list", kwargs={"version": "v1"})
+
+    def post(self, key, products=None):
+        return self.client.post(
+            self.url, {"products_id": products or [self.product.pk]}, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retries_replay_the_first_response(self):
+        first = self.post("pedido-1")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with CaptureQueriesContext(connection) as queries:
+            retry = self.post("pedido-1")
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertFalse(any("order_order" in query["sql"] for query in queries.captured_queries))
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_keys_are_scoped_per_user(self):
+        self.post("pedido-1")
+        self.client.force_authenticate(user=UserFactory())
+        self.post("pedido-1")
+
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_reusing_a_key_for_another_payload_is_rejected(self):
+        self.post("pedido-1")
+
+        response = self.post("pedido-1", products=[ProductFactory().pk])
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failed_requests_can_be_retried(self):
+        response = self.post("pedido-1", products=[999])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        response = self.post("pedido-1", products=[999])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(IDEMPOTENCY_KEY_TTL=60)
+    def test_expired_keys_are_processed_again_and_purged(self):
+        self.post("pedido-1")
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(seconds=61))
+
+        self.assertEqual(self.post("pedido-1").status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 2)
+
+        self.post("pedido-2")
+        IdempotencyKey.objects.filter(key="pedido-2").update(created_at=timezone.now() - timedelta(seconds=61))
+        out = StringIO()
+        call_command("purge_idempotency_keys", stdout=out)
+
+        self.assertIn("Deleted 1 expired idempotency keys.", out.getvalue())
+        self.assertEqual(list(IdempotencyKey.objects.values_list("key", flat=True)), ["pedido-1"])
+
+    def test_requests_without_a_key_are_not_stored(self):
+        self.client.post(self.url, {"products_id": [self.product.pk]}, format="json")
+        self.client.post(self.url, {"products_id": [self.product.pk]}, format="json")
+
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
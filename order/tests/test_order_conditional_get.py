@@ -0,0 +1,68 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from order.factories import OrderFactory, UserFactory
+from product.factories import CategoryFactory, ProductFactory
+
+
+class TestOrderConditionalGet(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.category = CategoryFactory()
+        self.product = ProductFactory(price=10, category=[self.category])
+        self.order = OrderFactory(user=self.user, products=[self.product])
+        self.url = reverse("order-list", kwargs={"version": "v1"})
+
+    def assertNotModified(self, etag, url=None):
+        response = self.client.get(url or self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def assertModified(self, etag, url=None):
+        response = self.client.get(url or self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response["ETag"]
+
+    def test_order_history_etag_tracks_nested_changes(self):
+        self.url += "?expand=products.category"
+        etag = self.client.get(self.url)["ETag"]
+        self.assertNotModified(etag)
+
+        self.order.products.add(ProductFactory())
+        etag = self.assertModified(etag)
+
+        self.product.price = 20
+        self.product.save()
+        etag = self.assertModified(etag)
+
+        self.category.title = "Outra"
+        self.category.save()
+        etag = self.assertModified(etag)
+
+        OrderFactory(user=self.user)
+        etag = self.assertModified(etag)
+
+        OrderFactory()
+        self.assertNotModified(etag)
+
+    def test_compact_order_history_ignores_unexpanded_changes(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.category.title = "Outra"
+        self.category.save()
+        self.assertNotModified(etag)
+        ProductFactory(title="Nova")
+        self.assertNotModified(etag)
+
+        self.order.products.add(ProductFactory())
+        self.assertModified(etag)
+
+    def test_etag_is_not_shared_between_users(self):
+        etag = self.client.get(self.url)["ETag"]
+        other = UserFactory()
+        OrderFactory(user=other, products=[self.product])
+        self.client.force_authenticate(user=other)
+
+        self.assertModified(etag)
@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from order.factories import OrderFactory, UserFactory
+from product.factories import CategoryFactory, ProductFactory
+
+
+class TestOrderExport(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("order-export", kwargs={"version": "v1"})
+        category = CategoryFactory()
+        self.products = [ProductFactory(price=10, category=[category]), ProductFactory(price=25)]
+        self.orders = [OrderFactory(user=self.user, products=self.products), OrderFactory(user=self.user)]
+        OrderFactory(products=self.products)
+
+    def test_ndjson_exports_only_own_orders(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="orders.ndjson"')
+
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        listed = self.client.get(reverse("order-list", kwargs={"version": "v1"}), {"page_size": 10}).json()
+        self.assertEqual(rows, listed["results"])
+        self.assertEqual([row["id"] for row in rows], [order.id for order in self.orders])
+
+    def test_csv(self):
+        response = self.client.get(self.url, {"output": "csv"})
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(
+            rows,
+            [
+                ["id", "user", "products", "total"],
+                [str(self.orders[0].id), str(self.user.id), f"{self.products[0].id}|{self.products[1].id}", "35"],
+                [str(self.orders[1].id), str(self.user.id), "", "0"],
+            ],
+        )
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
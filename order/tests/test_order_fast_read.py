@@ -0,0 +1,41 @@
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from order.factories import OrderFactory, UserFactory
+from order.viewsets import OrderViewSet
+from product.factories import CategoryFactory, ProductFactory
+
+
+class TestOrderFastReadEquivalence(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        categories = CategoryFactory.create_batch(3)
+        products = [
+            ProductFactory(price=None),
+            ProductFactory(title="Ação", description=None, category=categories),
+            ProductFactory(price=30, category=categories[:1]),
+        ]
+        self.empty_order = OrderFactory(user=self.user)
+        for index in range(6):
+            OrderFactory(user=self.user, products=products[index % 3 :])
+        OrderFactory(products=products)
+
+    def assertSameResponse(self, url, params=None):
+        with mock.patch.object(OrderViewSet, "fast_read", False):
+            slow = self.client.get(url, params)
+        fast = self.client.get(url, params)
+
+        self.assertEqual(slow.status_code, fast.status_code)
+        self.assertEqual(slow.content, fast.content)
+
+    def test_order_responses_are_byte_identical(self):
+        list_url = reverse("order-list", kwargs={"version": "v1"})
+        detail_url = reverse("order-detail", kwargs={"version": "v1", "pk": self.empty_order.pk})
+        for url, params in [(list_url, None), (list_url, {"page": 2}), (list_url, {"pagination": "cursor"})]:
+            with self.subTest(url=url, params=params):
+                self.assertSameResponse(url, params)
+        self.assertSameResponse(detail_url)
@@ -0,0 +1,21 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from order.factories import OrderFactory, UserFactory
+
+
+class TestOrderKeysetPagination(APITestCase):
+
+    def test_cursor_pagination_lists_only_own_orders_in_id_order(self):
+        user = UserFactory()
+        orders = OrderFactory.create_batch(7, user=user)
+        OrderFactory.create_batch(3)
+        self.client.force_authenticate(user=user)
+        url = reverse("order-list", kwargs={"version": "v2"})
+
+        first = self.client.get(url).json()
+        second = self.client.get(first["next"]).json()
+
+        ids = [order["id"] for order in first["results"] + second["results"]]
+        self.assertEqual(ids, [order.id for order in orders])
+        self.assertIsNone(second["next"])
@@ -0,0 +1,81 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from order.factories import OrderFactory
+from order.models import Order
+from product.factories import ProductFactory
+
+
+@pytest.mark.django_db
+def test_stored_total_follows_products_changes():
+    product1 = ProductFactory(price=10)
+    product2 = ProductFactory(price=20)
+    product3 = ProductFactory(price=None)
+
+    order = OrderFactory(products=[product1, product2, product3])
+    assert order.total == 30
+    assert Order.objects.get(pk=order.pk).total == 30
+
+    order.products.remove(product1)
+    assert order.total == 20
+
+    order.products.clear()
+    assert order.total == 0
+
+
+@pytest.mark.django_db
+def test_stored_total_follows_reverse_products_changes():
+    product = ProductFactory(price=15)
+    order1 = OrderFactory(products=[ProductFactory(price=5)])
+    order2 = OrderFactory()
+
+    product.order_set.add(order1, order2)
+    assert list(Order.objects.order_by("pk").values_list("total", flat=True)) == [20, 15]
+
+    product.order_set.remove(order2)
+    assert Order.objects.get(pk=order2.pk).total == 0
+
+    product.order_set.clear()
+    assert Order.objects.get(pk=order1.pk).total == 5
+
+
+@pytest.mark.django_db
+def test_stored_total_follows_product_price_and_deletion():
+    product1 = ProductFactory(price=10)
+    product2 = ProductFactory(price=20)
+    order = OrderFactory(products=[product1, product2])
+
+    product1.price = 40
+    product1.save()
+    order.refresh_from_db()
+    assert order.total == 60
+
+    product2.delete()
+    order.refresh_from_db()
+    assert order.total == 40
+
+
+@pytest.mark.django_db
+def test_with_total_annotates_sum_of_prices():
+    order = OrderFactory(products=[ProductFactory(price=100), ProductFactory(price=150)])
+    empty_order = OrderFactory()
+
+    totals = dict(Order.objects.with_total().values_list("pk", "products_total"))
+
+    assert totals == {order.pk: 250, empty_order.pk: 0}
+
+
+@pytest.mark.django_db
+def test_recompute_order_totals_command_fixes_drift():
+    order = OrderFactory(products=[ProductFactory(price=100)])
+    Order.objects.filter(pk=order.pk).update(total=1)
+
+    with pytest.raises(CommandError):
+        call_command("recompute_order_totals", "--check")
+
+    call_command("recompute_order_totals", "--batch-size", "1")
+
+    order.refresh_from_db()
+    assert order.total == 100
+    call_command("recompute_order_totals", "--check")
@@ -23,7 +23,7 @@ class TestOrderViewSet(APITestCase):
         self.client.force_authenticate(user=self.user)
         url = reverse("order-list", kwargs={"version": "v1"})
 
-        response = self.client.get(url)
+        response = self.client.get(url, {"expand": "products.category"})
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
@@ -64,6 +64,15 @@ class TestOrderViewSet(APITestCase):
         self.assertEqual(created_order.products.count(), 1)
         self.assertIn(new_product, created_order.products.all())
 
+    def test_out_of_range_product_ids_are_reported_missing(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse("order-list", kwargs={"version": "v1"})
+
+        response = self.client.post(url, data={"products_id": [self.product.id, 99999999999999999999]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["products_id"], ['Invalid pks "99999999999999999999" - objects do not exist.'])
+
     def test_unauthenticated_user_cannot_list_orders(self):
         url = reverse("order-list", kwargs={"version": "v1"})
         response = self.client.get(url)
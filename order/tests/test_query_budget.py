@@ -0,0 +1,54 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from order.factories import OrderFactory, UserFactory
+from product.factories import CategoryFactory, ProductFactory
+
+
+class TestOrderViewSetQueryBudget(APITestCase):
+    # conditional markers + count + orders + product ids
+    LIST_QUERIES = 4
+    # conditional markers + order + product ids
+    DETAIL_QUERIES = 3
+    # products + categories instead of product ids, when both are expanded
+    EXPANDED = {"expand": "products.category"}
+    EXPANDED_QUERIES = 1
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.categories = CategoryFactory.create_batch(3)
+
+    def create_orders(self, orders, basket_size):
+        products = ProductFactory.create_batch(basket_size, category=self.categories)
+        return [OrderFactory(user=self.user, products=products) for _ in range(orders)]
+
+    def test_list_query_count_is_constant(self):
+        for orders, basket_size in [(1, 1), (5, 3), (12, 10)]:
+            with self.subTest(orders=orders, basket_size=basket_size):
+                self.create_orders(orders, basket_size)
+                url = reverse("order-list", kwargs={"version": "v1"})
+
+                with self.assertNumQueries(self.LIST_QUERIES):
+                    response = self.client.get(url)
+                with self.assertNumQueries(self.LIST_QUERIES + self.EXPANDED_QUERIES):
+                    expanded = self.client.get(url, self.EXPANDED)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(expanded.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_query_count_is_constant(self):
+        for basket_size in [1, 10, 50]:
+            with self.subTest(basket_size=basket_size):
+                order = self.create_orders(1, basket_size)[0]
+                url = reverse("order-detail", kwargs={"version": "v1", "pk": order.pk})
+
+                with self.assertNumQueries(self.DETAIL_QUERIES):
+                    response = self.client.get(url)
+                with self.assertNumQueries(self.DETAIL_QUERIES + self.EXPANDED_QUERIES):
+                    expanded = self.client.get(url, self.EXPANDED)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(response.json()["products"]), basket_size)
+                self.assertEqual(len(expanded.json()["products"]), basket_size)
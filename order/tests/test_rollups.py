@@ -0,0 +1,157 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from order.factories import OrderFactory, UserFactory
+from order.models import Order, ProductSales, UserSpend
+from product.factories import ProductFactory
+
+
+def spend(user):
+    return UserSpend.objects.values_list("order_count", "spend").get(pk=user.pk)
+
+
+def units(product):
+    return ProductSales.objects.values_list("units_sold", flat=True).get(pk=product.pk)
+
+
+def assert_in_sync():
+    for rollups in (UserSpend.objects, ProductSales.objects):
+        assert not rollups.drifted().exists()
+        assert not rollups.missing().exists()
+
+
+@pytest.mark.django_db
+def test_rollups_follow_order_changes(django_capture_on_commit_callbacks):
+    user = UserFactory()
+    book, pen = ProductFactory(price=40), ProductFactory(price=5)
+
+    order = OrderFactory(user=user, products=[book, pen])
+    OrderFactory(user=user, products=[book])
+    assert spend(user) == (2, 85)
+    assert (units(book), units(pen)) == (2, 1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        order.products.remove(pen)
+    assert (spend(user), units(pen)) == ((2, 80), 0)
+
+    book.price = 50
+    with django_capture_on_commit_callbacks(execute=True):
+        book.save()
+    assert spend(user) == (2, 100)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        order.products.clear()
+        pen.order_set.add(order)
+    assert (spend(user), units(book), units(pen)) == ((2, 55), 1, 1)
+    assert_in_sync()
+
+
+@pytest.mark.django_db
+def test_rollups_follow_deletes(django_capture_on_commit_callbacks):
+    users = [UserFactory(), UserFactory()]
+    book, pen = ProductFactory(price=40), ProductFactory(price=5)
+    for user in users:
+        OrderFactory(user=user, products=[book, pen])
+        OrderFactory(user=user, products=[book])
+
+    Order.objects.filter(products=pen).delete()
+    assert [spend(user) for user in users] == [(1, 40), (1, 40)]
+    assert (units(book), units(pen)) == (2, 0)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        book.order_set.clear()
+        pen.delete()
+    assert units(book) == 0
+    assert_in_sync()
+
+
+@pytest.mark.django_db
+def test_rollups_follow_mixed_deletes_in_one_transaction(django_capture_on_commit_callbacks):
+    user = UserFactory()
+    book, pen = ProductFactory(price=40), ProductFactory(price=5)
+    OrderFactory(user=user, products=[book, pen])
+    OrderFactory(user=user, products=[pen])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        pen.delete()
+        Order.objects.filter(user=user).delete()
+
+    assert (spend(user), units(book)) == ((0, 0), 0)
+    assert_in_sync()
+
+
+@pytest.mark.django_db
+def test_units_sold_never_go_negative():
+    book = ProductFactory()
+    order = OrderFactory(products=[book])
+    ProductSales.objects.update(units_sold=0)
+
+    order.products.remove(book)
+
+    assert units(book) == 0
+
+
+@pytest.mark.django_db
+def test_rebuild_commands_report_and_fix_drift():
+    user = UserFactory()
+    book = ProductFactory(price=40)
+    OrderFactory(user=user, products=[book])
+    Order.objects.update(total=70)
+    ProductSales.objects.all().delete()
+
+    with pytest.raises(CommandError, match="1 of 1 customers are out of sync and 0 are missing"):
+        call_command("rebuild_user_spend", "--check", stdout=StringIO())
+    with pytest.raises(CommandError, match="0 of 0 products are out of sync and 1 are missing"):
+        call_command("rebuild_product_sales", "--check", stdout=StringIO())
+
+    call_command("rebuild_user_spend", stdout=StringIO())
+    call_command("rebuild_product_sales", stdout=StringIO())
+
+    assert (spend(user), units(book)) == ((1, 70), 1)
+    call_command("rebuild_user_spend", "--check", stdout=StringIO())
+    call_command("rebuild_product_sales", "--check", stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_customers_endpoint_is_for_admins():
+    client = APIClient()
+    customers = [UserFactory() for _ in range(3)]
+    for price, customer in zip((10, 30, 20), customers):
+        OrderFactory(user=customer, products=[ProductFactory(price=price)])
+    url = reverse("user-spend-list", kwargs={"version": "v1"})
+
+    client.force_authenticate(user=customers[0])
+    assert client.get(url).status_code == 403
+
+    client.force_authenticate(user=UserFactory(is_staff=True))
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {"page_size": 2})
+
+    assert [row["spend"] for row in response.json()["results"]] == [30, 20]
+    assert response.json()["results"][0]["username"] == customers[1].username
+    assert len(queries) == 1
+    response = client.get(response.json()["next"])
+    assert [row["user"] for row in response.json()["results"]] == [customers[0].pk]
+
+
+@pytest.mark.django_db
+def test_best_sellers_endpoint():
+    client = APIClient()
+    client.force_authenticate(user=UserFactory())
+    book, pen = ProductFactory(title="Livro"), ProductFactory(title="Caneta")
+    OrderFactory(products=[book, pen])
+    OrderFactory(products=[pen])
+
+    response = client.get(reverse("product-sales-list", kwargs={"version": "v1"}))
+
+    assert response.json()["results"] == [
+        {"product": pen.pk, "title": "Caneta", "units_sold": 2},
+        {"product": book.pk, "title": "Livro", "units_sold": 1},
+    ]
@@ -0,0 +1,63 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from order.models import Order
+from product.models import Category, Product
+
+
+def seed(*args):
+    call_command(
+        "seed", "--categories", "5", "--products", "40", "--users", "6", "--orders", "30", *args, stdout=StringIO()
+    )
+
+
+def snapshot():
+    return (
+        list(Category.objects.order_by("slug").values_list("slug", "title", "active")),
+        list(
+            Product.objects.order_by("sku", "category__slug").values_list(
+                "sku", "title", "price", "active", "category__slug"
+            )
+        ),
+        sorted(
+            (order.user.username, order.total, tuple(sorted(order.products.values_list("sku", flat=True))))
+            for order in Order.objects.select_related("user")
+        ),
+    )
+
+
+@pytest.mark.django_db
+def test_seed_creates_consistent_rows():
+    seed("--batch-size", "7")
+
+    assert Category.objects.count() == 5
+    assert Product.objects.count() == 40
+    assert User.objects.count() == 6
+    assert Order.objects.count() == 30
+    assert all(order.products.exists() for order in Order.objects.all())
+    assert all(user.auth_token for user in User.objects.all())
+    call_command("recompute_order_totals", "--check", stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_seed_is_deterministic():
+    seed("--seed", "7")
+    first = snapshot()
+
+    Order.objects.all().delete()
+    Product.objects.all().delete()
+    Category.objects.all().delete()
+    User.objects.all().delete()
+
+    seed("--seed", "7", "--batch-size", "3")
+    assert snapshot() == first
+
+    with pytest.raises(CommandError):
+        seed("--seed", "7")
+
+    seed("--seed", "8")
+    assert Product.objects.count() == 80
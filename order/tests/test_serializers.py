@@ -20,3 +20,33 @@ def test_order_serializer_calculates_total_correctly():
     assert data["total"] == expected_total
 
     assert len(data["products"]) == 2
+
+
+@pytest.mark.django_db
+def test_order_serializer_resolves_products_in_one_query(django_assert_num_queries):
+    products = ProductFactory.create_batch(20)
+    ids = [product.pk for product in reversed(products)]
+
+    serializer = OrderSerializer(data={"products_id": ids})
+    with django_assert_num_queries(1):
+        assert serializer.is_valid()
+
+    assert [product.pk for product in serializer.validated_data["products"]] == ids
+
+
+@pytest.mark.django_db
+def test_order_serializer_reports_every_missing_product():
+    product = ProductFactory()
+
+    serializer = OrderSerializer(data={"products_id": [product.pk, 998, "999", 998]})
+
+    assert not serializer.is_valid()
+    assert serializer.errors["products_id"] == ['Invalid pks "998", "999" - objects do not exist.']
+
+    serializer = OrderSerializer(data={"products_id": [product.pk, 99999999999999999999]})
+    assert not serializer.is_valid()
+    assert serializer.errors["products_id"] == ['Invalid pks "99999999999999999999" - objects do not exist.']
+
+    serializer = OrderSerializer(data={"products_id": [product.pk, "abc"]})
+    assert not serializer.is_valid()
+    assert serializer.errors["products_id"] == ["Incorrect type. Expected pk value, received str."]
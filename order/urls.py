@@ -1,10 +1,12 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .viewsets import OrderViewSet
+from .viewsets import OrderViewSet, ProductSalesViewSet, UserSpendViewSet
 
 router = DefaultRouter()
 router.register(r"orders", OrderViewSet, basename="order")
+router.register(r"rollups/customers", UserSpendViewSet, basename="user-spend")
+router.register(r"rollups/best-sellers", ProductSalesViewSet, basename="product-sales")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -1 +1,2 @@
 from .order_viewset import OrderViewSet
+from .rollup_viewsets import ProductSalesViewSet, UserSpendViewSet
@@ -1,18 +1,76 @@
-from rest_framework.authentication import TokenAuthentication
+from django.db.models import Prefetch
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 
+from core.authentication import CachedTokenAuthentication
+from core.conditional import ConditionalGetMixin
+from core.db_router import ReplicaReadMixin
+from core.export import StreamingExportMixin
+from core.fastpath import FastReadMixin
+from core.fieldsets import FieldsetMixin
+from order.idempotency import IdempotentCreateMixin
 from order.models import Order
 from order.serializers import OrderSerializer
+from order.serializers.fast_serializers import ORDER_FIELDS, ORDER_SCHEMA, serialize_orders
+from product.models import Category, Product
 
 
-class OrderViewSet(ModelViewSet):
-    authentication_classes = [TokenAuthentication]
+class OrderViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    StreamingExportMixin,
+    IdempotentCreateMixin,
+    FieldsetMixin,
+    FastReadMixin,
+    ModelViewSet,
+):
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = OrderSerializer
+    throttle_scope = "orders"
+    fast_read = True
+    fast_fields = ORDER_FIELDS
+    fast_serializer = staticmethod(serialize_orders)
+    fieldset_schema = ORDER_SCHEMA
+    fieldset_sources = {"products_total": "total"}
+    export_name = "orders"
+    export_csv_fields = ["id", "user", "products", "total"]
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user).order_by("id")
+        # Orders embed their product ids by default; ?expand=products embeds the products.
+        fieldset = self.get_fieldset()
+        queryset = Order.objects.filter(user=self.request.user).order_by("id")
+        if fieldset.includes("total"):
+            queryset = queryset.with_total()
+        if not fieldset.includes("products"):
+            return queryset
+        if not fieldset.expands("products"):
+            return queryset.prefetch_related(Prefetch("products", queryset=Product.objects.order_by("id").only("id")))
+
+        queryset = queryset.prefetch_related(Prefetch("products", queryset=Product.objects.order_by("id")))
+        product_fieldset = fieldset.nested("products")
+        if product_fieldset.includes("category"):
+            categories = Category.objects.order_by("id")
+            if not product_fieldset.expands("category"):
+                categories = categories.only("id")
+            queryset = queryset.prefetch_related(Prefetch("products__category", queryset=categories))
+        return queryset
+
+    def get_conditional_fields(self):
+        # Linking or unlinking products bumps the order itself; their rows only matter when embedded.
+        fieldset = self.get_fieldset()
+        fields = ["updated_at"]
+        if fieldset.expands("products"):
+            fields.append("products__updated_at")
+            if fieldset.nested("products").expands("category"):
+                fields.append("products__category__updated_at")
+        return fields
+
+    def get_conditional_queryset(self):
+        return Order.objects.filter(user=self.request.user)
+
+    def get_export_csv_row(self, item):
+        return [item["id"], item["user"], "|".join(str(product_id) for product_id in item["products"]), item["total"]]
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
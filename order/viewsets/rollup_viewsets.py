@@ -0,0 +1,40 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.viewsets import ReadOnlyModelViewSet
+
+from core.db_router import ReplicaReadMixin
+from order.models import ProductSales, UserSpend
+from order.serializers import ProductSalesSerializer, UserSpendSerializer
+
+
+# Cursors on the indexed rollup columns: each page is an index range scan, with
+# no COUNT(*) over the table.
+class TopSpendPagination(CursorPagination):
+    ordering = ("-spend", "-user")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class TopSalesPagination(TopSpendPagination):
+    ordering = ("-units_sold", "-product")
+
+
+class UserSpendViewSet(ReplicaReadMixin, ReadOnlyModelViewSet):
+    """Customers by lifetime spend, from the rollup the order signals maintain."""
+
+    permission_classes = [IsAdminUser]
+    serializer_class = UserSpendSerializer
+    pagination_class = TopSpendPagination
+    throttle_scope = "orders"
+    queryset = UserSpend.objects.select_related("user").order_by("-spend", "-user")
+
+
+class ProductSalesViewSet(ReplicaReadMixin, ReadOnlyModelViewSet):
+    """Best sellers by units sold, from the rollup the order signals maintain."""
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = ProductSalesSerializer
+    pagination_class = TopSalesPagination
+    throttle_scope = "orders"
+    replica_pin_scope = "catalog"
+    queryset = ProductSales.objects.select_related("product").order_by("-units_sold", "-product")
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ProductConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "product"
+
+    def ready(self):
+        from core.metrics import registry
+        from product import signals, tasks  # noqa: F401
+        from product.cache import collect_metrics
+
+        registry.register_collector(collect_metrics)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import async_views
+
+urlpatterns = [
+    path("products/", async_views.product_list, name="async-product-list"),
+    path("products/<int:pk>/", async_views.product_detail, name="async-product-detail"),
+    path("categories/", async_views.category_list, name="async-category-list"),
+    path("categories/<int:pk>/", async_views.category_detail, name="async-category-detail"),
+]
@@ -0,0 +1,193 @@
+import math
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, Throttled, ValidationError
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from core.fieldsets import parse_fieldset
+from core.renderers import FastJSONRenderer
+from product.cache import HITS_KEY, MISSES_KEY, add_validators, get_cache, get_catalog_state, incr, response_cache_key
+from product.filters import ProductFilterBackend
+from product.models import Category, Product
+from product.serializers.fast_serializers import (
+    CATEGORY_FIELDS,
+    CATEGORY_SCHEMA,
+    PRODUCT_FIELDS,
+    PRODUCT_SCHEMA,
+    aserialize_products,
+)
+
+# Async, read-only counterparts of the product and category list/detail actions. They
+# return the same bodies as the fast read path of the viewsets (always with page number
+# pagination), run on the event loop under ASGI and never hold a worker thread while
+# waiting on the client. Like the viewsets, they authenticate and throttle the client
+# with the same buckets, honour `?fields=` / `?expand=` and answer from the catalog cache.
+PAGE_QUERY_PARAM = "page"
+
+
+def json_response(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type="application/json")
+
+
+def not_found(detail):
+    return json_response({"detail": detail}, status=404)
+
+
+def check_version(version):
+    if version not in settings.REST_FRAMEWORK["ALLOWED_VERSIONS"]:
+        return not_found("Invalid version in URL path.")
+
+
+class ThrottleScope:
+    """Stands in for the viewset the throttles would look at."""
+
+    def __init__(self, throttle_scope):
+        self.throttle_scope = throttle_scope
+
+
+def check_access(request, scope):
+    """Authenticates and throttles the request like a viewset with `throttle_scope = scope`."""
+    authenticators = [authenticator() for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    drf_request = Request(request, authenticators=authenticators)
+    try:
+        drf_request.user  # Runs the authenticators.
+        for throttle in [throttle() for throttle in api_settings.DEFAULT_THROTTLE_CLASSES]:
+            if not throttle.allow_request(drf_request, ThrottleScope(scope)):
+                raise Throttled(throttle.wait())
+    except APIException as error:
+        response = json_response({"detail": error.detail}, status=error.status_code)
+        if isinstance(error, (NotAuthenticated, AuthenticationFailed)):
+            # As in APIView.handle_exception: 401 with a challenge when there is one, 403 otherwise.
+            header = authenticators[0].authenticate_header(drf_request) if authenticators else None
+            if header:
+                response["WWW-Authenticate"] = header
+            else:
+                response.status_code = 403
+        if getattr(error, "wait", None) is not None:
+            response["Retry-After"] = str(math.ceil(error.wait))
+        return response
+    return None
+
+
+async def cached_response(request, handler):
+    """The async counterpart of `CachedResponseMixin.cached_response`, caching the rendered body."""
+    cache = get_cache()
+    version, modified = await sync_to_async(get_catalog_state)()
+    key = response_cache_key(request, version, "application/json")
+
+    content = await cache.aget(key)
+    if content is not None:
+        await sync_to_async(incr)(HITS_KEY)
+        response = HttpResponse(content, content_type="application/json")
+        response["X-Cache"] = "HIT"
+    else:
+        await sync_to_async(incr)(MISSES_KEY)
+        response = await handler()
+        if response.status_code != 200:
+            return response
+        await cache.aset(key, response.content, timeout=settings.CATALOG_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+    return add_validators(request, response, key, modified)
+
+
+def catalog_view(scope):
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, version, **kwargs):
+            if response := check_version(version):
+                return response
+            if response := await sync_to_async(check_access)(request, scope):
+                return response
+            return await cached_response(request, partial(view, request, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+async def paginate(request, queryset, serialize):
+    """Page number pagination with the bodies and links of the sync endpoints."""
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    page = request.GET.get(PAGE_QUERY_PARAM, "1")
+    count = await queryset.acount()
+    last_page = max((count + page_size - 1) // page_size, 1)
+    if page == "last":
+        page = last_page
+    if not (str(page).isascii() and str(page).isdecimal()) or not 1 <= int(page) <= last_page:
+        return not_found("Invalid page.")
+
+    page = int(page)
+    offset = (page - 1) * page_size
+    rows = [row async for row in queryset[offset : offset + page_size].aiterator()]
+
+    url = request.build_absolute_uri()
+    previous = None
+    if page > 1:
+        previous = (
+            remove_query_param(url, PAGE_QUERY_PARAM)
+            if page == 2
+            else replace_query_param(url, PAGE_QUERY_PARAM, page - 1)
+        )
+    return json_response(
+        {
+            "count": count,
+            "next": replace_query_param(url, PAGE_QUERY_PARAM, page + 1) if page < last_page else None,
+            "previous": previous,
+            "results": await serialize(rows),
+        }
+    )
+
+
+async def serialize_categories(rows, fieldset):
+    return fieldset.trim(rows)
+
+
+@catalog_view("products")
+async def product_list(request):
+    try:
+        fieldset = parse_fieldset(request.GET, PRODUCT_SCHEMA, default_expand=["category"])
+        queryset = ProductFilterBackend().filter_queryset(Request(request), Product.objects.all(), view=None)
+    except ValidationError as error:
+        return json_response(error.detail, status=400)
+    return await paginate(request, queryset.values(*PRODUCT_FIELDS), partial(aserialize_products, fieldset=fieldset))
+
+
+@catalog_view("products")
+async def product_detail(request, pk):
+    try:
+        fieldset = parse_fieldset(request.GET, PRODUCT_SCHEMA, default_expand=["category"])
+    except ValidationError as error:
+        return json_response(error.detail, status=400)
+    try:
+        row = await Product.objects.values(*PRODUCT_FIELDS).aget(pk=pk)
+    except Product.DoesNotExist:
+        return not_found("No Product matches the given query.")
+    return json_response((await aserialize_products([row], fieldset))[0])
+
+
+@catalog_view("categories")
+async def category_list(request):
+    try:
+        fieldset = parse_fieldset(request.GET, CATEGORY_SCHEMA)
+    except ValidationError as error:
+        return json_response(error.detail, status=400)
+    queryset = Category.objects.order_by("id").values(*CATEGORY_FIELDS)
+    return await paginate(request, queryset, partial(serialize_categories, fieldset=fieldset))
+
+
+@catalog_view("categories")
+async def category_detail(request, pk):
+    try:
+        fieldset = parse_fieldset(request.GET, CATEGORY_SCHEMA)
+    except ValidationError as error:
+        return json_response(error.detail, status=400)
+    try:
+        row = await Category.objects.values(*CATEGORY_FIELDS).aget(pk=pk)
+    except Category.DoesNotExist:
+        return not_found("No Category matches the given query.")
+    return json_response(fieldset.trim([row])[0])
@@ -0,0 +1,141 @@
+"""
+Latency, throughput, queries and memory of every product and category action.
+
+    pytest product/benchmarks/bench_endpoints.py -s --bench-products=1000,100000,1000000 --bench-json=build/bench.json
+
+See core/benchmark.py for the options and the baseline comparison.
+"""
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from order.factories import UserFactory
+from product.benchmarks.datasets import create_catalog
+from product.models import Category, Product
+
+
+class Catalog:
+    def __init__(self, size, category_ids):
+        self.size = size
+        self.category_ids = category_ids
+        self.product_ids = list(Product.objects.order_by("id").values_list("id", flat=True)[:1000])
+
+
+@pytest.fixture(scope="module")
+def catalog(request, django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        yield Catalog(request.param, create_catalog(request.param))
+        call_command("flush", interactive=False, verbosity=0)
+
+
+@pytest.fixture
+def api_client(db):
+    client = APIClient()
+    client.force_authenticate(user=UserFactory(username="benchmark"))
+    return client
+
+
+def url(name, **kwargs):
+    return reverse(name, kwargs={"version": "v1", **kwargs})
+
+
+def uncached(client, method, path, data=None, **extra):
+    """Sends the request without the catalog response cache, which would otherwise answer every repeat."""
+
+    def send(index):
+        caches["default"].clear()
+        return getattr(client, method)(path, data, **extra)
+
+    return send
+
+
+@pytest.mark.django_db
+def test_product_reads(catalog, api_client, bench):
+    size = catalog.size
+    product_id = catalog.product_ids[len(catalog.product_ids) // 2]
+    list_url = url("product-list")
+
+    bench(f"products.list[{size}]", uncached(api_client, "get", list_url))
+    bench(f"products.list_cached[{size}]", lambda index: api_client.get(list_url))
+    bench(f"products.list_last_page[{size}]", uncached(api_client, "get", list_url, {"page": (size + 4) // 5}))
+    bench(f"products.list_cursor[{size}]", uncached(api_client, "get", list_url, {"pagination": "cursor"}))
+    bench(
+        f"products.list_filtered[{size}]",
+        uncached(api_client, "get", list_url, {"category": "categoria-3", "ordering": "-price", "min_price": 100}),
+    )
+    bench(f"products.retrieve[{size}]", uncached(api_client, "get", url("product-detail", pk=product_id)))
+    bench(f"products.search[{size}]", uncached(api_client, "get", url("product-search"), {"q": "livro 4"}))
+    bench(f"products.export[{size}]", uncached(api_client, "get", url("product-export")), repeat=3)
+
+
+@pytest.mark.django_db
+def test_product_writes(catalog, api_client, bench):
+    size = catalog.size
+    product_ids = catalog.product_ids
+    categories_id = catalog.category_ids[:2]
+
+    def payload(key, price=10):
+        return {"title": f"Novo {key}", "price": price, "sku": f"N-{key}", "categories_id": categories_id}
+
+    bench(f"products.create[{size}]", lambda index: api_client.post(url("product-list"), payload(index), format="json"))
+    bench(
+        f"products.update[{size}]",
+        lambda index: api_client.put(
+            url("product-detail", pk=product_ids[index]), payload(f"editado-{index}"), format="json"
+        ),
+    )
+    bench(
+        f"products.partial_update[{size}]",
+        lambda index: api_client.patch(url("product-detail", pk=product_ids[index]), {"price": index}, format="json"),
+    )
+    bench(
+        f"products.bulk[{size}]",
+        lambda index: api_client.post(
+            url("product-bulk"), [payload(f"{index}-{item}") for item in range(100)], format="json"
+        ),
+        repeat=10,
+    )
+    bench(
+        f"products.destroy[{size}]", lambda index: api_client.delete(url("product-detail", pk=product_ids[-index - 1]))
+    )
+
+
+@pytest.mark.django_db
+def test_category_actions(catalog, api_client, bench):
+    size = catalog.size
+    category_ids = catalog.category_ids
+
+    def payload(key):
+        return {"title": f"Nova {key}", "slug": f"nova-{key}"}
+
+    bench(f"categories.list[{size}]", uncached(api_client, "get", url("category-list")))
+    bench(f"categories.retrieve[{size}]", uncached(api_client, "get", url("category-detail", pk=category_ids[0])))
+    bench(
+        f"categories.create[{size}]", lambda index: api_client.post(url("category-list"), payload(index), format="json")
+    )
+    bench(
+        f"categories.update[{size}]",
+        lambda index: api_client.put(
+            url("category-detail", pk=category_ids[0]), payload(f"editada-{index}"), format="json"
+        ),
+    )
+    bench(
+        f"categories.partial_update[{size}]",
+        lambda index: api_client.patch(url("category-detail", pk=category_ids[0]), {"active": True}, format="json"),
+    )
+
+    # Each deleted category is a fresh one linked to up to 100 products.
+    through = Product.category.through
+    extra = Category.objects.bulk_create(Category(title=f"Extra {index}", slug=f"extra-{index}") for index in range(20))
+    for category in extra:
+        through.objects.bulk_create(
+            through(product_id=product_id, category_id=category.pk) for product_id in catalog.product_ids[::10]
+        )
+    bench(
+        f"categories.destroy[{size}]",
+        lambda index: api_client.delete(url("category-detail", pk=extra[index].pk)),
+        repeat=16,
+    )
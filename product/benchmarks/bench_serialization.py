@@ -0,0 +1,34 @@
+"""
+Serializer vs fast read path for product listings.
+
+    pytest product/benchmarks/bench_serialization.py -s
+"""
+
+import pytest
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from core.benchmark import measure, report
+from core.renderers import FastJSONRenderer
+from product.benchmarks.datasets import create_catalog
+from product.models import Category, Product
+from product.serializers import ProductSerializer
+from product.serializers.fast_serializers import PRODUCT_FIELDS, serialize_products
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", [1_000, 10_000])
+def test_product_list_serialization(size):
+    create_catalog(size)
+    products = Product.objects.order_by("id")
+
+    def serializer_path():
+        queryset = products.prefetch_related(Prefetch("category", queryset=Category.objects.order_by("id")))
+        return JSONRenderer().render(ProductSerializer(queryset, many=True).data)
+
+    def fast_path():
+        return FastJSONRenderer().render(serialize_products(products.values(*PRODUCT_FIELDS)))
+
+    assert serializer_path() == fast_path()
+    speedup = report(f"{size} products", measure(serializer_path), measure(fast_path))
+    assert speedup > 1
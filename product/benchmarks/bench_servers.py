@@ -0,0 +1,187 @@
+"""
+Concurrent throughput of the catalog under three gunicorn setups with the same
+number of worker processes:
+
+- wsgi: gunicorn defaults (sync workers, no preload) serving the DRF viewsets;
+- wsgi-tuned: gunicorn.conf.py (gthread workers, preload and warm-up);
+- asgi: uvicorn workers serving the async views.
+
+The resident memory of each server is reported next to its throughput so the
+budgets can be compared.
+
+    pytest product/benchmarks/bench_servers.py -s --bench-workers=2 --bench-concurrency=64
+        --bench-json=build/servers.json
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from core.benchmark import percentile
+
+pytest.importorskip("uvicorn_worker")
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+# Gunicorn reads ./gunicorn.conf.py unless told otherwise, so the untuned servers get an empty config.
+SERVERS = {
+    "wsgi": (["-c", os.devnull, "-k", "sync", "core.wsgi:application"], "/bookstore/v1/product/products/"),
+    "wsgi-tuned": (["-c", "gunicorn.conf.py"], "/bookstore/v1/product/products/"),
+    "asgi": (
+        ["-c", os.devnull, "-k", "uvicorn_worker.UvicornWorker", "core.asgi:application"],
+        "/bookstore/v1/async/products/",
+    ),
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def tree_rss_kb(pid):
+    """Resident memory of `pid` and its children, read from /proc."""
+    children = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            status = Path(f"/proc/{current}/status").read_text()
+        except OSError:
+            continue
+        total += next((int(line.split()[1]) for line in status.splitlines() if line.startswith("VmRSS:")), 0)
+    return total
+
+
+async def get(reader, writer, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: keep-alive\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    headers = dict(line.lower().split(b":", 1) for line in head.split(b"\r\n")[1:] if b":" in line)
+    await reader.readexactly(int(headers[b"content-length"]))
+    # Sync gunicorn workers close the connection after every response.
+    return status, headers.get(b"connection", b"").strip() != b"close"
+
+
+async def first_response(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        return (await get(reader, writer, path))[0]
+    finally:
+        writer.close()
+
+
+async def load(port, paths, concurrency, duration):
+    timings, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def client(index):
+        nonlocal errors
+        connection = None
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if connection is None:
+                connection = await asyncio.open_connection("127.0.0.1", port)
+            status, keep_alive = await get(*connection, paths[index % len(paths)])
+            timings.append(time.perf_counter() - start)
+            errors += status != 200
+            index += concurrency
+            if not keep_alive:
+                connection[1].close()
+                connection = None
+        if connection is not None:
+            connection[1].close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(concurrency)))
+    return timings, errors, time.perf_counter() - started
+
+
+@pytest.fixture(scope="module")
+def environment(tmp_path_factory):
+    database = tmp_path_factory.mktemp("asgi") / "bench.sqlite3"
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "DEBUG": "0",
+        "SECRET_KEY": "benchmark",
+        "DJANGO_ALLOWED_HOSTS": "127.0.0.1",
+        "SERVER_TIMING": "0",
+    }
+    manage = [sys.executable, str(BASE_DIR / "manage.py")]
+    subprocess.run([*manage, "migrate", "--noinput", "-v", "0"], env=env, check=True, cwd=BASE_DIR)
+    subprocess.run(
+        [*manage, "seed", "--products", "5000", "--users", "10", "--orders", "0"],
+        env=env,
+        check=True,
+        cwd=BASE_DIR,
+        stdout=subprocess.DEVNULL,
+    )
+    return env
+
+
+@pytest.mark.parametrize("server", list(SERVERS))
+def test_concurrent_throughput(server, environment, request):
+    config = request.config
+    workers = config.getoption("bench_workers")
+    concurrency = config.getoption("bench_concurrency")
+    args, path = SERVERS[server]
+    paths = [f"{path}?page={page}" for page in range(1, 51)]
+
+    port = free_port()
+    launched = time.perf_counter()
+    process = subprocess.Popen(
+        ["gunicorn", *args, "-w", str(workers), "-b", f"127.0.0.1:{port}", "--backlog", "2048"],
+        env=environment,
+        cwd=BASE_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        # From launch to the first answered request: boot, app import and whatever the first request loads lazily.
+        assert asyncio.run(first_response(port, paths[0])) == 200
+        startup = time.perf_counter() - launched
+
+        asyncio.run(load(port, paths, min(concurrency, 8), 1))
+        timings, errors, elapsed = asyncio.run(load(port, paths, concurrency, config.getoption("bench_duration")))
+        rss = tree_rss_kb(process.pid)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    assert errors == 0
+    stats = {
+        "requests": len(timings),
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "p99_ms": round(percentile(timings, 99) * 1000, 3),
+        "requests_per_second": round(len(timings) / elapsed, 1),
+        "server_rss_kb": rss,
+        "startup_ms": round(startup * 1000, 3),
+    }
+    config.bench_results[f"catalog.{server}[{workers}w-{concurrency}c]"] = stats
+    print(
+        f"\n{server}: {stats['requests_per_second']} req/s, p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms, "
+        f"{rss // 1024} MB RSS, first response after {stats['startup_ms']} ms"
+    )
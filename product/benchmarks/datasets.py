@@ -0,0 +1,34 @@
+from itertools import islice
+
+from product.models import Category, CategoryStats, Product
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def create_catalog(size, categories=20, batch_size=10_000):
+    """Creates `size` products in two categories each, `batch_size` rows at a time."""
+    category_ids = [
+        category.pk
+        for category in Category.objects.bulk_create(
+            Category(title=f"Categoria {index}", slug=f"categoria-{index}", description="Descrição")
+            for index in range(categories)
+        )
+    ]
+    Category.objects.rebuild_paths()
+    through = Product.category.through
+    for batch in batched(range(size), batch_size):
+        products = Product.objects.bulk_create(
+            Product(title=f"Livro {index}", description="Uma descrição curta.", price=index % 500, sku=f"B-{index}")
+            for index in batch
+        )
+        through.objects.bulk_create(
+            through(product_id=product.pk, category_id=category_ids[(product.pk + offset) % categories])
+            for product in products
+            for offset in range(2)
+        )
+    CategoryStats.objects.rebuild()
+    return category_ids
@@ -0,0 +1,133 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+VERSION_KEY = "catalog:version"
+MODIFIED_KEY = "catalog:modified"
+HITS_KEY = "catalog:hits"
+MISSES_KEY = "catalog:misses"
+
+
+def get_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def incr(key):
+    cache = get_cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key)
+
+
+def get_catalog_version():
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock so a lost version key never reuses the versions of entries still cached.
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_catalog_state():
+    """The catalog version and the time of its last change, in seconds, with one cache round trip."""
+    state = get_cache().get_many([VERSION_KEY, MODIFIED_KEY])
+    version = state.get(VERSION_KEY)
+    if version is None:
+        version = get_catalog_version()
+    modified = state.get(MODIFIED_KEY)
+    if modified is None:
+        get_cache().add(MODIFIED_KEY, int(time.time()), timeout=None)
+        modified = get_cache().get(MODIFIED_KEY)
+    return version, modified
+
+
+def bump_catalog_version():
+    get_catalog_version()
+    version = incr(VERSION_KEY)
+    # Set after the version: a reader in between pairs the new version with the older
+    # time, which only costs its client a full response on the next revalidation.
+    get_cache().set(MODIFIED_KEY, int(time.time()), timeout=None)
+    return version
+
+
+def get_stats():
+    stats = get_cache().get_many([HITS_KEY, MISSES_KEY])
+    return {"hits": stats.get(HITS_KEY, 0), "misses": stats.get(MISSES_KEY, 0)}
+
+
+def collect_metrics():
+    stats = get_stats()
+    return [
+        ("catalog_cache_hits_total", "counter", "Catalog responses served from the cache.", stats["hits"]),
+        (
+            "catalog_cache_misses_total",
+            "counter",
+            "Catalog responses rendered and stored in the cache.",
+            stats["misses"],
+        ),
+    ]
+
+
+def response_cache_key(request, version, media_type):
+    """The cache key of a catalog response: the catalog version, the host, the full path and the media type."""
+    raw = "|".join([request.get_host(), request.get_full_path(), media_type])
+    return f"catalog:response:{version}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def add_validators(request, response, key, modified):
+    """Sets the ETag (the key's digest) and Last-Modified, and answers 304 when the client's copy is current."""
+    etag = f'"{hashlib.sha256(key.encode()).hexdigest()}"'
+    not_modified = get_conditional_response(request, etag=etag, last_modified=modified)
+    if not_modified is not None:
+        response = not_modified
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(modified)
+    return response
+
+
+class CachedResponseMixin:
+    """
+    Caches the serialized data of `list` and `retrieve` under a key made of the
+    catalog version, the host, the full path and the negotiated media type, and
+    answers `If-None-Match` / `If-Modified-Since` from the same state: the ETag
+    is the digest of the key and Last-Modified the time of the last catalog
+    change. A revalidation of a cached response costs no database query.
+    """
+
+    def get_response_cache_key(self, request, version=None):
+        version = get_catalog_version() if version is None else version
+        return response_cache_key(request, version, request.accepted_media_type or "")
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        version, modified = get_catalog_state()
+        key = self.get_response_cache_key(request, version)
+
+        data = cache.get(key)
+        if data is not None:
+            incr(HITS_KEY)
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+        else:
+            incr(MISSES_KEY)
+            response = handler(request, *args, **kwargs)
+            # Only representations that exist get validators, so `If-None-Match: *` can't turn a 404 into a 304.
+            if response.status_code != 200:
+                return response
+            cache.set(key, response.data, timeout=settings.CATALOG_CACHE_TIMEOUT)
+            response["X-Cache"] = "MISS"
+        return add_validators(request, response, key, modified)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,109 @@
+from django.db.models import Subquery
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from product.models import Category, Product
+from product.models.category import subtree_lookups
+
+# Each ordering lists the filters it may be combined with, so that every accepted
+# query is served by one of the indexes declared on Product and its category table.
+ALLOWED_COMBINATIONS = {
+    "id": {"category", "subtree", "active", "min_price", "max_price"},
+    "-id": {"category", "subtree", "active", "min_price", "max_price"},
+    "price": {"category", "subtree", "active", "min_price", "max_price"},
+    "-price": {"category", "subtree", "active", "min_price", "max_price"},
+    "title": {"category", "subtree", "active"},
+    "-title": {"category", "subtree", "active"},
+}
+
+
+def is_decimal(value):
+    """Whether `int(value)` parses it: ASCII digits only, unlike `str.isdigit()`, which also accepts "²"."""
+    return value.isascii() and value.isdecimal()
+
+
+def category_lookup(value):
+    """Lookup for a category given by id or by slug."""
+    return {"pk": int(value)} if is_decimal(value) else {"slug": value}
+
+
+class ProductFilterBackend(BaseFilterBackend):
+    ordering_param = "ordering"
+
+    def parse_filters(self, request):
+        params = request.query_params
+        filters = {}
+        errors = {}
+
+        category = params.get("category")
+        if category:
+            filters["category"] = (
+                {"category__id": int(category)} if is_decimal(category) else {"category__slug": category}
+            )
+
+        subtree = params.get("subtree")
+        if subtree:
+            filters["subtree"] = {"id__in": self.subtree_products(subtree)}
+
+        for param, lookup in [("min_price", "price__gte"), ("max_price", "price__lte")]:
+            value = params.get(param)
+            if value is None:
+                continue
+            if not is_decimal(value):
+                errors[param] = ["A non-negative integer is required."]
+                continue
+            filters[param] = {lookup: int(value)}
+
+        active = params.get("active")
+        if active is not None:
+            if active.lower() not in ("true", "false", "1", "0"):
+                errors["active"] = ["Must be true or false."]
+            else:
+                # `NOT active`, what Django emits for active=False, cannot use an index on SQLite.
+                filters["active"] = {"active": True} if active.lower() in ("true", "1") else {"active__in": [False]}
+
+        if errors:
+            raise ValidationError(errors)
+        return filters
+
+    def subtree_products(self, category):
+        # Products in the category or any of its descendants: a range scan on the path
+        # index, resolved by the database in the same query as the products.
+        root = Category.objects.filter(**category_lookup(category))
+        return Product.category.through.objects.filter(
+            **subtree_lookups(Subquery(root.values("path")), prefix="category__path")
+        ).values("product_id")
+
+    def parse_ordering(self, request, filters, view):
+        ordering = request.query_params.get(self.ordering_param, "id")
+        if ordering not in ALLOWED_COMBINATIONS:
+            raise ValidationError({self.ordering_param: [f"Must be one of: {', '.join(ALLOWED_COMBINATIONS)}."]})
+
+        not_allowed = set(filters) - ALLOWED_COMBINATIONS[ordering]
+        if not_allowed:
+            raise ValidationError(
+                {
+                    self.ordering_param: [
+                        f"Ordering by {ordering} cannot be combined with {', '.join(sorted(not_allowed))}."
+                    ]
+                }
+            )
+
+        use_keyset = getattr(getattr(view, "paginator", None), "use_keyset", None)
+        if ordering != "id" and use_keyset and use_keyset(request):
+            raise ValidationError({self.ordering_param: ["Keyset pagination only supports ordering by id."]})
+        return ordering
+
+    def apply_filters(self, queryset, filters):
+        for lookups in filters.values():
+            queryset = queryset.filter(**lookups)
+        return queryset
+
+    def filter_queryset(self, request, queryset, view):
+        filters = self.parse_filters(request)
+        ordering = self.parse_ordering(request, filters, view)
+
+        queryset = self.apply_filters(queryset, filters)
+        if ordering in ("id", "-id"):
+            return queryset.order_by(ordering)
+        return queryset.order_by(ordering, "-id" if ordering.startswith("-") else "id")
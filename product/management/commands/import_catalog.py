@@ -0,0 +1,105 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from product.models import Category
+from product.serializers import ProductBulkSerializer
+
+FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+NULLABLE_FIELDS = ["description", "price", "sku"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports products from a JSONL or CSV file in fixed-size batches. Both formats match the output of "
+        "products/export/. Categories are given by slug. Each batch is committed on its own, so a failing row "
+        "stops the import after the batches before it were saved."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", dest="file_format", choices=sorted(set(FORMATS.values())))
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--upsert", action="store_true", help="Update products whose sku already exists.")
+
+    def handle(self, *args, path, file_format, batch_size, upsert, **options):
+        path = Path(path)
+        file_format = file_format or FORMATS.get(path.suffix.lower())
+        if file_format is None:
+            raise CommandError("Could not tell the file format from its extension; pass --format.")
+        if not path.is_file():
+            raise CommandError(f"{path} does not exist.")
+
+        started = time.monotonic()
+        rows = created = updated = 0
+        with path.open(encoding="utf-8", newline="") as file:
+            lines = self.read_jsonl(file) if file_format == "jsonl" else self.read_csv(file)
+            while batch := list(islice(lines, batch_size)):
+                batch_created, batch_updated = self.import_batch(batch, upsert)
+                rows += len(batch)
+                created += batch_created
+                updated += batch_updated
+                self.stdout.write(f"Imported {rows} rows ({self.rate(rows, started):.0f} rows/s).")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {rows} rows in {elapsed:.1f}s ({self.rate(rows, started):.0f} rows/s): "
+                f"{created} created, {updated} updated."
+            )
+        )
+
+    def rate(self, rows, started):
+        return rows / max(time.monotonic() - started, 1e-9)
+
+    def read_jsonl(self, file):
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as error:
+                raise CommandError(f"Line {line_number}: invalid JSON ({error}).")
+
+            categories = row.get("category") or []
+            slugs = [category["slug"] if isinstance(category, dict) else category for category in categories]
+            yield line_number, row, slugs
+
+    def read_csv(self, file):
+        reader = csv.DictReader(file)
+        for row in reader:
+            for field in NULLABLE_FIELDS:
+                if row.get(field) == "":
+                    row[field] = None
+            if row.get("active") == "":
+                del row["active"]
+
+            slugs = [slug for slug in (row.pop("category", None) or "").split("|") if slug]
+            yield reader.line_num, row, slugs
+
+    def import_batch(self, batch, upsert):
+        categories = Category.objects.in_bulk({slug for _, _, slugs in batch for slug in slugs}, field_name="slug")
+
+        data = []
+        for line_number, row, slugs in batch:
+            missing = [slug for slug in slugs if slug not in categories]
+            if missing:
+                raise CommandError(f"Line {line_number}: unknown categories {', '.join(missing)}.")
+            item = {field: value for field, value in row.items() if field not in ("id", "category")}
+            item.setdefault("categories_id", [categories[slug].pk for slug in slugs])
+            data.append(item)
+
+        serializer = ProductBulkSerializer(data=data, many=True, context={"upsert": upsert})
+        if not serializer.is_valid():
+            errors = serializer.errors
+            if isinstance(errors, dict):
+                raise CommandError(f"Invalid batch: {errors}")
+            line_number, error = next((line[0], error) for line, error in zip(batch, errors) if error)
+            raise CommandError(f"Line {line_number}: {error}")
+
+        serializer.save()
+        return len(serializer.created), len(serializer.updated)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from product.models import CategoryStats
+
+
+class Command(BaseCommand):
+    help = "Recomputes the catalog statistics of every category from its products."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuilt = CategoryStats.objects.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the statistics of {rebuilt} categories."))
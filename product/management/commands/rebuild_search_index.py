@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from product.search import install_search_index, uninstall_search_index
+
+
+class Command(BaseCommand):
+    help = "Drops and recreates the product full-text search index and its triggers."
+
+    def handle(self, *args, **options):
+        with connection.schema_editor() as schema_editor:
+            uninstall_search_index(schema_editor)
+            install_search_index(schema_editor)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the product search index on {connection.vendor}."))
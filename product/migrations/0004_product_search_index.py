@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:40
+
+from django.db import migrations
+
+from product.search import install_search_index, uninstall_search_index
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0003_category_updated_at_product_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0004_product_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["price", "id"], name="product_price_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["active", "price", "id"], name="product_active_price_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["active", "title", "id"], name="product_active_title_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("active", True)), fields=["price", "id"], name="product_price_active_only_idx"
+            ),
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX product_category_cat_prod_idx ON product_product_category (category_id, product_id)",
+            "DROP INDEX product_category_cat_prod_idx",
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from product.models.category import path_segment_sql
+
+
+def fill_paths(apps, schema_editor):
+    # Every existing category becomes a root.
+    Category = apps.get_model("product", "Category")
+    Category.objects.using(schema_editor.connection.alias).update(path=path_segment_sql(), depth=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0005_product_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="depth",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="children",
+                to="product.category",
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="path",
+            field=models.TextField(db_index=True, default="", editable=False),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+    ]
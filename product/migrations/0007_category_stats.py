@@ -0,0 +1,62 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def fill_stats(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Category = apps.get_model("product", "Category")
+    CategoryStats = apps.get_model("product", "CategoryStats")
+    through = apps.get_model("product", "Product").category.through
+
+    stats = {pk: CategoryStats(category_id=pk) for pk in Category.objects.using(alias).values_list("pk", flat=True)}
+    rows = (
+        through.objects.using(alias)
+        .filter(product__active=True)
+        .values("category_id")
+        .annotate(
+            product_count=Count("product"),
+            price_count=Count("product__price"),
+            price_sum=Sum("product__price"),
+            price_min=Min("product__price"),
+            price_max=Max("product__price"),
+        )
+    )
+    for row in rows:
+        category_id = row.pop("category_id")
+        stats[category_id] = CategoryStats(category_id=category_id, **{**row, "price_sum": row["price_sum"] or 0})
+    CategoryStats.objects.using(alias).bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0006_category_tree"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryStats",
+            fields=[
+                (
+                    "category",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="product.category",
+                    ),
+                ),
+                ("product_count", models.PositiveIntegerField(default=0)),
+                ("price_count", models.PositiveIntegerField(default=0)),
+                ("price_sum", models.PositiveBigIntegerField(default=0)),
+                ("price_min", models.PositiveIntegerField(null=True)),
+                ("price_max", models.PositiveIntegerField(null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
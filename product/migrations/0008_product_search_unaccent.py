@@ -0,0 +1,21 @@
+from django.db import migrations
+
+from product.search import install_search_index, uninstall_search_index
+
+
+def reinstall(apps, schema_editor):
+    # Rebuilds the Postgres index over the unaccenting configuration; SQLite already strips accents.
+    if schema_editor.connection.vendor == "postgresql":
+        uninstall_search_index(schema_editor)
+        install_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0007_category_stats"),
+    ]
+
+    operations = [
+        migrations.RunPython(reinstall, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from .category import Category
+from .category_stats import CategoryStats
 from .product import Product
 
-__all__ = ["Product", "Category"]
+__all__ = ["Product", "Category", "CategoryStats"]
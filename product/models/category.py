@@ -1,4 +1,62 @@
-from django.db import models
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Cast, Concat, Length, Substr
+
+# The tree is stored as a materialized path: the path of the parent followed by one
+# segment per category, the number of digits of its id and then the id ("15" for 5,
+# "3123" for 123; ids stay below 10^9). Segments are prefix-free, so a category's
+# subtree is every path starting with its own, and ordering by path lists the tree
+# depth first with siblings by id. Paths only hold digits, which every collation
+# sorts before letters, so the subtree is the range [path, path + "a") and
+# is served by the index on `path`.
+PATH_END = "a"
+
+
+def path_segment(pk):
+    digits = str(pk)
+    return f"{len(digits)}{digits}"
+
+
+def path_segment_sql(field="pk"):
+    digits = Cast(field, CharField())
+    return Concat(Cast(Length(digits), CharField()), digits)
+
+
+def subtree_lookups(path, prefix="path"):
+    """Lookups for the categories under `path`, itself included. `path` may be a string or an expression."""
+    end = path + PATH_END if isinstance(path, str) else Concat(path, Value(PATH_END))
+    return {f"{prefix}__gte": path, f"{prefix}__lt": end}
+
+
+class CategoryQuerySet(models.QuerySet):
+    def subtree(self, path):
+        return self.filter(**subtree_lookups(path))
+
+    def rebuild_paths(self, batch_size=1000):
+        """
+        Recomputes every path and depth from the parents. Needed after
+        `bulk_create` and `bulk_update`, which bypass `save()`.
+        """
+        with transaction.atomic(using=self.db):
+            categories = {
+                pk: Category(pk=pk, parent_id=parent_id) for pk, parent_id in self.values_list("pk", "parent_id")
+            }
+            children = defaultdict(list)
+            for category in categories.values():
+                children[category.parent_id].append(category)
+
+            # Walks the tree from the roots without recursion, so depth isn't bounded by the stack.
+            pending = list(children[None])
+            for category in pending:
+                category.path, category.depth = path_segment(category.pk), 0
+            while pending:
+                category = pending.pop()
+                for child in children[category.pk]:
+                    child.path, child.depth = category.path + path_segment(child.pk), category.depth + 1
+                    pending.append(child)
+            self.bulk_update(categories.values(), ["path", "depth"], batch_size=batch_size)
 
 
 class Category(models.Model):
@@ -6,6 +64,44 @@ class Category(models.Model):
     slug = models.SlugField(unique=True)
     description = models.TextField(max_length=500, blank=True, null=True)
     active = models.BooleanField(default=True)
+    parent = models.ForeignKey("self", null=True, blank=True, on_delete=models.PROTECT, related_name="children")
+    path = models.TextField(editable=False, db_index=True, default="")
+    depth = models.PositiveIntegerField(editable=False, default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = CategoryQuerySet.as_manager()
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        # Paths are read from the database, since this instance or its parent may
+        # have been loaded before an ancestor moved.
+        with transaction.atomic(using=kwargs.get("using")):
+            categories = Category.objects.using(kwargs.get("using"))
+            parent_path, parent_depth = ("", -1)
+            if self.parent_id is not None:
+                parent_path, parent_depth = categories.values_list("path", "depth").get(pk=self.parent_id)
+
+            if self._state.adding:
+                super().save(*args, **kwargs)
+                self.path = parent_path + path_segment(self.pk)
+                self.depth = parent_depth + 1
+                categories.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+                return
+
+            old_path, old_depth = categories.values_list("path", "depth").get(pk=self.pk)
+            if old_path and parent_path.startswith(old_path):
+                raise ValueError("A category cannot be moved under itself or one of its descendants.")
+            self.path = parent_path + path_segment(self.pk)
+            self.depth = parent_depth + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "path", "depth"}
+            super().save(*args, **kwargs)
+
+            if old_path and self.path != old_path:
+                # Moves the whole subtree in one statement.
+                categories.filter(path__gt=old_path, path__lt=old_path + PATH_END).update(
+                    path=Concat(Value(self.path), Substr("path", len(old_path) + 1)),
+                    depth=F("depth") + (self.depth - old_depth),
+                )
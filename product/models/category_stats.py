@@ -0,0 +1,100 @@
+from django.db import models
+from django.db.models import Count, F, Max, Min, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from .category import Category
+
+EMPTY_SUMMARY = {"product_count": 0, "price_count": 0, "price_sum": 0, "price_min": None, "price_max": None}
+FIELDS = list(EMPTY_SUMMARY)
+
+
+def summarize(products):
+    """The figures CategoryStats keeps for `products`, counting only the active ones."""
+    return products.filter(active=True).aggregate(
+        product_count=Count("pk"),
+        price_count=Count("price"),
+        price_sum=Coalesce(Sum("price"), Value(0)),
+        price_min=Min("price"),
+        price_max=Max("price"),
+    )
+
+
+def summarize_product(product):
+    if not product.active:
+        return EMPTY_SUMMARY
+    return {
+        "product_count": 1,
+        "price_count": int(product.price is not None),
+        "price_sum": product.price or 0,
+        "price_min": product.price,
+        "price_max": product.price,
+    }
+
+
+class CategoryStatsQuerySet(models.QuerySet):
+    def apply(self, added=EMPTY_SUMMARY, removed=EMPTY_SUMMARY):
+        """
+        Adds the summary of the products that entered these categories and
+        subtracts the one of those that left. Bounds can't be subtracted, so the
+        categories whose minimum or maximum may have left get their bounds
+        refreshed. Only the bounds: counters refreshed halfway through a bulk
+        delete would have the remaining deltas subtracted a second time.
+        """
+        changes = {
+            field: F(field) + added[field] - removed[field]
+            for field in ("product_count", "price_count", "price_sum")
+            if added[field] != removed[field]
+        }
+        if added["price_min"] is not None:
+            changes["price_min"] = Least(Coalesce("price_min", Value(added["price_min"])), Value(added["price_min"]))
+            changes["price_max"] = Greatest(Coalesce("price_max", Value(added["price_max"])), Value(added["price_max"]))
+        if changes:
+            self.update(**changes, updated_at=timezone.now())
+        if removed["price_min"] is not None:
+            self.filter(Q(price_min__gte=removed["price_min"]) | Q(price_max__lte=removed["price_max"])).refresh(
+                fields=["price_min", "price_max"]
+            )
+
+    def refresh(self, fields=FIELDS):
+        """Recomputes `fields` from the products of each category."""
+        through = Category.product_set.through
+        products = (
+            through.objects.filter(category=OuterRef("pk"), product__active=True)
+            .values("category")
+            .annotate(
+                product_count=Count("product"),
+                price_count=Count("product__price"),
+                price_sum=Sum("product__price"),
+                price_min=Min("product__price"),
+                price_max=Max("product__price"),
+            )
+        )
+        changes = {}
+        for field in fields:
+            value = Subquery(products.values(field))
+            changes[field] = value if field in ("price_min", "price_max") else Coalesce(value, Value(0))
+        return self.update(**changes, updated_at=timezone.now())
+
+    def rebuild(self):
+        """Creates the missing rows and recomputes every one of them."""
+        missing = Category.objects.filter(stats__isnull=True).values_list("pk", flat=True)
+        self.bulk_create([CategoryStats(category_id=pk) for pk in missing], ignore_conflicts=True)
+        return self.all().refresh()
+
+
+class CategoryStats(models.Model):
+    """Catalog figures per category, kept up to date by the product signals."""
+
+    category = models.OneToOneField(Category, primary_key=True, on_delete=models.CASCADE, related_name="stats")
+    product_count = models.PositiveIntegerField(default=0)
+    price_count = models.PositiveIntegerField(default=0)
+    price_sum = models.PositiveBigIntegerField(default=0)
+    price_min = models.PositiveIntegerField(null=True)
+    price_max = models.PositiveIntegerField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CategoryStatsQuerySet.as_manager()
+
+    def __str__(self):
+        return f"Stats of {self.category_id}"
@@ -9,6 +9,22 @@ class Product(models.Model):
     price = models.PositiveIntegerField(null=True)
     active = models.BooleanField(default=True)
     category = models.ManyToManyField(Category, blank=True)
+    sku = models.CharField(max_length=64, unique=True, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["price", "id"], name="product_price_idx"),
+            models.Index(fields=["active", "price", "id"], name="product_active_price_idx"),
+            models.Index(fields=["active", "title", "id"], name="product_active_title_idx"),
+            models.Index(fields=["price", "id"], condition=models.Q(active=True), name="product_price_active_only_idx"),
+        ]
 
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
@@ -0,0 +1,121 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+MAX_TERMS = 10
+
+SQLITE_INDEX = "product_product_fts"
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_INDEX} USING fts5(
+        title, description, content='product_product', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_INDEX}_insert AFTER INSERT ON product_product BEGIN
+        INSERT INTO {SQLITE_INDEX}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_INDEX}_delete AFTER DELETE ON product_product BEGIN
+        INSERT INTO {SQLITE_INDEX}({SQLITE_INDEX}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_INDEX}_update AFTER UPDATE OF title, description ON product_product BEGIN
+        INSERT INTO {SQLITE_INDEX}({SQLITE_INDEX}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SQLITE_INDEX}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"INSERT INTO {SQLITE_INDEX}({SQLITE_INDEX}) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {SQLITE_INDEX}_insert",
+    f"DROP TRIGGER IF EXISTS {SQLITE_INDEX}_delete",
+    f"DROP TRIGGER IF EXISTS {SQLITE_INDEX}_update",
+    f"DROP TABLE IF EXISTS {SQLITE_INDEX}",
+]
+
+# The `simple` configuration with the `unaccent` dictionary in front, so "acao" finds
+# "Ação" as on SQLite. unaccent() itself isn't immutable and can't be indexed; a text
+# search configuration named as a constant can.
+POSTGRES_CONFIG = "simple_unaccent"
+# The query must use the exact expression of the index for Postgres to pick the GIN index.
+POSTGRES_VECTOR = (
+    f"(setweight(to_tsvector('{POSTGRES_CONFIG}', coalesce(product_product.title, '')), 'A') || "
+    f"setweight(to_tsvector('{POSTGRES_CONFIG}', coalesce(product_product.description, '')), 'B'))"
+)
+POSTGRES_INSTALL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    f"""
+    DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{POSTGRES_CONFIG}') THEN
+            CREATE TEXT SEARCH CONFIGURATION {POSTGRES_CONFIG} (COPY = simple);
+            ALTER TEXT SEARCH CONFIGURATION {POSTGRES_CONFIG}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+        END IF;
+    END $$
+    """,
+    f"CREATE INDEX IF NOT EXISTS product_product_search_idx ON product_product USING GIN ({POSTGRES_VECTOR})",
+]
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS product_product_search_idx",
+    f"DROP TEXT SEARCH CONFIGURATION IF EXISTS {POSTGRES_CONFIG}",
+]
+
+
+def get_terms(query):
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def install_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {"sqlite": SQLITE_INSTALL, "postgresql": POSTGRES_INSTALL}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+def uninstall_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {"sqlite": SQLITE_UNINSTALL, "postgresql": POSTGRES_UNINSTALL}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+def search_products(queryset, query):
+    """
+    Filters `queryset` to the products matching every term of `query` (each one
+    as a prefix) and orders them by relevance, title matches first.
+    """
+    terms = get_terms(query)
+    if not terms:
+        return queryset.none()
+
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        # The full-text query runs once for the ids; the rank of each match is then a rowid seek.
+        matching = RawSQL(f"SELECT rowid FROM {SQLITE_INDEX} WHERE {SQLITE_INDEX} MATCH %s", (match,))
+        rank = RawSQL(
+            f"SELECT bm25({SQLITE_INDEX}, 10.0, 1.0) FROM {SQLITE_INDEX} "
+            f"WHERE {SQLITE_INDEX} MATCH %s AND {SQLITE_INDEX}.rowid = product_product.id",
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(id__in=matching).annotate(rank=rank).order_by("rank", "id")
+
+    if vendor == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        query = f"to_tsquery('{POSTGRES_CONFIG}', %s)"
+        return (
+            queryset.filter(RawSQL(f"{POSTGRES_VECTOR} @@ {query}", (tsquery,), output_field=BooleanField()))
+            .annotate(rank=RawSQL(f"ts_rank({POSTGRES_VECTOR}, {query})", (tsquery,), FloatField()))
+            .order_by("-rank", "id")
+        )
+
+    matches = Q()
+    for term in terms:
+        matches &= Q(title__icontains=term) | Q(description__icontains=term)
+    return queryset.filter(matches).annotate(rank=Value(0.0)).order_by("id")
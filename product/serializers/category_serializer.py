@@ -1,10 +1,19 @@
 from rest_framework import serializers
 
+from core.fieldsets import FieldsetSerializerMixin
+from core.timing import TimedSerializerMixin
 from product.models.category import Category
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, FieldsetSerializerMixin, serializers.ModelSerializer):
+    parent = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), required=False, allow_null=True)
+
     class Meta:
         model = Category
-        fields = ["title", "slug", "description", "active"]
+        fields = ["title", "slug", "description", "active", "parent", "depth"]
         extra_kwargs = {"slug": {"required": False}}
+
+    def validate_parent(self, value):
+        if value is not None and self.instance is not None and value.path.startswith(self.instance.path):
+            raise serializers.ValidationError("A category cannot be moved under itself or one of its descendants.")
+        return value
@@ -0,0 +1,99 @@
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+
+from core.fieldsets import parse_fieldset
+from product.models import Product
+
+# Read-only counterparts of CategorySerializer and ProductSerializer that build the
+# same representation straight from `values()` rows. Keep the field lists in sync.
+CATEGORY_FIELDS = ["title", "slug", "description", "active", "parent", "depth"]
+PRODUCT_FIELDS = ["id", "title", "description", "price", "active", "sku"]
+CATEGORY_STATS_FIELDS = ["product_count", "price_count", "price_sum", "price_min", "price_max"]
+
+CATEGORY_SCHEMA = dict.fromkeys(CATEGORY_FIELDS)
+PRODUCT_SCHEMA = {**dict.fromkeys(PRODUCT_FIELDS), "category": CATEGORY_SCHEMA}
+PRODUCT_FIELDSET = parse_fieldset({}, PRODUCT_SCHEMA, default_expand=["category"])
+
+
+def serialize_categories(rows, fieldset=None):
+    rows = list(rows)
+    return rows if fieldset is None else fieldset.trim(rows)
+
+
+def category_stats_query(queryset):
+    return queryset.values("id", "slug", *[f"stats__{field}" for field in CATEGORY_STATS_FIELDS])
+
+
+def serialize_category_stats(rows):
+    stats = []
+    for row in rows:
+        count, price_count, price_sum, price_min, price_max = (
+            row[f"stats__{field}"] for field in CATEGORY_STATS_FIELDS
+        )
+        stats.append(
+            {
+                "id": row["id"],
+                "slug": row["slug"],
+                "product_count": count or 0,
+                "price_min": price_min,
+                "price_max": price_max,
+                "price_avg": round(price_sum / price_count, 2) if price_count else None,
+            }
+        )
+    return stats
+
+
+def categories_query(product_ids, fields=CATEGORY_FIELDS):
+    return (
+        Product.category.through.objects.filter(product_id__in=product_ids)
+        .order_by("product_id", "category_id")
+        .values_list("product_id", *[f"category__{field}" for field in fields])
+    )
+
+
+def group_categories(rows, fields=CATEGORY_FIELDS):
+    categories = defaultdict(list)
+    for product_id, *values in rows:
+        categories[product_id].append(dict(zip(fields, values)))
+    return categories
+
+
+def get_categories_by_product(product_ids, fields=CATEGORY_FIELDS):
+    return group_categories(categories_query(product_ids, fields), fields)
+
+
+def get_category_ids_by_product(product_ids):
+    category_ids = defaultdict(list)
+    links = (
+        Product.category.through.objects.filter(product_id__in=product_ids)
+        .order_by("product_id", "category_id")
+        .values_list("product_id", "category_id")
+    )
+    for product_id, category_id in links:
+        category_ids[product_id].append(category_id)
+    return category_ids
+
+
+def attach_categories(rows, categories):
+    for row in rows:
+        row["category"] = categories.get(row["id"], [])
+    return rows
+
+
+def serialize_products(rows, fieldset=PRODUCT_FIELDSET):
+    rows = list(rows)
+    if fieldset.includes("category"):
+        product_ids = [row["id"] for row in rows]
+        if fieldset.expands("category"):
+            categories = get_categories_by_product(product_ids, fieldset.nested("category").select(CATEGORY_FIELDS))
+        else:
+            categories = get_category_ids_by_product(product_ids)
+        attach_categories(rows, categories)
+    return fieldset.trim(rows)
+
+
+async def aserialize_products(rows, fieldset=PRODUCT_FIELDSET):
+    # aiterator() runs values_list() querysets synchronously on Django 5.2, so the
+    # categories of the page are fetched in a single call on the ORM thread instead.
+    return await sync_to_async(serialize_products)(rows, fieldset)
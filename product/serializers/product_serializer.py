@@ -1,13 +1,20 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
+from core.fields import BatchedPrimaryKeyRelatedField
+from core.fieldsets import FieldsetSerializerMixin, primary_keys
+from core.timing import TimedSerializerMixin
 from product.models.category import Category
 from product.models.product import Product
 from product.serializers.category_serializer import CategorySerializer
+from product.signals import products_bulk_saved
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(TimedSerializerMixin, FieldsetSerializerMixin, serializers.ModelSerializer):
     category = CategorySerializer(many=True, read_only=True)
-    categories_id = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), write_only=True, many=True)
+    categories_id = BatchedPrimaryKeyRelatedField(queryset=Category.objects.all(), write_only=True, many=True)
+    compact_fields = {"category": primary_keys}
 
     class Meta:
         model = Product
@@ -17,15 +24,103 @@ class ProductSerializer(serializers.ModelSerializer):
             "description",
             "price",
             "active",
+            "sku",
             "category",
             "categories_id",
         ]
 
+    def validate_sku(self, value):
+        return value or None
+
     def create(self, validated_data):
         categories_data = validated_data.pop("categories_id")
 
         product = Product.objects.create(**validated_data)
-        for category in categories_data:
-            product.category.add(category)
+        product.category.add(*categories_data)
 
         return product
+
+
+class ProductBulkListSerializer(serializers.ListSerializer):
+    batch_size = 1000
+
+    def to_internal_value(self, data):
+        validated_data = super().to_internal_value(data)
+
+        skus = [item.get("sku") for item in validated_data]
+        existing = set()
+        if not self.context.get("upsert"):
+            existing = set(Product.objects.filter(sku__in=[sku for sku in skus if sku]).values_list("sku", flat=True))
+
+        seen = set()
+        errors = []
+        for sku in skus:
+            if sku in existing:
+                errors.append({"sku": ["product with this sku already exists."]})
+            elif sku and sku in seen:
+                errors.append({"sku": ["Duplicated sku in this request."]})
+            else:
+                errors.append({})
+            seen.add(sku)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return validated_data
+
+    def create(self, validated_data):
+        categories_data = [item.pop("categories_id") for item in validated_data]
+
+        existing = {}
+        now = timezone.now()
+        if self.context.get("upsert"):
+            skus = [item["sku"] for item in validated_data if item.get("sku")]
+            existing = Product.objects.in_bulk(skus, field_name="sku")
+
+        products, created, updated = [], [], []
+        for item in validated_data:
+            product = existing.get(item.get("sku"))
+            if product is None:
+                product = Product(**item)
+                created.append(product)
+            else:
+                for attr, value in item.items():
+                    setattr(product, attr, value)
+                product.updated_at = now
+                updated.append(product)
+            products.append(product)
+
+        through = Product.category.through
+        category_ids = {category.pk for categories in categories_data for category in categories}
+        with transaction.atomic():
+            Product.objects.bulk_create(created, batch_size=self.batch_size)
+            if updated:
+                Product.objects.bulk_update(
+                    updated,
+                    ["title", "description", "price", "active", "sku", "updated_at"],
+                    batch_size=self.batch_size,
+                )
+                previous = through.objects.filter(product__in=updated)
+                category_ids.update(previous.values_list("category_id", flat=True))
+                previous.delete()
+            through.objects.bulk_create(
+                [
+                    through(product_id=product.pk, category_id=category.pk)
+                    for product, categories in zip(products, categories_data)
+                    for category in categories
+                ],
+                batch_size=self.batch_size,
+                ignore_conflicts=True,
+            )
+            products_bulk_saved.send(sender=Product, created=created, updated=updated, category_ids=category_ids)
+
+        self.created, self.updated = created, updated
+        return products
+
+
+class ProductBulkSerializer(ProductSerializer):
+    # Uniqueness is checked for the whole batch at once by the list serializer.
+    sku = serializers.CharField(max_length=64, required=False, allow_null=True, allow_blank=True)
+
+    class Meta(ProductSerializer.Meta):
+        list_serializer_class = ProductBulkListSerializer
@@ -0,0 +1,122 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from product.cache import bump_catalog_version
+from product.models import Category, CategoryStats, Product
+from product.models.category_stats import EMPTY_SUMMARY, summarize, summarize_product
+
+# Sent after products are written in bulk, bypassing the per-instance model signals.
+# Receivers get `created` and `updated` lists of Product instances and the
+# `category_ids` that gained or lost products.
+products_bulk_saved = Signal()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(m2m_changed, sender=Product.category.through)
+@receiver(products_bulk_saved, sender=Product)
+def invalidate_catalog_cache(sender, action="post_save", **kwargs):
+    if action.startswith("pre_"):
+        return
+    bump_catalog_version()
+    # Bump again once the transaction commits, so responses cached from a read
+    # that ran before the commit are not served afterwards.
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(m2m_changed, sender=Product.category.through)
+def touch_products_on_categories_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            instance.updated_at = timezone.now()
+            Product.objects.filter(pk=instance.pk).update(updated_at=instance.updated_at)
+    elif action == "pre_clear":
+        instance._cleared_product_ids = list(instance.product_set.values_list("pk", flat=True))
+    elif action in ("post_add", "post_remove"):
+        Product.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
+    elif action == "post_clear":
+        product_ids = instance.__dict__.pop("_cleared_product_ids", [])
+        Product.objects.filter(pk__in=product_ids).update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Category)
+def touch_products_on_category_deleted(sender, instance, **kwargs):
+    instance.product_set.update(updated_at=timezone.now())
+
+
+def saved_summary(product):
+    # The stats summary of the product as it is in the database.
+    if "_stats_summary" in product.__dict__:
+        return product._stats_summary
+    loaded_values = getattr(product, "_loaded_values", {})
+    if "price" in loaded_values and "active" in loaded_values:
+        return summarize_product(Product(price=loaded_values["price"], active=loaded_values["active"]))
+    if product._state.adding:
+        return EMPTY_SUMMARY
+    return summarize(Product.objects.filter(pk=product.pk))
+
+
+@receiver(post_save, sender=Category)
+def create_category_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        CategoryStats.objects.create(category=instance)
+
+
+@receiver(pre_save, sender=Product)
+def remember_stats_before_product_saved(sender, instance, **kwargs):
+    instance._stats_summary = saved_summary(instance)
+
+
+@receiver(post_save, sender=Product)
+def sync_stats_on_product_saved(sender, instance, created, **kwargs):
+    summary = summarize_product(instance)
+    previous, instance._stats_summary = instance._stats_summary, summary
+    if created:
+        return
+
+    if previous != summary:
+        CategoryStats.objects.filter(category__product=instance).apply(added=summary, removed=previous)
+
+
+@receiver(pre_delete, sender=Product)
+def remember_stats_before_product_deleted(sender, instance, **kwargs):
+    instance._stats_category_ids = list(instance.category.values_list("pk", flat=True))
+    instance._stats_summary = saved_summary(instance)
+
+
+@receiver(post_delete, sender=Product)
+def sync_stats_on_product_deleted(sender, instance, **kwargs):
+    category_ids = instance.__dict__.pop("_stats_category_ids", [])
+    CategoryStats.objects.filter(pk__in=category_ids).apply(removed=instance.__dict__.pop("_stats_summary"))
+
+
+@receiver(m2m_changed, sender=Product.category.through)
+def sync_stats_on_categories_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        stats = CategoryStats.objects.filter(pk=instance.pk)
+        if action == "post_add":
+            stats.apply(added=summarize(Product.objects.filter(pk__in=pk_set)))
+        elif action == "post_remove":
+            stats.apply(removed=summarize(Product.objects.filter(pk__in=pk_set)))
+        elif action == "post_clear":
+            stats.refresh()
+        return
+
+    if action == "pre_clear":
+        instance._stats_cleared_ids = list(instance.category.values_list("pk", flat=True))
+    elif action == "post_add":
+        CategoryStats.objects.filter(pk__in=pk_set).apply(added=summarize_product(instance))
+    elif action == "post_remove":
+        CategoryStats.objects.filter(pk__in=pk_set).apply(removed=summarize_product(instance))
+    elif action == "post_clear":
+        category_ids = instance.__dict__.pop("_stats_cleared_ids", [])
+        CategoryStats.objects.filter(pk__in=category_ids).apply(removed=summarize_product(instance))
+
+
+@receiver(products_bulk_saved, sender=Product)
+def sync_stats_on_products_bulk_saved(sender, category_ids=(), **kwargs):
+    CategoryStats.objects.filter(pk__in=category_ids).refresh()
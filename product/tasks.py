@@ -0,0 +1,25 @@
+from jobs.tasks import command_task, task
+from product.cache import bump_catalog_version
+from product.serializers import ProductBulkSerializer
+
+command_task("product.import_catalog", "import_catalog")
+command_task("product.rebuild_category_stats", "rebuild_category_stats")
+command_task("product.rebuild_search_index", "rebuild_search_index")
+
+
+@task("product.bulk_upsert", priority=10)
+def bulk_upsert(products, upsert=False):
+    """The work of `POST products/bulk/?background=1`; invalid rows are reported in the result, not retried."""
+    serializer = ProductBulkSerializer(data=products, many=True, context={"upsert": upsert})
+    if not serializer.is_valid():
+        return {"errors": serializer.errors}
+    serializer.save()
+    return {
+        "created": [product.pk for product in serializer.created],
+        "updated": [product.pk for product in serializer.updated],
+    }
+
+
+@task("product.clear_catalog_cache", priority=20)
+def clear_catalog_cache():
+    return {"version": bump_catalog_version()}
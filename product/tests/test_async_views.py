@@ -0,0 +1,122 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from product.factories import CategoryFactory, ProductFactory
+
+
+class TestAsyncCatalog(TestCase):
+
+    def setUp(self):
+        self.books = CategoryFactory(title="Livros", slug="livros", description=None)
+        self.comics = CategoryFactory(title="Quadrinhos", slug="quadrinhos", active=False)
+        ProductFactory(title="Sem categoria", description=None, price=None)
+        self.product = ProductFactory(title="Ação", price=7, category=[self.books, self.comics], sku="SKU-1")
+        for index in range(6):
+            ProductFactory(title=f"Livro {index}", price=index * 10, category=[self.books])
+
+    def sync_get(self, name, params=None, **kwargs):
+        return self.client.get(reverse(name, kwargs={"version": "v1", **kwargs}), params)
+
+    async def async_get(self, name, params=None, **kwargs):
+        return await self.async_client.get(reverse(f"async-{name}", kwargs={"version": "v1", **kwargs}), params)
+
+    async def test_lists_match_the_sync_endpoints(self):
+        for name, params in [
+            ("product-list", None),
+            ("product-list", {"page": 2}),
+            ("product-list", {"category": "livros", "ordering": "-price", "min_price": 10}),
+            ("category-list", None),
+            ("product-list", {"fields": "title,category.slug"}),
+            ("product-list", {"expand": ""}),
+            ("category-list", {"fields": "slug"}),
+        ]:
+            with self.subTest(name=name, params=params):
+                sync_body = json.loads((await self.run_sync(self.sync_get, name, params)).content)
+                response = await self.async_get(name, params)
+                body = json.loads(response.content)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(body["count"], sync_body["count"])
+                self.assertEqual(body["results"], sync_body["results"])
+                for link in ("next", "previous"):
+                    self.assertEqual(bool(body[link]), bool(sync_body[link]))
+
+    async def test_details_match_the_sync_endpoints(self):
+        for name, pk in [("product-detail", self.product.pk), ("category-detail", self.books.pk)]:
+            with self.subTest(name=name):
+                sync_response = await self.run_sync(self.sync_get, name, pk=pk)
+                response = await self.async_get(name, pk=pk)
+                self.assertEqual(response.content, sync_response.content)
+
+    async def test_errors(self):
+        response = await self.async_get("product-detail", pk=999999)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.content), {"detail": "No Product matches the given query."})
+
+        for page in [99, "²"]:
+            response = await self.async_get("product-list", {"page": page})
+            self.assertEqual(response.status_code, 404)
+
+        response = await self.async_get("product-list", {"ordering": "description"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ordering", json.loads(response.content))
+
+        response = await self.async_client.get(reverse("async-product-list", kwargs={"version": "v9"}))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_responses_come_from_the_catalog_cache(self):
+        first = await self.async_get("product-list")
+        self.assertEqual(first["X-Cache"], "MISS")
+
+        second = await self.async_get("product-list")
+        self.assertEqual((second["X-Cache"], second.content), ("HIT", first.content))
+
+        url = reverse("async-product-list", kwargs={"version": "v1"})
+        response = await self.async_client.get(url, headers={"If-None-Match": first["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_clients_are_authenticated_and_throttled_like_the_viewsets(self):
+        url = reverse("async-category-list", kwargs={"version": "v1"})
+        response = await self.async_client.get(url, headers={"Authorization": "Token wrong"})
+        self.assertEqual(response.status_code, 401)
+
+        rates = {"categories.read": "2/min"}
+        with self.settings(
+            THROTTLE_ENABLED=True, REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+        ):
+            await sync_to_async(caches["default"].clear)()
+            # The sync and async endpoints share one bucket.
+            self.assertEqual((await self.run_sync(self.sync_get, "category-list")).status_code, 200)
+            self.assertEqual((await self.async_client.get(url)).status_code, 200)
+            response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    async def test_pagination_links(self):
+        body = json.loads((await self.async_get("product-list")).content)
+        self.assertEqual(body["next"], "http://testserver/bookstore/v1/async/products/?page=2")
+        self.assertIsNone(body["previous"])
+
+        body = json.loads((await self.async_get("product-list", {"page": 2})).content)
+        self.assertIsNone(body["next"])
+        self.assertEqual(body["previous"], "http://testserver/bookstore/v1/async/products/")
+
+    async def test_server_timing_counts_async_queries(self):
+        response = await self.async_get("product-list")
+        self.assertIn('desc="3 queries"', response["Server-Timing"])
+
+    async def run_sync(self, func, *args, **kwargs):
+        return await sync_to_async(func)(*args, **kwargs)
+
+
+@override_settings(DEBUG=True)
+def test_middleware_chain_stays_async():
+    # Django logs every sync/async adaptation of the middleware chain when DEBUG is on.
+    with TestCase().assertNoLogs("django.request", level="DEBUG"):
+        ASGIHandler()
@@ -0,0 +1,82 @@
+import tempfile
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from order.factories import UserFactory
+from product.cache import get_stats
+from product.factories import CategoryFactory, ProductFactory
+
+
+class TestCatalogResponseCache(APITestCase):
+
+    def setUp(self):
+        caches["default"].clear()
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.category = CategoryFactory(title="Livros")
+        self.product = ProductFactory(title="Duna", category=[self.category])
+        self.url = reverse("product-list", kwargs={"version": "v1"})
+
+    def test_second_read_is_served_from_cache(self):
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(get_stats(), {"hits": 1, "misses": 1})
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get(self.url)
+
+        response = self.client.get(self.url, {"page": 1})
+
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_product_changes_invalidate_cache(self):
+        self.client.get(self.url)
+
+        self.product.title = "Duna Messias"
+        self.product.save()
+        response = self.client.get(self.url)
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["results"][0]["title"], "Duna Messias")
+
+    def test_category_changes_invalidate_nested_product_data(self):
+        detail_url = reverse("product-detail", kwargs={"version": "v1", "pk": self.product.pk})
+        self.client.get(detail_url)
+
+        self.category.title = "Ficção"
+        self.category.save()
+        response = self.client.get(detail_url)
+
+        self.assertEqual(response.json()["category"][0]["title"], "Ficção")
+
+    def test_m2m_changes_invalidate_cache(self):
+        self.client.get(self.url)
+
+        self.product.category.clear()
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.json()["results"][0]["category"], [])
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            backend = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location}
+            with override_settings(CACHES={"default": backend}):
+                self.client.get(self.url)
+                response = self.client.get(self.url)
+
+                self.assertEqual(response["X-Cache"], "HIT")
+
+                self.product.delete()
+                response = self.client.get(self.url)
+
+                self.assertEqual(response["X-Cache"], "MISS")
+                self.assertEqual(response.json()["results"], [])
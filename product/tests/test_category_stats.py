@@ -0,0 +1,147 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from order.factories import UserFactory
+from product.factories import CategoryFactory, ProductFactory
+from product.models import CategoryStats, Product
+
+FIELDS = ["product_count", "price_count", "price_sum", "price_min", "price_max"]
+
+
+def stats(category):
+    return dict(zip(FIELDS, CategoryStats.objects.values_list(*FIELDS).get(pk=category.pk)))
+
+
+def assert_in_sync():
+    """The incrementally maintained rows match a rebuild from scratch."""
+    maintained = list(CategoryStats.objects.order_by("pk").values("pk", *FIELDS))
+    CategoryStats.objects.rebuild()
+    assert maintained == list(CategoryStats.objects.order_by("pk").values("pk", *FIELDS))
+
+
+@pytest.fixture
+def books():
+    return CategoryFactory(slug="livros")
+
+
+@pytest.fixture
+def games():
+    return CategoryFactory(slug="jogos")
+
+
+@pytest.mark.django_db
+def test_stats_follow_products_added_to_categories(books, games):
+    ProductFactory(price=10, category=[books])
+    ProductFactory(price=30, category=[books, games])
+    ProductFactory(price=50, active=False, category=[books])
+
+    assert stats(books) == {"product_count": 2, "price_count": 2, "price_sum": 40, "price_min": 10, "price_max": 30}
+    assert stats(games) == {"product_count": 1, "price_count": 1, "price_sum": 30, "price_min": 30, "price_max": 30}
+    assert_in_sync()
+
+
+@pytest.mark.django_db
+def test_stats_follow_price_and_active_changes(books):
+    cheap = ProductFactory(price=10, category=[books])
+    ProductFactory(price=30, category=[books])
+
+    cheap.price = 20
+    cheap.save()
+    assert stats(books)["price_min"] == 20
+
+    cheap.price = 40
+    cheap.save()
+    assert (stats(books)["price_min"], stats(books)["price_max"], stats(books)["price_sum"]) == (30, 40, 70)
+
+    cheap.active = False
+    cheap.save()
+    assert (stats(books)["product_count"], stats(books)["price_max"]) == (1, 30)
+
+    reloaded = Product.objects.get(pk=cheap.pk)
+    reloaded.active = True
+    reloaded.save()
+    assert stats(books)["product_count"] == 2
+    assert_in_sync()
+
+
+@pytest.mark.django_db
+def test_stats_follow_deletes_and_recategorization(books, games):
+    cheap = ProductFactory(price=10, category=[books])
+    expensive = ProductFactory(price=90, category=[books])
+    ProductFactory(price=None, category=[books])
+
+    expensive.delete()
+    assert stats(books) == {"product_count": 2, "price_count": 1, "price_sum": 10, "price_min": 10, "price_max": 10}
+
+    cheap.category.set([games])
+    assert (stats(books)["product_count"], stats(books)["price_min"]) == (1, None)
+    assert stats(games)["product_count"] == 1
+
+    cheap.category.clear()
+    games.product_set.add(ProductFactory(price=5))
+    assert stats(games)["price_min"] == 5
+    books.product_set.clear()
+    assert stats(books)["product_count"] == 0
+    assert_in_sync()
+
+
+@pytest.mark.django_db
+def test_bulk_upsert_refreshes_old_and_new_categories(books, games):
+    client = APIClient()
+    client.force_authenticate(user=UserFactory())
+    url = reverse("product-bulk", kwargs={"version": "v1"})
+    client.post(url, [{"title": "A", "price": 10, "sku": "A", "categories_id": [books.pk]}], format="json")
+    assert stats(books)["product_count"] == 1
+
+    client.post(
+        url + "?upsert=1", [{"title": "A", "price": 15, "sku": "A", "categories_id": [games.pk]}], format="json"
+    )
+
+    assert stats(books)["product_count"] == 0
+    assert stats(games)["price_max"] == 15
+    assert_in_sync()
+
+
+@pytest.mark.django_db
+def test_stats_endpoint_does_not_read_products(books, games):
+    for price in (10, 20, 60):
+        ProductFactory(price=price, category=[books])
+    client = APIClient()
+    client.force_authenticate(user=UserFactory())
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("category-stats", kwargs={"version": "v1"}))
+
+    assert response.json()["results"] == [
+        {"id": books.pk, "slug": "livros", "product_count": 3, "price_min": 10, "price_max": 60, "price_avg": 30.0},
+        {"id": games.pk, "slug": "jogos", "product_count": 0, "price_min": None, "price_max": None, "price_avg": None},
+    ]
+    assert not any("product_product" in query["sql"] for query in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_rebuild_command_creates_missing_rows(books, capsys):
+    ProductFactory(price=10, category=[books])
+    CategoryStats.objects.all().delete()
+
+    call_command("rebuild_category_stats")
+
+    assert stats(books)["product_count"] == 1
+    assert "Rebuilt the statistics of 1 categories." in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+def test_stats_follow_queryset_deletes(books, games):
+    for price in (10, 20, 30, 40):
+        ProductFactory(price=price, category=[books, games])
+    ProductFactory(price=25, category=[games])
+
+    Product.objects.filter(price__in=[10, 20, 40]).delete()
+
+    assert stats(books) == {"product_count": 1, "price_count": 1, "price_sum": 30, "price_min": 30, "price_max": 30}
+    assert (stats(games)["product_count"], stats(games)["price_min"]) == (2, 25)
+    assert_in_sync()
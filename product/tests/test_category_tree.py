@@ -0,0 +1,142 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from order.factories import UserFactory
+from product.factories import CategoryFactory, ProductFactory
+from product.models import Category
+from product.models.category import path_segment
+
+
+@pytest.fixture
+def api_client():
+    client = APIClient()
+    client.force_authenticate(user=UserFactory())
+    return client
+
+
+@pytest.fixture
+def tree():
+    # livros > ficcao > fantasia, livros > tecnicos, and revistas on its own.
+    livros = CategoryFactory(slug="livros")
+    ficcao = CategoryFactory(slug="ficcao", parent=livros)
+    fantasia = CategoryFactory(slug="fantasia", parent=ficcao)
+    tecnicos = CategoryFactory(slug="tecnicos", parent=livros)
+    revistas = CategoryFactory(slug="revistas")
+    return {category.slug: category for category in (livros, ficcao, fantasia, tecnicos, revistas)}
+
+
+def url(name, **kwargs):
+    return reverse(name, kwargs={"version": "v1", **kwargs})
+
+
+def slugs(queryset):
+    return sorted(queryset.values_list("slug", flat=True))
+
+
+@pytest.mark.django_db
+def test_paths_follow_the_parents(tree):
+    livros, fantasia = tree["livros"], tree["fantasia"]
+
+    assert livros.path == path_segment(livros.pk)
+    assert fantasia.path == tree["ficcao"].path + path_segment(fantasia.pk)
+    assert (livros.depth, fantasia.depth) == (0, 2)
+    assert slugs(Category.objects.subtree(livros.path)) == ["fantasia", "ficcao", "livros", "tecnicos"]
+
+
+@pytest.mark.django_db
+def test_moving_a_category_moves_its_subtree(tree):
+    ficcao = tree["ficcao"]
+    ficcao.parent = tree["revistas"]
+    ficcao.save()
+
+    fantasia = Category.objects.get(slug="fantasia")
+    assert fantasia.path.startswith(tree["revistas"].path)
+    assert fantasia.depth == 2
+    assert slugs(Category.objects.subtree(tree["livros"].path)) == ["livros", "tecnicos"]
+
+    ficcao.parent = None
+    ficcao.save(update_fields=["parent"])
+    assert Category.objects.get(slug="fantasia").depth == 1
+
+
+@pytest.mark.django_db
+def test_cycles_are_rejected(tree, api_client):
+    livros = tree["livros"]
+    livros.parent = tree["fantasia"]
+    with pytest.raises(ValueError):
+        livros.save()
+
+    response = api_client.patch(url("category-detail", pk=tree["ficcao"].pk), {"parent": tree["fantasia"].pk})
+    assert response.status_code == 400
+    assert "parent" in response.json()
+
+
+@pytest.mark.django_db
+def test_rebuild_paths_handles_deep_trees():
+    categories = Category.objects.bulk_create(
+        Category(title=f"Nível {index}", slug=f"nivel-{index}") for index in range(2000)
+    )
+    for parent, child in zip(categories, categories[1:]):
+        child.parent = parent
+    Category.objects.bulk_update(categories[1:], ["parent"])
+
+    Category.objects.rebuild_paths()
+
+    deepest = Category.objects.get(slug="nivel-1999")
+    assert deepest.depth == 1999
+    assert Category.objects.subtree(Category.objects.get(slug="nivel-1000").path).count() == 1000
+
+
+@pytest.mark.django_db
+def test_filter_products_by_subtree(tree, api_client):
+    ProductFactory(title="Hobbit", category=[tree["fantasia"]])
+    ProductFactory(title="Django", category=[tree["tecnicos"], tree["livros"]])
+    ProductFactory(title="Quatro Rodas", category=[tree["revistas"]])
+
+    def titles(**params):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url("product-list"), params)
+        return [product["title"] for product in response.json()["results"]], len(queries)
+
+    _, unfiltered_queries = titles()
+    assert titles(subtree="livros") == (["Hobbit", "Django"], unfiltered_queries)
+    assert titles(subtree=str(tree["ficcao"].pk))[0] == ["Hobbit"]
+    assert titles(subtree="desconhecida")[0] == []
+    assert titles(subtree="livros", ordering="-price", active="true")[0] == ["Django", "Hobbit"]
+
+
+@pytest.mark.django_db
+def test_tree_endpoint_lists_the_tree_depth_first(tree, api_client):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(url("category-tree"))
+
+    assert [category["slug"] for category in response.json()] == [
+        "livros",
+        "ficcao",
+        "fantasia",
+        "tecnicos",
+        "revistas",
+    ]
+    assert len(queries) == 1
+    response = api_client.get(url("category-tree"), {"root": "ficcao"})
+    assert [(category["slug"], category["depth"]) for category in response.json()] == [("ficcao", 1), ("fantasia", 2)]
+    assert response.json()[1]["parent"] == tree["ficcao"].pk
+
+
+@pytest.mark.django_db
+def test_non_ascii_digits_are_looked_up_as_slugs(tree, api_client):
+    response = api_client.get(url("product-list"), {"subtree": "²"})
+    assert (response.status_code, response.json()["results"]) == (200, [])
+
+    response = api_client.get(url("category-tree"), {"root": "²"})
+    assert (response.status_code, response.json()) == (200, [])
+
+
+@pytest.mark.django_db
+def test_categories_with_children_cannot_be_deleted(tree, api_client):
+    assert api_client.delete(url("category-detail", pk=tree["ficcao"].pk)).status_code == 400
+    assert api_client.delete(url("category-detail", pk=tree["fantasia"].pk)).status_code == 204
+    assert api_client.delete(url("category-detail", pk=tree["ficcao"].pk)).status_code == 204
@@ -0,0 +1,96 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from order.factories import UserFactory
+from product.factories import CategoryFactory, ProductFactory
+
+
+class TestCatalogConditionalGet(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.category = CategoryFactory(title="Livros")
+        self.product = ProductFactory(title="Duna", category=[self.category])
+        self.list_url = reverse("product-list", kwargs={"version": "v1"})
+        self.detail_url = reverse("product-detail", kwargs={"version": "v1", "pk": self.product.pk})
+
+    def test_list_emits_validators(self):
+        response = self.client.get(self.list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+    def test_matching_etag_returns_304_without_queries(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self.client.get(self.list_url)["Last-Modified"]
+
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_changes_with_product_category_and_membership_changes(self):
+        etags = [self.client.get(self.list_url)["ETag"]]
+
+        self.product.price = 10
+        self.product.save()
+        etags.append(self.client.get(self.list_url)["ETag"])
+
+        self.category.title = "Ficção"
+        self.category.save()
+        etags.append(self.client.get(self.list_url)["ETag"])
+
+        self.product.category.add(CategoryFactory())
+        etags.append(self.client.get(self.list_url)["ETag"])
+
+        ProductFactory().delete()
+        self.category.delete()
+        etags.append(self.client.get(self.list_url)["ETag"])
+
+        self.assertEqual(len(set(etags)), len(etags))
+
+    def test_etag_depends_on_query_string(self):
+        first = self.client.get(self.list_url)["ETag"]
+        second = self.client.get(self.list_url, {"page": 1})["ETag"]
+
+        self.assertNotEqual(first, second)
+
+    def test_missing_product_is_not_answered_with_304(self):
+        url = reverse("product-detail", kwargs={"version": "v1", "pk": 999999})
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_category_list_conditional_get(self):
+        url = reverse("category-list", kwargs={"version": "v1"})
+        etag = self.client.get(url)["ETag"]
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        CategoryFactory()
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_cursor_pages_are_validated_without_aggregates(self):
+        params = {"pagination": "cursor"}
+        with CaptureQueriesContext(connection) as queries:
+            etag = self.client.get(self.list_url, params)["ETag"]
+        self.assertFalse(any("COUNT(" in query["sql"] or "MAX(" in query["sql"] for query in queries.captured_queries))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,163 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import OperationalError, connections
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import db_router
+from order.factories import UserFactory
+from order.models import Order
+from product.factories import ProductFactory
+from product.models import Product
+
+User = get_user_model()
+
+# A second SQLite file stands in for the replica. Nothing replicates into it, so each
+# test can tell from the data which database answered.
+REPLICA = "replica_test"
+
+
+@pytest.fixture(scope="module")
+def replica_alias(tmp_path_factory, django_db_setup, django_db_blocker):
+    connections.settings[REPLICA] = {
+        **connections.settings["default"],
+        "NAME": str(tmp_path_factory.mktemp("replica") / "replica.sqlite3"),
+    }
+    with django_db_blocker.unblock():
+        call_command("migrate", database=REPLICA, verbosity=0)
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+@pytest.fixture
+def replica(replica_alias, settings):
+    settings.DATABASE_REPLICAS = [replica_alias]
+    db_router.health_checks.clear()
+    caches["default"].clear()
+    yield replica_alias
+    db_router.health_checks.clear()
+
+
+@pytest.fixture
+def user():
+    user = UserFactory()
+    User.objects.using(REPLICA).create(pk=user.pk, username=user.username)
+    return user
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def titles(response):
+    return [product["title"] for product in response.json()["results"]]
+
+
+def products_url():
+    return reverse("product-list", kwargs={"version": "v1"})
+
+
+@pytest.mark.django_db(databases=["default", REPLICA])
+def test_reads_go_to_the_replica(replica, api_client):
+    ProductFactory(title="Primário")
+    Product.objects.using(replica).create(title="Réplica", price=10)
+
+    response = api_client.get(products_url())
+
+    assert titles(response) == ["Réplica"]
+    assert api_client.get(reverse("category-list", kwargs={"version": "v1"})).json()["count"] == 0
+
+
+@pytest.mark.django_db(databases=["default", REPLICA])
+def test_writes_go_to_the_primary_and_pin_reads(replica, api_client, user):
+    Product.objects.using(replica).create(title="Réplica", price=10)
+
+    response = api_client.post(products_url(), {"title": "Novo", "price": 20, "categories_id": []}, format="json")
+
+    assert response.status_code == 201
+    assert response.cookies[db_router.PIN_COOKIE]["max-age"] == 10
+    assert Product.objects.using("default").filter(title="Novo").exists()
+    assert not Product.objects.using(replica).filter(title="Novo").exists()
+    # The writer reads its own write...
+    assert titles(api_client.get(products_url())) == ["Novo"]
+    # ...and so does everybody else, since the catalog is shared.
+    other = APIClient()
+    other.force_authenticate(user=user)
+    assert titles(other.get(products_url())) == ["Novo"]
+
+
+@pytest.mark.django_db(databases=["default", REPLICA])
+def test_order_writes_pin_only_their_user(replica, user):
+    other_user = UserFactory()
+    User.objects.using(replica).create(pk=other_user.pk, username=other_user.username)
+    for owner in (user, user, other_user):
+        Order.objects.using(replica).create(user_id=owner.pk)
+    url = reverse("order-list", kwargs={"version": "v1"})
+    token = Token.objects.create(user=user)
+    other_token = Token.objects.create(user=other_user)
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    assert client.get(url).json()["count"] == 2
+    assert client.post(url, {"products_id": []}, format="json").status_code == 201
+
+    # A token client that drops cookies is still pinned through its user.
+    client.cookies.clear()
+    assert client.get(url).json()["count"] == 1
+
+    other = APIClient()
+    other.credentials(HTTP_AUTHORIZATION=f"Token {other_token.key}")
+    assert other.get(url).json()["count"] == 1
+
+
+@pytest.mark.django_db(databases=["default", REPLICA])
+def test_lagging_replica_falls_back_to_primary(replica, api_client, monkeypatch):
+    ProductFactory(title="Primário")
+    Product.objects.using(replica).create(title="Réplica", price=10)
+    monkeypatch.setattr(db_router, "replica_lag", lambda alias: 60)
+
+    assert titles(api_client.get(products_url())) == ["Primário"]
+
+
+@pytest.mark.django_db(databases=["default", REPLICA])
+def test_unreachable_replica_falls_back_to_primary(replica, api_client, monkeypatch):
+    ProductFactory(title="Primário")
+
+    def unreachable(alias):
+        raise OperationalError("connection refused")
+
+    monkeypatch.setattr(db_router, "replica_lag", unreachable)
+
+    assert titles(api_client.get(products_url())) == ["Primário"]
+
+
+@pytest.mark.django_db(databases=["default", REPLICA])
+def test_export_streams_from_the_replica(replica, api_client):
+    ProductFactory(title="Primário")
+    Product.objects.using(replica).create(title="Réplica", price=10)
+
+    response = api_client.get(reverse("product-export", kwargs={"version": "v1"}))
+
+    assert b"".join(response.streaming_content).count(b'"title":"R\xc3\xa9plica"') == 1
+
+
+@pytest.mark.django_db
+def test_without_replicas_everything_uses_the_primary():
+    ProductFactory(title="Primário")
+    client = APIClient()
+    client.force_authenticate(user=UserFactory())
+
+    response = client.get(products_url())
+
+    assert titles(response) == ["Primário"]
+    response = client.post(products_url(), {"title": "Novo", "price": 1, "categories_id": []}, format="json")
+    assert response.status_code == 201
+    assert db_router.PIN_COOKIE not in response.cookies
@@ -0,0 +1,103 @@
+import csv
+import gzip
+import io
+import json
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from order.factories import UserFactory
+from product.factories import CategoryFactory, ProductFactory
+from product.viewsets import ProductViewSet
+
+
+class TestProductExport(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("product-export", kwargs={"version": "v1"})
+        self.books = CategoryFactory(title="Livros", slug="livros")
+        self.comics = CategoryFactory(title="Quadrinhos", slug="quadrinhos")
+        self.products = [
+            ProductFactory(title="Ação", price=10, category=[self.books, self.comics], sku="SKU-1"),
+            ProductFactory(title='Com "aspas", vírgula', description="Linha\nquebrada", price=None),
+            ProductFactory(title="Inativo", price=30, active=False, category=[self.comics]),
+        ]
+
+    def read(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content)
+        if response.get("Content-Encoding") == "gzip":
+            content = gzip.decompress(content)
+        return content.decode()
+
+    def test_ndjson_matches_list_representation(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="products.ndjson"')
+
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        listed = self.client.get(reverse("product-list", kwargs={"version": "v1"}), {"page_size": 10}).json()
+        self.assertEqual(rows, listed["results"])
+
+    def test_csv_flattens_categories(self):
+        response = self.client.get(self.url, {"output": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+
+        rows = list(csv.reader(io.StringIO(self.read(response))))
+        self.assertEqual(rows[0], ["id", "title", "description", "price", "active", "sku", "category"])
+        self.assertEqual(rows[1], [str(self.products[0].id), "Ação", "", "10", "True", "SKU-1", "livros|quadrinhos"])
+        self.assertEqual(rows[2][1:4], ['Com "aspas", vírgula', "Linha\nquebrada", ""])
+        self.assertEqual(len(rows), 4)
+
+    def test_export_applies_list_filters(self):
+        response = self.client.get(self.url, {"category": "quadrinhos", "ordering": "-price"})
+        ids = [json.loads(line)["id"] for line in self.read(response).splitlines()]
+        self.assertEqual(ids, [self.products[2].id, self.products[0].id])
+
+        response = self.client.get(self.url, {"ordering": "description"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_gzip_when_accepted(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(len(self.read(response).splitlines()), 3)
+
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_gzip_follows_the_q_values(self):
+        for accept_encoding, compressed in [
+            ("gzip;q=0", False),
+            ("gzip; q=0.0, deflate", False),
+            ("gzip;q=0.5", True),
+            ("*", True),
+            ("gzip;q=0, *", False),
+            ("identity, *;q=0", False),
+            ("gzipped", False),
+        ]:
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.client.get(self.url, HTTP_ACCEPT_ENCODING=accept_encoding)
+                self.assertEqual(response.get("Content-Encoding") == "gzip", compressed)
+
+    def test_unknown_output_is_rejected(self):
+        response = self.client.get(self.url, {"output": "xml"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("output", response.json())
+
+    def test_rows_are_read_in_chunks(self):
+        ProductFactory.create_batch(4, category=[self.books])
+        with mock.patch.object(ProductViewSet, "export_chunk_size", 2):
+            response = self.client.get(self.url)
+            with CaptureQueriesContext(connection) as queries:
+                lines = self.read(response).splitlines()
+
+        self.assertEqual(len(lines), 7)
+        # One query for the product rows and one category query per chunk of two products.
+        self.assertEqual(len(queries), 1 + 4)
@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework.permissions import BasePermission
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from core.fieldsets import Fieldset
+from core.renderers import FastJSONRenderer
+from order.factories import UserFactory
+from product.factories import CategoryFactory, ProductFactory
+from product.models import Category, Product
+from product.serializers import ProductSerializer
+from product.serializers.fast_serializers import (
+    CATEGORY_FIELDS,
+    PRODUCT_FIELDS,
+    serialize_categories,
+    serialize_products,
+)
+from product.viewsets import CategoryViewSet, ProductViewSet
+
+
+class TestFastReadEquivalence(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        categories = [
+            CategoryFactory(title="Ficção", slug="ficcao", description=None),
+            CategoryFactory(title='Aspas "duplas"', slug="aspas", description="Linha\nquebrada ", active=False),
+            CategoryFactory(title="😀", slug="emoji", description=""),
+        ]
+        ProductFactory(title="Sem categoria", description=None, price=None)
+        ProductFactory(title="Três", description="Ção\t</script>", price=0, category=categories, sku="SKU-1")
+        ProductFactory(title="Inativo", price=2**31 - 1, active=False, category=categories[2:])
+        for index in range(7):
+            ProductFactory(title=f"Livro {index}", price=index, category=categories[index % 3 :: 2])
+
+    def fetch(self, viewset, url, params=None):
+        caches["default"].clear()
+        with mock.patch.object(viewset, "fast_read", False):
+            slow = self.client.get(url, params)
+        caches["default"].clear()
+        fast = self.client.get(url, params)
+        self.assertEqual(slow.status_code, fast.status_code)
+        return slow.content, fast.content
+
+    def test_product_responses_are_byte_identical(self):
+        list_url = reverse("product-list", kwargs={"version": "v1"})
+        product = Product.objects.get(sku="SKU-1")
+        for url, params in [
+            (list_url, None),
+            (list_url, {"page": 2}),
+            (list_url, {"pagination": "cursor", "page_size": 3}),
+            (list_url, {"category": "emoji", "ordering": "-price"}),
+            (reverse("product-detail", kwargs={"version": "v1", "pk": product.pk}), None),
+            (reverse("product-detail", kwargs={"version": "v1", "pk": 999999}), None),
+        ]:
+            with self.subTest(url=url, params=params):
+                slow, fast = self.fetch(ProductViewSet, url, params)
+                self.assertEqual(slow, fast)
+
+    def test_category_responses_are_byte_identical(self):
+        for url in [
+            reverse("category-list", kwargs={"version": "v1"}),
+            reverse("category-list", kwargs={"version": "v2"}),
+        ]:
+            with self.subTest(url=url):
+                slow, fast = self.fetch(CategoryViewSet, url)
+                self.assertEqual(slow, fast)
+
+    def test_fast_serializer_matches_model_serializer(self):
+        products = Product.objects.order_by("id")
+        expected = JSONRenderer().render(ProductSerializer(products.prefetch_related("category"), many=True).data)
+
+        rendered = FastJSONRenderer().render(serialize_products(products.values(*PRODUCT_FIELDS)))
+
+        self.assertEqual(rendered, expected)
+
+    def test_fast_category_serializer_applies_the_fieldset(self):
+        rows = Category.objects.order_by("id").values(*CATEGORY_FIELDS)
+
+        self.assertEqual(serialize_categories(rows, Fieldset({"slug"}))[0], {"slug": "ficcao"})
+
+    def test_object_permissions_are_checked_on_retrieve(self):
+        class NoObjectAccess(BasePermission):
+            def has_object_permission(self, request, view, obj):
+                return False
+
+        product = Product.objects.get(sku="SKU-1")
+        url = reverse("product-detail", kwargs={"version": "v1", "pk": product.pk})
+        caches["default"].clear()
+        with mock.patch.object(ProductViewSet, "permission_classes", [NoObjectAccess]):
+            self.assertEqual(self.client.get(url).status_code, 403)
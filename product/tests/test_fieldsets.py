@@ -0,0 +1,122 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from order.factories import OrderFactory, UserFactory
+from order.viewsets import OrderViewSet
+from product.factories import CategoryFactory, ProductFactory
+from product.viewsets import CategoryViewSet, ProductViewSet
+
+
+class TestFieldsetsMatchOnBothReadPaths(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        categories = CategoryFactory.create_batch(2)
+        products = [ProductFactory(price=index, category=categories[: index % 3]) for index in range(4)]
+        OrderFactory(user=self.user, products=products)
+        OrderFactory(user=self.user, products=products[:1])
+
+    def fetch(self, viewset, url, params):
+        caches["default"].clear()
+        with mock.patch.object(viewset, "fast_read", False):
+            slow = self.client.get(url, params)
+        caches["default"].clear()
+        fast = self.client.get(url, params)
+        self.assertEqual(slow.status_code, 200)
+        self.assertEqual(slow.content, fast.content)
+        return fast.json()
+
+    def test_product_fieldsets(self):
+        url = reverse("product-list", kwargs={"version": "v1"})
+        for params in [
+            {"fields": "id,title"},
+            {"expand": ""},
+            {"fields": "title,category.slug"},
+            {"fields": "category", "expand": ""},
+        ]:
+            with self.subTest(params=params):
+                self.fetch(ProductViewSet, url, params)
+
+        results = self.fetch(ProductViewSet, url, {"fields": "title,category.slug"})["results"]
+        self.assertEqual(set(results[0]), {"title", "category"})
+        self.assertTrue(all(set(category) == {"slug"} for item in results for category in item["category"]))
+
+    def test_category_fieldsets(self):
+        results = self.fetch(CategoryViewSet, reverse("category-list", kwargs={"version": "v1"}), {"fields": "slug"})
+        self.assertTrue(all(list(item) == ["slug"] for item in results["results"]))
+
+    def test_order_fieldsets(self):
+        url = reverse("order-list", kwargs={"version": "v1"})
+        for params in [
+            {},
+            {"fields": "id,total"},
+            {"expand": "products"},
+            {"fields": "products.title,products.category.title"},
+        ]:
+            with self.subTest(params=params):
+                self.fetch(OrderViewSet, url, params)
+
+        compact = self.fetch(OrderViewSet, url, {})["results"]
+        self.assertTrue(all(isinstance(product, int) for order in compact for product in order["products"]))
+        expanded = self.fetch(OrderViewSet, url, {"expand": "products"})["results"]
+        self.assertEqual([product["id"] for product in expanded[0]["products"]], compact[0]["products"])
+        categories = [category for product in expanded[0]["products"] for category in product["category"]]
+        self.assertEqual(len(categories), 3)
+        self.assertTrue(all(isinstance(category, int) for category in categories))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params, error",
+    [
+        ({"fields": "id,colour"}, {"fields": ["Unknown field: colour."]}),
+        ({"fields": "title.id"}, {"fields": ["title has no nested fields."]}),
+        ({"expand": "category.parent"}, {"expand": ["Cannot expand category.parent."]}),
+    ],
+)
+def test_unknown_fields_are_rejected(params, error):
+    client = APIClient()
+    client.force_authenticate(user=UserFactory())
+
+    response = client.get(reverse("product-list", kwargs={"version": "v1"}), params)
+
+    assert response.status_code == 400
+    assert response.json() == error
+
+
+@pytest.mark.django_db
+def test_unrequested_relations_are_not_loaded():
+    client = APIClient()
+    client.force_authenticate(user=UserFactory())
+    ProductFactory.create_batch(3, category=CategoryFactory.create_batch(2))
+    url = reverse("product-list", kwargs={"version": "v1"})
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {"fields": "id,title"})
+
+    assert response.status_code == 200
+    assert not any("product_category" in query["sql"] for query in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_write_responses_follow_the_fieldset():
+    client = APIClient()
+    client.force_authenticate(user=UserFactory())
+    product = ProductFactory(category=[CategoryFactory()])
+
+    response = client.post(
+        reverse("order-list", kwargs={"version": "v1"}) + "?fields=products,total&expand=products",
+        {"products_id": [product.pk]},
+        format="json",
+    )
+
+    assert response.status_code == 201
+    assert set(response.json()) == {"products", "total"}
+    assert response.json()["products"][0]["category"] == [product.category.get().pk]
@@ -0,0 +1,78 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from order.factories import UserFactory
+from product.factories import CategoryFactory, ProductFactory
+from product.models import Product
+
+
+class TestProductFilters(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.books = CategoryFactory(slug="livros")
+        self.cheap = ProductFactory(title="Cordel", price=10, category=[self.books])
+        self.middle = ProductFactory(title="Atlas", price=50, category=[self.books])
+        self.expensive = ProductFactory(title="Enciclopédia", price=500, active=False)
+        self.url = reverse("product-list", kwargs={"version": "v1"})
+
+    def get_ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return [item["id"] for item in response.json()["results"]]
+
+    def test_filter_by_category_slug_or_id(self):
+        self.assertEqual(self.get_ids(category="livros"), [self.cheap.id, self.middle.id])
+        self.assertEqual(self.get_ids(category=str(self.books.id)), [self.cheap.id, self.middle.id])
+
+    def test_filter_by_price_range_and_active(self):
+        self.assertEqual(self.get_ids(min_price=20), [self.middle.id, self.expensive.id])
+        self.assertEqual(self.get_ids(min_price=20, max_price=100), [self.middle.id])
+        self.assertEqual(self.get_ids(active="false"), [self.expensive.id])
+        self.assertEqual(self.get_ids(active="true", min_price=20), [self.middle.id])
+
+    def test_non_ascii_digits_are_not_ids(self):
+        self.assertEqual(self.get_ids(category="²"), [])
+
+    def test_ordering(self):
+        self.assertEqual(self.get_ids(ordering="-price"), [self.expensive.id, self.middle.id, self.cheap.id])
+        self.assertEqual(self.get_ids(ordering="title", category="livros"), [self.middle.id, self.cheap.id])
+
+    def test_rejects_combinations_outside_the_whitelist(self):
+        for params in [
+            {"ordering": "description"},
+            {"ordering": "title", "min_price": 10},
+            {"ordering": "price", "pagination": "cursor"},
+            {"min_price": "-1"},
+            {"max_price": "²"},
+            {"active": "maybe"},
+        ]:
+            with self.subTest(**params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@skipUnless(connection.vendor == "sqlite", "Asserts on the SQLite query planner output.")
+class TestProductFilterIndexes(TestCase):
+
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(f"INDEX {index}", plan)
+        self.assertNotIn("SCAN product_product\n", f"{plan}\n")
+
+    def test_planner_uses_filter_indexes(self):
+        products = Product.objects.all()
+
+        self.assertUsesIndex(
+            products.filter(active=True, price__gte=10, price__lte=50).order_by("price", "id"),
+            "product_price_active_only_idx",
+        )
+        self.assertUsesIndex(products.filter(active__in=[False]).order_by("title", "id"), "product_active_title_idx")
+        self.assertUsesIndex(products.filter(price__gte=10).order_by("-price", "-id"), "product_price_idx")
+        self.assertUsesIndex(products.filter(category__slug="livros"), "product_category_cat_prod_idx")
@@ -0,0 +1,73 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from product.factories import CategoryFactory, ProductFactory
+from product.models import Product
+
+
+def import_catalog(path, *args):
+    stdout = StringIO()
+    call_command("import_catalog", str(path), *args, stdout=stdout)
+    return stdout.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_jsonl_in_batches(tmp_path):
+    CategoryFactory(slug="livros")
+    CategoryFactory(slug="hqs")
+    path = tmp_path / "catalog.jsonl"
+    rows = [
+        {"title": f"Livro {index}", "price": index, "sku": f"SKU-{index}", "category": ["livros"]} for index in range(5)
+    ]
+    rows.append({"title": "HQ", "price": None, "category": [{"slug": "hqs", "title": "HQs"}, {"slug": "livros"}]})
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n\n")
+
+    output = import_catalog(path, "--batch-size", "2")
+
+    assert "Imported 2 rows" in output
+    assert "Imported 6 rows in" in output
+    assert "6 created, 0 updated" in output
+    assert Product.objects.count() == 6
+    assert sorted(Product.objects.get(title="HQ").category.values_list("slug", flat=True)) == ["hqs", "livros"]
+
+
+@pytest.mark.django_db
+def test_import_csv_round_trips_the_export_and_upserts(tmp_path):
+    CategoryFactory(slug="livros")
+    ProductFactory(title="Antigo", sku="SKU-1", price=5)
+    path = tmp_path / "catalog.csv"
+    path.write_text(
+        "id,title,description,price,active,sku,category\n"
+        '1,Novo,"Linha\nquebrada",10,False,SKU-1,livros\n'
+        "2,Sem preço,,,True,,\n"
+    )
+
+    with pytest.raises(CommandError, match="Line 3"):
+        import_catalog(path)
+
+    output = import_catalog(path, "--upsert")
+
+    assert "1 created, 1 updated" in output
+    product = Product.objects.get(sku="SKU-1")
+    assert (product.title, product.description, product.price, product.active) == ("Novo", "Linha\nquebrada", 10, False)
+    assert list(product.category.values_list("slug", flat=True)) == ["livros"]
+    assert Product.objects.get(title="Sem preço").price is None
+
+
+@pytest.mark.django_db
+def test_import_reports_bad_rows(tmp_path):
+    path = tmp_path / "catalog.jsonl"
+    path.write_text('{"title": "Ok", "category": ["faltando"]}\n')
+    with pytest.raises(CommandError, match="Line 1: unknown categories faltando"):
+        import_catalog(path)
+
+    path.write_text('{"title": "Ok"}\n{"title": ""}\n')
+    with pytest.raises(CommandError, match="Line 2"):
+        import_catalog(path)
+
+    with pytest.raises(CommandError, match="--format"):
+        import_catalog(tmp_path / "catalog.txt")
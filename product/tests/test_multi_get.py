@@ -0,0 +1,92 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from order.factories import UserFactory
+from product.factories import CategoryFactory, ProductFactory
+from product.viewsets import ProductViewSet
+
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    client.force_authenticate(user=UserFactory())
+    return client
+
+
+@pytest.fixture
+def url():
+    return reverse("product-list", kwargs={"version": "v1"})
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fast_read", [True, False])
+def test_products_come_back_in_request_order(client, url, fast_read):
+    category = CategoryFactory()
+    first, second, third = ProductFactory.create_batch(3, category=[category])
+
+    with mock.patch.object(ProductViewSet, "fast_read", fast_read):
+        response = client.get(url, {"ids": f"{third.pk},{first.pk},999,{third.pk}", "fields": "id,category.slug"})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [
+            {"id": third.pk, "category": [{"slug": category.slug}]},
+            {"id": first.pk, "category": [{"slug": category.slug}]},
+        ],
+        "missing": [999],
+    }
+
+
+@pytest.mark.django_db
+def test_multi_get_ignores_list_filters(client, url, django_assert_max_num_queries):
+    product = ProductFactory(active=False)
+
+    with django_assert_max_num_queries(4):
+        response = client.get(url, {"ids": str(product.pk), "active": "true", "ordering": "-price"})
+
+    assert [item["id"] for item in response.json()["results"]] == [product.pk]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ids", ["", "1,a", "1,²", "1,99999999999999999999", ",".join(map(str, range(1, 102)))])
+def test_invalid_ids_are_rejected(client, url, ids):
+    response = client.get(url, {"ids": ids})
+
+    assert response.status_code == 400
+    assert "ids" in response.json()
+
+
+@pytest.mark.django_db
+def test_bulk_create_resolves_categories_once(client):
+    categories = CategoryFactory.create_batch(3)
+    items = [
+        {
+            "title": f"Livro {index}",
+            "price": index,
+            "categories_id": [category.pk for category in categories[index % 3 :]],
+        }
+        for index in range(30)
+    ]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(reverse("product-bulk", kwargs={"version": "v1"}), items, format="json")
+
+    assert response.status_code == 201
+    lookups = [query for query in queries.captured_queries if 'FROM "product_category" WHERE' in query["sql"]]
+    assert len(lookups) == 1
+
+
+@pytest.mark.django_db
+def test_bulk_create_reports_out_of_range_categories_missing(client):
+    category = CategoryFactory()
+    items = [{"title": "Livro", "price": 10, "categories_id": [category.pk, 99999999999999999999]}]
+
+    response = client.post(reverse("product-bulk", kwargs={"version": "v1"}), items, format="json")
+
+    assert response.status_code == 400
+    assert response.json() == [{"categories_id": ['Invalid pks "99999999999999999999" - objects do not exist.']}]
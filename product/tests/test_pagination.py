@@ -0,0 +1,75 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from order.factories import UserFactory
+from product.factories import CategoryFactory, ProductFactory
+
+
+class TestKeysetPagination(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.products = ProductFactory.create_batch(12)
+
+    def crawl(self, url, params=None):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            ids += [item["id"] for item in data["results"]]
+            if not data["next"]:
+                return ids
+            response = self.client.get(data["next"])
+
+    def test_offset_pagination_is_the_default(self):
+        url = reverse("product-list", kwargs={"version": "v1"})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.json()["count"], 12)
+        self.assertEqual(len(response.json()["results"]), 5)
+
+    def test_cursor_pagination_walks_every_product_without_count(self):
+        url = reverse("product-list", kwargs={"version": "v1"})
+
+        # products + categories
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"pagination": "cursor"})
+
+        self.assertNotIn("count", response.json())
+        self.assertEqual(self.crawl(url, {"pagination": "cursor"}), [product.id for product in self.products])
+
+    def test_cursor_pagination_is_the_default_for_v2(self):
+        url = reverse("category-list", kwargs={"version": "v2"})
+        CategoryFactory.create_batch(3)
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()), {"next", "previous", "results"})
+
+    def test_cursor_page_size_is_capped(self):
+        url = reverse("product-list", kwargs={"version": "v2"})
+        ProductFactory.create_batch(100)
+
+        response = self.client.get(url, {"page_size": 1000})
+
+        self.assertEqual(len(response.json()["results"]), 100)
+
+    def test_offset_pagination_can_be_forced_on_v2(self):
+        url = reverse("product-list", kwargs={"version": "v2"})
+
+        response = self.client.get(url, {"pagination": "page", "page": 3})
+
+        self.assertEqual(response.json()["count"], 12)
+        self.assertEqual([item["id"] for item in response.json()["results"]], [p.id for p in self.products[10:]])
+
+    def test_invalid_cursor_is_rejected(self):
+        url = reverse("product-list", kwargs={"version": "v1"})
+
+        response = self.client.get(url, {"cursor": "garbage"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
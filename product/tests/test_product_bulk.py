@@ -0,0 +1,91 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from order.factories import OrderFactory, UserFactory
+from product.factories import CategoryFactory, ProductFactory
+from product.models import Product
+
+
+class TestProductBulk(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.books = CategoryFactory(slug="livros")
+        self.games = CategoryFactory(slug="jogos")
+        self.url = reverse("product-bulk", kwargs={"version": "v1"})
+
+    def test_bulk_create_products(self):
+        data = [
+            {"title": f"Livro {i}", "price": 10 + i, "sku": f"LIV-{i}", "categories_id": [self.books.id]}
+            for i in range(20)
+        ]
+        data.append({"title": "Combo", "price": 99, "categories_id": [self.books.id, self.games.id]})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data=data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.json()["created"]), 21)
+        self.assertEqual(Product.objects.count(), 21)
+        inserts = [query for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(Product.category.through.objects.count(), 22)
+        combo = Product.objects.get(title="Combo")
+        self.assertEqual(set(combo.category.all()), {self.books, self.games})
+
+    def test_bulk_reports_per_item_errors_and_writes_nothing(self):
+        ProductFactory(sku="LIV-1")
+        data = [
+            {"title": "Valido", "price": 10, "categories_id": [self.books.id]},
+            {"price": 10, "categories_id": [self.books.id]},
+            {"title": "Outro", "price": 10, "categories_id": [999999]},
+        ]
+
+        response = self.client.post(self.url, data=data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertIn("title", errors[1])
+        self.assertIn("categories_id", errors[2])
+        self.assertEqual(Product.objects.count(), 1)
+
+    def test_bulk_rejects_existing_and_duplicated_skus(self):
+        ProductFactory(sku="LIV-1")
+        data = [
+            {"title": "A", "sku": "LIV-1", "categories_id": []},
+            {"title": "B", "sku": "LIV-2", "categories_id": []},
+            {"title": "C", "sku": "LIV-2", "categories_id": []},
+        ]
+
+        response = self.client.post(self.url, data=data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()
+        self.assertIn("sku", errors[0])
+        self.assertEqual(errors[1], {})
+        self.assertIn("sku", errors[2])
+
+    def test_bulk_upsert_by_sku(self):
+        existing = ProductFactory(sku="LIV-1", title="Antigo", price=10, category=[self.games])
+        order = OrderFactory(products=[existing])
+        data = [
+            {"title": "Novo titulo", "sku": "LIV-1", "price": 30, "categories_id": [self.books.id]},
+            {"title": "Novo", "sku": "LIV-2", "price": 5, "categories_id": [self.books.id]},
+        ]
+
+        response = self.client.post(f"{self.url}?upsert=true", data=data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["updated"], [existing.pk])
+        self.assertEqual(len(response.json()["created"]), 1)
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.title, "Novo titulo")
+        self.assertEqual(list(existing.category.all()), [self.books])
+        order.refresh_from_db()
+        self.assertEqual(order.total, 30)
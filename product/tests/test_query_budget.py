@@ -0,0 +1,59 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from order.factories import UserFactory
+from product.factories import CategoryFactory, ProductFactory
+
+
+class TestProductViewSetQueryBudget(APITestCase):
+    # count + products + categories
+    LIST_QUERIES = 3
+    # product + categories
+    DETAIL_QUERIES = 2
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_query_count_is_constant(self):
+        for products, categories in [(1, 1), (5, 3), (20, 8)]:
+            with self.subTest(products=products, categories=categories):
+                ProductFactory.create_batch(products, category=CategoryFactory.create_batch(categories))
+                url = reverse("product-list", kwargs={"version": "v1"})
+
+                with self.assertNumQueries(self.LIST_QUERIES):
+                    response = self.client.get(url)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_query_count_is_constant(self):
+        for categories in [0, 1, 10]:
+            with self.subTest(categories=categories):
+                product = ProductFactory(category=CategoryFactory.create_batch(categories))
+                url = reverse("product-detail", kwargs={"version": "v1", "pk": product.pk})
+
+                with self.assertNumQueries(self.DETAIL_QUERIES):
+                    response = self.client.get(url)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(response.json()["category"]), categories)
+
+
+class TestCategoryViewSetQueryBudget(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_query_count_is_constant(self):
+        for categories in [1, 5, 20]:
+            with self.subTest(categories=categories):
+                CategoryFactory.create_batch(categories)
+                url = reverse("category-list", kwargs={"version": "v1"})
+
+                # count + categories
+                with self.assertNumQueries(2):
+                    response = self.client.get(url)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,58 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from order.factories import UserFactory
+from product.factories import CategoryFactory, ProductFactory
+from product.models import Product
+
+
+class TestProductSearch(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.fiction = CategoryFactory(slug="ficcao")
+        self.dune = ProductFactory(title="Duna", description="Ficção científica", category=[self.fiction])
+        self.messiah = ProductFactory(title="O Messias de Duna", description="Continuação", category=[self.fiction])
+        self.cookbook = ProductFactory(title="Cozinha", description="Receitas inspiradas em Duna", active=False)
+        self.url = reverse("product-search", kwargs={"version": "v1"})
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["title"] for item in response.json()["results"]]
+
+    def test_title_matches_rank_first(self):
+        titles = self.search(q="duna")
+
+        self.assertEqual(titles[-1], "Cozinha")
+        self.assertEqual(set(titles[:2]), {"Duna", "O Messias de Duna"})
+
+    def test_prefix_and_accent_insensitive_matching(self):
+        self.assertEqual(self.search(q="fic"), ["Duna"])
+        self.assertEqual(self.search(q="continuacao"), ["O Messias de Duna"])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search(q="messias dun"), ["O Messias de Duna"])
+
+    def test_filters_by_category_and_active(self):
+        self.assertEqual(set(self.search(q="duna", category="ficcao")), {"Duna", "O Messias de Duna"})
+        self.assertEqual(self.search(q="duna", category=str(self.fiction.pk), active="false"), [])
+        self.assertEqual(self.search(q="duna", active="false"), ["Cozinha"])
+
+    def test_index_follows_writes(self):
+        self.dune.title = "Fundação"
+        self.dune.save()
+        Product.objects.filter(pk=self.messiah.pk).delete()
+
+        self.assertEqual(self.search(q="fundacao"), ["Fundação"])
+        self.assertEqual(self.search(q="duna"), ["Cozinha"])
+
+    def test_query_is_required(self):
+        response = self.client.get(self.url, {"q": "  "})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search(q='duna" OR "cozinha'), [])
@@ -0,0 +1,86 @@
+import re
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.metrics import Registry
+from order.factories import UserFactory
+from product.factories import CategoryFactory, ProductFactory
+
+
+class TestServerTiming(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        ProductFactory.create_batch(3, category=[CategoryFactory()])
+        self.url = reverse("product-list", kwargs={"version": "v1"})
+
+    def test_server_timing_header(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"page_size": 3})
+
+        timing = response["Server-Timing"]
+        self.assertRegex(
+            timing,
+            r'^db;dur=\d+\.\d;desc="3 queries", serialize;dur=\d+\.\d, render;dur=\d+\.\d, total;dur=\d+\.\d$',
+        )
+        serialize, render, total = [
+            float(value) for value in re.findall(r"(?:serialize|render|total);dur=([\d.]+)", timing)
+        ]
+        self.assertLessEqual(serialize + render, total)
+
+    @override_settings(SERVER_TIMING=False)
+    def test_server_timing_header_can_be_disabled(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_metrics_endpoint(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        body = response.content.decode()
+        count = re.search(r'^http_requests_total\{route="product-list",method="GET",status="200"\} (\d+)$', body, re.M)
+        self.assertGreaterEqual(int(count.group(1)), 2)
+        self.assertIn("# TYPE http_request_db_queries histogram", body)
+        self.assertRegex(body, r'http_request_db_queries_bucket\{route="product-list",method="GET",le="5"\} \d+')
+        self.assertRegex(body, r'http_response_size_bytes_count\{route="product-list",method="GET"\} \d+')
+        self.assertRegex(body, r"catalog_cache_hits_total \d+")
+
+    def test_metrics_are_local_only_without_a_token(self):
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.5")
+        self.assertEqual(response.status_code, 403)
+        # A reverse proxy on the same host connects from loopback.
+        response = self.client.get(reverse("metrics"), headers={"X-Forwarded-For": "203.0.113.9"})
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+
+
+def test_histogram_rendering():
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ["route"], buckets=[0.1, 1])
+    for value in [0.05, 0.1, 0.5, 3]:
+        histogram.observe('a "quoted"\nroute', value=value)
+    registry.counter("hits_total", "Hits.").inc()
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="a \\"quoted\\"\\nroute",le="0.1"} 2',
+        'latency_seconds_bucket{route="a \\"quoted\\"\\nroute",le="1"} 3',
+        'latency_seconds_bucket{route="a \\"quoted\\"\\nroute",le="+Inf"} 4',
+        'latency_seconds_sum{route="a \\"quoted\\"\\nroute"} 3.65',
+        'latency_seconds_count{route="a \\"quoted\\"\\nroute"} 4',
+        "# HELP hits_total Hits.",
+        "# TYPE hits_total counter",
+        "hits_total 1",
+    ]
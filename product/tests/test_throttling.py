@@ -0,0 +1,147 @@
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import middleware, throttling
+from order.factories import UserFactory
+from product.factories import ProductFactory
+
+RATES = {"products.read": "3/min", "products.write": "2/min", "categories.read": "100/min"}
+
+
+@pytest.fixture
+def throttled(settings):
+    caches["default"].clear()
+    settings.THROTTLE_ENABLED = True
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": RATES}
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = [1_000_000.0]
+    monkeypatch.setattr(throttling.time, "time", lambda: clock[0])
+    return clock
+
+
+def authenticated_client():
+    client = APIClient()
+    client.force_authenticate(user=UserFactory())
+    return client
+
+
+def products_url():
+    return reverse("product-list", kwargs={"version": "v1"})
+
+
+def test_parse_rate():
+    assert throttling.parse_rate("600/min") == (600, 10.0)
+    assert throttling.parse_rate("10/s") == (10, 10.0)
+    assert throttling.parse_rate("36/hour") == (36, 0.01)
+
+
+@pytest.mark.django_db
+def test_read_budget_is_a_token_bucket(throttled, now):
+    client = authenticated_client()
+
+    assert [client.get(products_url()).status_code for _ in range(4)] == [200, 200, 200, 429]
+    response = client.get(products_url())
+    assert response["Retry-After"] == "20"
+
+    # One token comes back every 20 seconds.
+    now[0] += 20
+    assert [client.get(products_url()).status_code for _ in range(2)] == [200, 429]
+
+
+@pytest.mark.django_db
+def test_reads_and_writes_have_separate_budgets(throttled, now):
+    client = authenticated_client()
+    for _ in range(3):
+        client.get(products_url())
+
+    assert client.get(products_url()).status_code == 429
+    assert client.post(products_url(), {}, format="json").status_code == 400
+    assert client.post(products_url(), {}, format="json").status_code == 400
+    assert client.post(products_url(), {}, format="json").status_code == 429
+
+
+@pytest.mark.django_db
+def test_budgets_are_per_client_and_per_scope(throttled, now):
+    client = authenticated_client()
+    for _ in range(3):
+        client.get(products_url())
+
+    assert client.get(products_url()).status_code == 429
+    assert client.get(reverse("category-list", kwargs={"version": "v1"})).status_code == 200
+    assert authenticated_client().get(products_url()).status_code == 200
+
+    anonymous = APIClient()
+    for _ in range(3):
+        anonymous.get(products_url(), REMOTE_ADDR="10.0.0.1")
+    assert anonymous.get(products_url(), REMOTE_ADDR="10.0.0.1").status_code == 429
+    assert anonymous.get(products_url(), REMOTE_ADDR="10.0.0.2").status_code == 200
+
+
+@pytest.mark.django_db
+def test_throttle_counters(throttled, now):
+    before = dict(throttling.throttle_total.values)
+    client = authenticated_client()
+    for _ in range(5):
+        client.get(products_url())
+
+    def delta(result):
+        key = ("products.read", result)
+        return throttling.throttle_total.values.get(key, 0) - before.get(key, 0)
+
+    assert (delta("allowed"), delta("throttled")) == (3, 2)
+
+
+@pytest.mark.django_db
+def test_sheds_load_above_the_in_flight_limit(settings, monkeypatch):
+    settings.LOAD_SHED_MAX_IN_FLIGHT = 4
+    monkeypatch.setattr(middleware, "in_flight", 4)
+    before = middleware.metrics.load_shed_total.values.get(("in_flight",), 0)
+    client = authenticated_client()
+
+    response = client.get(products_url())
+
+    assert response.status_code == 503
+    assert response["Retry-After"] == "2"
+    assert middleware.metrics.load_shed_total.values[("in_flight",)] == before + 1
+    assert client.get(reverse("metrics")).status_code == 200
+    assert middleware.in_flight == 4
+
+    monkeypatch.setattr(middleware, "in_flight", 3)
+    assert client.get(products_url()).status_code == 200
+    assert middleware.in_flight == 3
+
+
+@pytest.mark.django_db
+def test_streaming_responses_hold_their_slot_until_closed(monkeypatch):
+    ProductFactory()
+    monkeypatch.setattr(middleware, "in_flight", 0)
+
+    response = authenticated_client().get(reverse("product-export", kwargs={"version": "v1"}))
+
+    assert response.streaming
+    assert middleware.in_flight == 1
+    assert b"".join(response.streaming_content) != b""
+    assert middleware.in_flight == 0
+    response.close()
+    assert middleware.in_flight == 0
+
+
+@pytest.mark.django_db
+def test_sheds_load_while_queries_are_slow(settings, monkeypatch):
+    settings.LOAD_SHED_DB_LATENCY = 0.5
+    latency = middleware.LatencyAverage(weight=1)
+    monkeypatch.setattr(middleware, "query_latency", latency)
+    latency.observe(2.0)
+    client = authenticated_client()
+
+    assert client.get(products_url()).status_code == 503
+
+    # The average decays while nothing runs, so requests get through again.
+    latency.updated -= latency.half_life * 3
+    assert client.get(products_url()).status_code == 200
+    assert latency.value() < 0.5
@@ -1,9 +1,66 @@
+from django.db.models import ProtectedError, Subquery
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from core.db_router import ReplicaReadMixin
+from core.fastpath import FastReadMixin
+from core.fieldsets import FieldsetMixin
+from core.timing import serialization_timer
+from product.cache import CachedResponseMixin
+from product.filters import category_lookup
 from product.models import Category
+from product.models.category import subtree_lookups
 from product.serializers import CategorySerializer
+from product.serializers.fast_serializers import (
+    CATEGORY_FIELDS,
+    CATEGORY_SCHEMA,
+    category_stats_query,
+    serialize_categories,
+    serialize_category_stats,
+)
 
 
-class CategoryViewSet(ModelViewSet):
+class CategoryViewSet(ReplicaReadMixin, CachedResponseMixin, FieldsetMixin, FastReadMixin, ModelViewSet):
     queryset = Category.objects.all().order_by("id")
     serializer_class = CategorySerializer
+    throttle_scope = "categories"
+    replica_pin_scope = "catalog"
+    fast_read = True
+    fast_fields = CATEGORY_FIELDS
+    fast_serializer = staticmethod(serialize_categories)
+    fieldset_schema = CATEGORY_SCHEMA
+
+    def perform_destroy(self, instance):
+        try:
+            instance.delete()
+        except ProtectedError:
+            raise ValidationError({"detail": ["Move or delete the subcategories of this category first."]})
+
+    @action(detail=False, methods=["get"], url_path="tree")
+    def tree(self, request, *args, **kwargs):
+        return self.cached_response(self.tree_results, request, *args, **kwargs)
+
+    def tree_results(self, request, *args, **kwargs):
+        # A flat depth-first list, parents before their children, rather than nested
+        # objects: trees can be deeper than what JSON encoders accept, and clients
+        # rebuild the nesting from `parent` and `depth` in one pass.
+        queryset = Category.objects.order_by("path")
+        root = request.query_params.get("root")
+        if root:
+            root_path = Category.objects.filter(**category_lookup(root)).values("path")
+            queryset = queryset.filter(**subtree_lookups(Subquery(root_path)))
+        with serialization_timer():
+            return Response(serialize_categories(queryset.values("id", *CATEGORY_FIELDS)))
+
+    @action(detail=False, methods=["get"], url_path="stats")
+    def stats(self, request, *args, **kwargs):
+        return self.cached_response(self.stats_results, request, *args, **kwargs)
+
+    def stats_results(self, request, *args, **kwargs):
+        # Read from the CategoryStats rows the product signals maintain, so the cost
+        # grows with the number of categories rather than of products.
+        page = self.paginate_queryset(category_stats_query(self.get_queryset()))
+        with serialization_timer():
+            return self.get_paginated_response(serialize_category_stats(page))
@@ -1,10 +1,118 @@
+from django.db.models import Prefetch
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.viewsets import ModelViewSet
 
-from product.models import Product
-from product.serializers.product_serializer import ProductSerializer
+from core.db_router import ReplicaReadMixin
+from core.export import StreamingExportMixin
+from core.fastpath import FastReadMixin
+from core.fieldsets import FieldsetMixin
+from core.multiget import MultiGetMixin
+from jobs.tasks import enqueue
+from product.cache import CachedResponseMixin
+from product.filters import ProductFilterBackend
+from product.models import Category, Product
+from product.search import search_products
+from product.serializers.fast_serializers import PRODUCT_FIELDS, PRODUCT_SCHEMA, serialize_products
+from product.serializers.product_serializer import ProductBulkSerializer, ProductSerializer
 
 
-class ProductViewSet(ModelViewSet):
+class ProductViewSet(
+    ReplicaReadMixin,
+    CachedResponseMixin,
+    StreamingExportMixin,
+    MultiGetMixin,
+    FieldsetMixin,
+    FastReadMixin,
+    ModelViewSet,
+):
     serializer_class = ProductSerializer
+    throttle_scope = "products"
+    replica_pin_scope = "catalog"
+    filter_backends = [ProductFilterBackend]
+    fast_read = True
+    fast_fields = PRODUCT_FIELDS
+    fast_serializer = staticmethod(serialize_products)
+    fieldset_schema = PRODUCT_SCHEMA
+    default_expand = ["category"]
+    export_name = "products"
+    export_csv_fields = [*PRODUCT_FIELDS, "category"]
+    bulk_max_items = 5000
 
-    queryset = Product.objects.all().order_by("id")
+    queryset = Product.objects.order_by("id")
+
+    def get_queryset(self):
+        fieldset = self.get_fieldset()
+        if not fieldset.includes("category"):
+            return self.queryset.all()
+        categories = Category.objects.order_by("id")
+        if not fieldset.expands("category"):
+            categories = categories.only("id")
+        return self.queryset.prefetch_related(Prefetch("category", queryset=categories))
+
+    def get_export_csv_row(self, item):
+        return [*(item[field] for field in PRODUCT_FIELDS), "|".join(category["slug"] for category in item["category"])]
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        upsert = request.query_params.get("upsert", "").lower() in ("1", "true")
+        if request.query_params.get("background", "").lower() in ("1", "true"):
+            return self.bulk_in_background(request, upsert)
+
+        serializer = ProductBulkSerializer(
+            data=request.data,
+            many=True,
+            max_length=self.bulk_max_items,
+            context={**self.get_serializer_context(), "upsert": upsert},
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(
+            {
+                "created": [product.pk for product in serializer.created],
+                "updated": [product.pk for product in serializer.updated],
+            },
+            status=status.HTTP_201_CREATED if serializer.created else status.HTTP_200_OK,
+        )
+
+    def bulk_in_background(self, request, upsert):
+        # Only the shape is checked here; the rows are validated by the job and reported in its result.
+        if not isinstance(request.data, list) or not request.data:
+            raise ValidationError({"non_field_errors": ["Expected a non-empty list of items."]})
+        if len(request.data) > self.bulk_max_items:
+            raise ValidationError(
+                {"non_field_errors": [f"Ensure this field has no more than {self.bulk_max_items} elements."]}
+            )
+
+        user = request.user if request.user.is_authenticated else None
+        job = enqueue("product.bulk_upsert", {"products": request.data, "upsert": upsert}, user=user)
+        status_url = reverse("job-detail", kwargs={"version": request.version, "pk": job.pk}, request=request)
+        return Response(
+            {"job": job.pk, "status": status_url}, status=status.HTTP_202_ACCEPTED, headers={"Location": status_url}
+        )
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request, *args, **kwargs):
+        return self.cached_response(self.search_results, request, *args, **kwargs)
+
+    def search_results(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": ["This query parameter is required."]})
+
+        # Filters apply on top of the relevance ordering, so ?ordering= is ignored here.
+        filter_backend = ProductFilterBackend()
+        queryset = filter_backend.apply_filters(
+            search_products(self.get_queryset(), query), filter_backend.parse_filters(request)
+        )
+
+        # Results are ordered by relevance, so they are paginated by page number rather than by id cursors.
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)